@@ -0,0 +1,81 @@
+import lazy_imports
+
+# rapidfuzz and numpy (optional: lets rapidfuzz score the whole word x token
+# matrix in one call) load with the first page that needs anchors
+__getattr__ = _lazy = lazy_imports.deferred(
+    globals(), optional=("numpy",), fuzz="rapidfuzz.fuzz", process="rapidfuzz.process", numpy="numpy")
+
+# Same threshold the anchor search has always used (thefuzz ratio, rounded)
+ANCHOR_THRESHOLD = 80
+
+
+def normalize_word(text):
+    return text.lower().strip(":").strip()
+
+
+def keyword_tokens(keyword):
+    return [t.strip(":") for t in keyword.lower().split()]
+
+
+class PageAnchors:
+    """
+    Fuzzy anchor hits for one page: which words score >= ANCHOR_THRESHOLD
+    against each anchor token. All known tokens are scored in one batch
+    (a cdist matrix when numpy is available, otherwise one C-level extract
+    per token); tokens seen later are scored on first use.
+    """
+
+    def __init__(self, words, tokens=()):
+        self.words = words
+        self.norm_words = [normalize_word(w['text']) for w in words]
+        self._hits = {}
+        self._score(sorted(set(tokens)))
+
+    def _score(self, tokens):
+        tokens = [t for t in tokens if t not in self._hits]
+        if not tokens:
+            return
+        for t in tokens:
+            self._hits[t] = set()
+        cutoff = ANCHOR_THRESHOLD - 1  # Rounded afterwards, like thefuzz
+        fuzz, process, numpy = _lazy("fuzz"), _lazy("process"), _lazy("numpy")
+        if numpy is not None and self.norm_words:
+            matrix = process.cdist(self.norm_words, tokens, scorer=fuzz.ratio, score_cutoff=cutoff)
+            for word_idx, tok_idx in zip(*numpy.nonzero(numpy.rint(matrix) >= ANCHOR_THRESHOLD)):
+                self._hits[tokens[tok_idx]].add(int(word_idx))
+        else:
+            for t in tokens:
+                for _, score, word_idx in process.extract(
+                        t, self.norm_words, scorer=fuzz.ratio, score_cutoff=cutoff, limit=None):
+                    if round(score) >= ANCHOR_THRESHOLD:
+                        self._hits[t].add(word_idx)
+
+    def hits(self, token):
+        """Indices of words that fuzzily match token."""
+        if token not in self._hits:
+            self._score([token])
+        return self._hits[token]
+
+    def phrase_starts(self, keyword):
+        """
+        Word indices where every token of keyword matches consecutive words,
+        in reading order.
+        """
+        tokens = keyword_tokens(keyword)
+        first = tokens[0]
+        starts = []
+        for i in sorted(self.hits(first)):
+            if not self.norm_words[i]: continue
+            if all((i + k) in self.hits(tokens[k]) for k in range(1, len(tokens))):
+                starts.append(i)
+        return starts
+
+
+def get_page_anchors(page_data, tokens=()):
+    """Returns the page's cached PageAnchors, building it on first use."""
+    anchors = page_data.get("anchors")
+    words = page_data.get("words", [])
+    if anchors is None or anchors.words is not words:
+        anchors = PageAnchors(words, tokens)
+        page_data["anchors"] = anchors
+    return anchors
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from renamer_logic import PDFProcessor
+from ocr_service import configure_ocr_service
+
+# One processor per worker process, built once by the pool initializer so the
+# surname data and other lookup tables are loaded a single time per core.
+_worker_processor = None
+
+
+def _init_worker(processor_options, ocr_workers):
+    global _worker_processor
+    if ocr_workers:
+        configure_ocr_service(pool_size=ocr_workers)
+    _worker_processor = PDFProcessor(**processor_options)
+
+
+def _process_in_worker(filepath, rename):
+    return _worker_processor.process_document(filepath, rename=rename)
+
+
+def error_result(filepath, error):
+    """Result dict for a file whose worker died or whose result could not be returned."""
+    result = PDFProcessor.new_result(filepath)
+    result["status"] = "error"
+    result["error"] = f"Error: {error}"
+    return result
+
+
+class BatchEngine:
+    """
+    Warm process pool for PDFProcessor.process_document.
+    Keep one alive across batches to avoid paying worker startup every time.
+    If a worker dies (OOM kill, a crash in pdfium or Tesseract) the files it
+    had in flight come back as error results and the next submit() starts
+    a fresh pool, so a long-lived engine survives it.
+    """
+
+    def __init__(self, workers=None, processor_options=None, ocr_workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        # PDFProcessor keyword arguments, see PDFProcessor.worker_options()
+        self.processor_options = processor_options or {}
+        # OCR threads per worker process; None keeps the OCRService default
+        self.ocr_workers = ocr_workers
+        self._pool = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker,
+                    initargs=(self.processor_options, self.ocr_workers))
+            return self._pool
+
+    def _discard_pool(self, pool):
+        """Drops a broken pool; a no-op if another thread already replaced it."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, filepath, rename=True):
+        """Queues one file and returns a Future for its result dict."""
+        pool = self._get_pool()
+        try:
+            future = pool.submit(_process_in_worker, filepath, rename)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            future = self._get_pool().submit(_process_in_worker, filepath, rename)
+        with self._lock:
+            self._in_flight += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self):
+        """Files submitted and not finished yet."""
+        return self._in_flight
+
+    def queue_depths(self):
+        """A metrics queue source."""
+        return {"workers": self._in_flight}
+
+    def process(self, paths, rename=True, cancel_event=None):
+        """
+        Streams results as they complete.
+        'paths' may be any iterable (it is consumed lazily), and only a couple of
+        files per worker are in flight at once so huge inputs stay cheap.
+        Setting cancel_event stops queuing new files; in-flight files still finish.
+        """
+        max_in_flight = self.workers * 2
+        path_iter = iter(paths)
+        pending = {}
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                if cancel_event is not None and cancel_event.is_set():
+                    exhausted = True
+                    break
+                try:
+                    filepath = next(path_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[self.submit(filepath, rename)] = filepath
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                filepath = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield error_result(filepath, e)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+class BatchProgress:
+    """
+    Files done out of total for a running batch, with throughput and ETA.
+    More files can be added while it runs (e.g. a second drop).
+    """
+
+    def __init__(self, total=0, clock=time.monotonic):
+        self.total = total
+        self.done = 0
+        self._clock = clock
+        self._start = clock()
+
+    def add(self, count):
+        self.total += count
+
+    def advance(self, count=1):
+        self.done += count
+
+    @property
+    def elapsed(self):
+        return self._clock() - self._start
+
+    @property
+    def rate(self):
+        """Files per second so far; 0.0 until the first file is done."""
+        elapsed = self.elapsed
+        return self.done / elapsed if self.done and elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Seconds left at the current rate, or None while there is no rate yet."""
+        rate = self.rate
+        return (self.total - self.done) / rate if rate else None
+
+    def describe(self):
+        eta = self.eta
+        eta_text = "--:--" if eta is None else f"{int(eta) // 60}:{int(eta) % 60:02d}"
+        return f"{self.done}/{self.total} files, {self.rate:.1f} files/s, ETA {eta_text}"
@@ -0,0 +1,123 @@
+"""
+Benchmark: analyze_content() throughput on already-extracted documents.
+
+The fixtures are the extract_data() results of the repo's own test PDFs,
+captured by running the test modules with analyze_content wrapped, plus a
+few synthetic declaration pages. Extraction happens before the clock runs,
+so only classification and metadata parsing are timed.
+
+Also times the pattern bank alone: module-level re.search/re.sub calls with
+pattern strings (what analyze_content used to do) versus the precompiled
+patterns it uses now.
+
+Usage: python bench_analyze.py [rounds]
+"""
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import renamer_logic
+from renamer_logic import PDFProcessor
+from sample_pdf import write_text_pdf
+
+TEST_MODULES = ["test_logic", "test_named_insured", "test_policy_keywords", "test_parens_exclusion",
+                "test_driver_license", "test_cme_term", "test_declaration", "test_term_logic",
+                "test_integrated_surname", "test_lazy_pages", "test_lazy_words"]
+
+SYNTHETIC_PAGES = [
+    ["INSURANCE POLICY DECLARATION", "Named Insured: Jane Roe (Owner)", "Policy No. HX-2231",
+     "Policy Period: 03/14/2025 to 03/14/2026", "Underwritten by: The Hartford"],
+    ["INVOICE", "Invoice Date: Feb 2, 2026", "Account Name: Acme Holdings LLC", "Amount Due $1,204.00"],
+    ["CERTIFICATE OF LIABILITY INSURANCE", "Insured", "Blue Ridge Bakery Inc",
+     "Effective Date 07-01-2025 Expiration 07-01-2026", "Insurer: Markel"],
+]
+
+
+def capture_fixtures():
+    """extract_data() dicts that analyze_content saw while the test modules ran."""
+    captured = []
+    original = PDFProcessor.analyze_content
+
+    def recording(self, data, *args, **kwargs):
+        captured.append(data)
+        return original(self, data, *args, **kwargs)
+
+    suite = unittest.TestSuite()
+    loader = unittest.TestLoader()
+    for name in TEST_MODULES:
+        try:
+            suite.addTests(loader.loadTestsFromName(name))
+        except ImportError as e:
+            print(f"Skipping {name}: {e}")
+    with mock.patch.object(PDFProcessor, "analyze_content", recording), \
+            open(os.devnull, "w") as devnull, mock.patch("sys.stdout", devnull):
+        unittest.TextTestRunner(stream=devnull, verbosity=0).run(suite)
+    return captured
+
+
+def synthetic_fixtures(processor):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        fixtures = []
+        for i, lines in enumerate(SYNTHETIC_PAGES):
+            path = os.path.join(tmpdir, f"doc{i}.pdf")
+            write_text_pdf(path, [lines])
+            data = processor.extract_data(path)
+            for page in data["pages"]:
+                page.get("words")  # load now so the clock never includes extraction
+            fixtures.append(data)
+        return fixtures
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def time_analyze(processor, fixtures, rounds):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, mock.patch("sys.stdout", devnull):
+        for _ in range(rounds):
+            for data in fixtures:
+                processor.analyze_content(data)
+    return rounds * len(fixtures) / (time.perf_counter() - start)
+
+
+def time_patterns(texts, rounds, compiled):
+    """Runs every pattern in the bank over every text, the way the analyzer scans."""
+    patterns = renamer_logic.INSURED_PATTERNS + renamer_logic.DATE_PATTERNS + [
+        renamer_logic.COMPANY_FALLBACK_RE, renamer_logic.TERM_DATE_RE]
+    raw = [(p.pattern, p.flags) for p in patterns]
+    parens = renamer_logic.PARENS_RE
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            if compiled:
+                cleaned = parens.sub(' ', text)
+                for p in patterns:
+                    p.search(cleaned)
+            else:
+                cleaned = re.sub(r'\(.*?\)', ' ', text, flags=re.DOTALL)
+                for pattern, flags in raw:
+                    re.search(pattern, cleaned, flags)
+    return rounds * len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    processor = PDFProcessor()
+    fixtures = capture_fixtures() + synthetic_fixtures(processor)
+    texts = [d.get("full_text", "") for d in fixtures]
+    time_analyze(processor, fixtures, 1)  # warm surname matcher and caches
+    print(f"{len(fixtures)} fixture documents x {rounds} rounds")
+    print(f"analyze_content: {time_analyze(processor, fixtures, rounds):10.1f} docs/s")
+    before = time_patterns(texts, rounds, compiled=False)
+    after = time_patterns(texts, rounds, compiled=True)
+    print(f"pattern bank, re.search(str): {before:10.1f} docs/s")
+    print(f"pattern bank, precompiled:    {after:10.1f} docs/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: document type classification cost versus keyword count.
+
+  substring  one `kw in text` scan per keyword (the old if/elif chain)
+  automaton  DocumentClassifier forced onto the Aho-Corasick automaton
+             (pyahocorasick if installed, else the pure-Python trie)
+  default    DocumentClassifier as analyze_content builds it (without
+             pyahocorasick, small keyword sets stay on substring scans)
+
+Each run classifies a five-page declaration-sized text that contains none of
+the keywords, so every keyword has to be ruled out (the chain's worst case).
+
+Usage: python bench_classifier.py [rounds]
+"""
+import random
+import sys
+import time
+
+import keyword_automaton
+from document_classifier import DocumentClassifier, KeywordRule
+
+KEYWORD_COUNTS = [10, 100, 1000]
+
+VOCAB = ("policy premium coverage insured named effective period liability "
+         "dwelling property auto vehicle location limit endorsement schedule "
+         "form agent producer number total amount").split()
+
+
+def make_keywords(count, seed=1):
+    """Carrier-style form phrases ("<word> <word> form 1234")."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(VOCAB)} {rng.choice(VOCAB)} form {rng.randint(1000, 9999)}-{i}" for i in range(count)]
+
+
+def make_text(seed=2, pages=5):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(pages * 45):
+        lines.append(" ".join(rng.choice(VOCAB) for _ in range(rng.randint(4, 10))))
+    return "\n".join(lines)
+
+
+def substring_chain(rules, text_lower):
+    for rule in rules:
+        if any(k in text_lower for k in rule.keywords):
+            return rule.doc_type
+    return None
+
+
+def timed(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    text = make_text()
+    forced = "native" if keyword_automaton.ahocorasick is not None else "trie"
+    print(f"text: {len(text)} chars, automaton: {forced}")
+    for count in KEYWORD_COUNTS:
+        keywords = make_keywords(count)
+        # Ten keywords per type, like the built-in rules
+        rules = [KeywordRule(f"type{i}", keywords[i:i + 10]) for i in range(0, count, 10)]
+        start = time.perf_counter()
+        automaton = DocumentClassifier(rules, None, method=forced)
+        build_ms = (time.perf_counter() - start) * 1000
+        default = DocumentClassifier(rules, None)
+        assert automaton.classify(text) == default.classify(text) == substring_chain(rules, text)
+        before = timed(lambda: substring_chain(rules, text), rounds)
+        forced_ms = timed(lambda: automaton.classify(text), rounds)
+        default_ms = timed(lambda: default.classify(text), rounds)
+        print(f"{count:>5} keywords: substring {before:7.3f} ms  automaton {forced_ms:7.3f} ms"
+              f" ({before / forced_ms:.2f}x, build {build_ms:.1f} ms)"
+              f"  default[{default.automaton.method}] {default_ms:7.3f} ms ({before / default_ms:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: company detection cost versus carrier list size and text length.
+
+  before   process.extractOne(text, companies, scorer=fuzz.partial_ratio)
+           (what analyze_content used to do)
+  matcher  CompanyMatcher: exact automaton pass, then fuzzy scoring only
+           around trigram-prefiltered tokens
+
+  misspelled  no carrier appears verbatim, so the fuzzy stage has to run
+              (worst case); half the texts contain one misspelled carrier
+  verbatim    every text names one carrier correctly (the usual text-layer
+              case, settled by the exact stage)
+
+Usage: python bench_company.py [docs]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+from thefuzz import process, fuzz
+from company_matcher import CompanyMatcher
+
+VOCAB = ("policy premium coverage insured named effective period liability "
+         "dwelling property auto vehicle location limit endorsement schedule "
+         "form agent producer number total amount due the of and").split()
+SYLLABLES = ("ar ben cor dal el fen gar han is kel lan mor nor pel quin ros sel tor "
+             "ul ver wes yor zan").split()
+SUFFIXES = ["Mutual", "Insurance", "Casualty", "Indemnity", "Assurance", "Specialty", "Group",
+            "Underwriters", "Insurance Company", "Fire & Casualty"]
+PAGE_CHARS = 2500
+
+
+def make_companies(count, seed=3):
+    """
+    The shipped list plus generated carrier names, up to count: a made-up
+    distinctive word (like "Cincinnati" or "Westfield") and a generic suffix.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(script_dir, "known_companies.json"), encoding="utf-8") as f:
+        companies = json.load(f)
+    rng = random.Random(seed)
+    while len(companies) < count:
+        stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        name = f"{stem.title()} {rng.choice(SUFFIXES)}"
+        if name not in companies:
+            companies.append(name)
+    return companies[:count]
+
+
+def misspell(rng, name):
+    pos = rng.randrange(1, len(name) - 1)
+    return name[:pos] + "x" + name[pos + 1:]
+
+
+def make_texts(companies, pages, docs, verbatim=False, seed=4):
+    rng = random.Random(seed)
+    texts = []
+    for d in range(docs):
+        words = []
+        while sum(len(w) + 1 for w in words) < pages * PAGE_CHARS:
+            words.append(rng.choice(VOCAB))
+        if verbatim:
+            words.insert(rng.randrange(len(words)), rng.choice(companies))
+        elif d % 2:
+            candidates = [c for c in companies if len(c) >= 10]
+            words.insert(rng.randrange(len(words)), misspell(rng, rng.choice(candidates)))
+        texts.append(" ".join(words))
+    return texts
+
+
+def before(companies, text):
+    lowered = [c.lower() for c in companies]
+    best, score = process.extractOne(text.lower(), lowered, scorer=fuzz.partial_ratio)
+    return companies[lowered.index(best)] if score > 85 else None
+
+
+def main():
+    docs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for count in (30, 400):
+        companies = make_companies(count)
+        start = time.perf_counter()
+        matcher = CompanyMatcher(companies=companies)
+        build_ms = (time.perf_counter() - start) * 1000
+        for pages, verbatim in ((1, False), (5, False), (5, True)):
+            texts = make_texts(companies, pages, docs, verbatim)
+            start = time.perf_counter()
+            expected = [before(companies, t) for t in texts]
+            old_ms = (time.perf_counter() - start) / docs * 1000
+            start = time.perf_counter()
+            got = [matcher.match(t)[0] for t in texts]
+            new_ms = (time.perf_counter() - start) / docs * 1000
+            assert got == expected, (got, expected)
+            label = "verbatim" if verbatim else "misspelled"
+            print(f"{count:>4} companies, {pages} page(s), {label:>10}: before {old_ms:7.2f} ms/doc"
+                  f"  matcher {new_ms:7.2f} ms/doc  ({old_ms / new_ms:.1f}x, build {build_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
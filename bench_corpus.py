@@ -0,0 +1,157 @@
+"""
+Reproducible synthetic corpus of insurance PDFs for benchmarks.
+
+    generate(directory, count=40, seed=7, scanned=0.25)
+
+writes `count` documents, cycling through declarations (several pages,
+some with the insured under a header rather than after a colon, so the
+spatial search runs), invoices, ACORD 25 certificates and checks, with names
+(Chinese and Western), carriers and dates drawn from a seeded RNG. The
+same arguments always produce the same files. A `scanned` share of the
+documents also gets a rasterized copy: every page rendered to an image and
+saved as an image-only PDF, which is what a scanner produces and what the
+OCR path has to deal with.
+
+manifest.json in the directory lists each file with its kind, expected
+document type and whether it is scanned.
+
+Usage: python bench_corpus.py DIRECTORY [count] [seed]
+"""
+import json
+import os
+import random
+import sys
+
+from sample_pdf import write_text_pdf
+
+KINDS = ("declaration", "invoice", "certificate", "check")
+EXPECTED_TYPE = {"declaration": "POLICY", "invoice": "INVOICE", "certificate": "CERTIFICATE", "check": "CHECK"}
+
+CHINESE_NAMES = ["Wang Wei", "Li Mei Hua", "Zhang Xiao Ming", "Chen Jie", "Liu Yang", "Huang Li Na", "Zhao Lei"]
+WESTERN_NAMES = ["John Doe", "Maria Garcia", "Robert Miller", "Susan Clark", "David Johnson", "Linda Moore"]
+BUSINESS_NAMES = ["Golden Dragon Restaurant LLC", "Sunrise Auto Repair Inc", "Blue Harbor Trading Corp"]
+CARRIERS = ["Geico", "State Farm", "Allstate", "Liberty Mutual", "Progressive", "Travelers", "Chubb"]
+# Ordinary policy wording; deliberately free of other document types' keywords
+FILLER = ("coverage limit premium endorsement schedule location vehicle dwelling property liability "
+          "form agent producer number total amount each occurrence aggregate medical expense "
+          "personal advertising injury products completed operations").split()
+RASTER_DPI = 100
+
+
+def _date(rng):
+    return rng.randint(1, 12), rng.randint(1, 28), rng.randint(2022, 2027)
+
+
+def _fmt(date):
+    month, day, year = date
+    return f"{month:02}/{day:02}/{year}"
+
+
+def _filler_lines(rng, count):
+    return [" ".join(rng.choice(FILLER) for _ in range(rng.randint(6, 12))).capitalize() for _ in range(count)]
+
+
+def _declaration(rng, insured, carrier, date):
+    month, day, year = date
+    period = f"Policy Period: {_fmt(date)} to {_fmt((month, day, year + 1))}"
+    if rng.random() < 0.5:
+        header = ["COMMERCIAL PACKAGE POLICY DECLARATIONS", f"Named Insured: {insured}",
+                  f"Insurance Company: {carrier}", f"Policy Number: CPP{rng.randint(1000000, 9999999)}", period]
+    else:
+        # Name in a box under its label: only the spatial search finds it
+        header = [(72, 72, "POLICY DECLARATIONS"), (72, 110, "NAMED INSURED"), (320, 110, "AGENT"),
+                  (72, 126, insured), (320, 126, "Main Street Insurance Agency"),
+                  (72, 160, f"Company: {carrier}"), (72, 176, period)]
+    pages = [header + [(72, 220 + 18 * i, line) for i, line in enumerate(_filler_lines(rng, 20))]]
+    for _ in range(rng.randint(1, 3)):
+        pages.append(_filler_lines(rng, 30) + ["Deductible: $1,000 per occurrence, all perils"])
+    return pages
+
+
+def _invoice(rng, insured, carrier, date):
+    return [[
+        "INVOICE",
+        f"{carrier}",
+        f"Insured: {insured}",
+        f"Invoice Date: {_fmt(date)}",
+        f"Account Number: {rng.randint(100000, 999999)}",
+        f"Amount Due: ${rng.randint(100, 9000)}.00",
+    ] + _filler_lines(rng, 15)]
+
+
+def _certificate(rng, insured, carrier, date):
+    return [[
+        "ACORD 25 CERTIFICATE OF LIABILITY INSURANCE",
+        f"Date of Issue: {_fmt(date)}",
+        "Producer: Main Street Insurance Agency",
+        f"Insured: {insured}",
+        f"Insurer A: {carrier}",
+    ] + _filler_lines(rng, 25)]
+
+
+def _check(rng, insured, carrier, date):
+    return [[
+        insured,
+        "123 Main Street",
+        f"Check No. {rng.randint(1000, 9999)}",
+        f"Date {_fmt(date)}",
+        f"Pay to the order of {carrier} ${rng.randint(100, 9000)}.00",
+        "First National Bank",
+    ]]
+
+
+TEMPLATES = {"declaration": _declaration, "invoice": _invoice, "certificate": _certificate, "check": _check}
+
+
+def rasterize(src, dst, dpi=RASTER_DPI):
+    """Renders every page of src to a grayscale image and writes them as an image-only PDF."""
+    import pdfplumber
+
+    with pdfplumber.open(src) as pdf:
+        images = [page.to_image(resolution=dpi).original.convert("L") for page in pdf.pages]
+    images[0].save(dst, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+    for image in images:
+        image.close()
+    return dst
+
+
+def generate(directory, count=40, seed=7, scanned=0.25):
+    """Writes the corpus and its manifest into directory; returns the manifest entries."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        kind = KINDS[i % len(KINDS)]
+        pool = rng.choice((CHINESE_NAMES, WESTERN_NAMES, BUSINESS_NAMES if kind != "check" else WESTERN_NAMES))
+        insured = rng.choice(pool)
+        pages = TEMPLATES[kind](rng, insured, rng.choice(CARRIERS), _date(rng))
+        name = f"{i:04}_{kind}.pdf"
+        path = write_text_pdf(os.path.join(directory, name), pages)
+        entries.append({"file": name, "kind": kind, "expected_type": EXPECTED_TYPE[kind],
+                        "insured": insured, "pages": len(pages), "scanned": False})
+        if rng.random() < scanned:
+            scan_name = f"{i:04}_{kind}_scan.pdf"
+            rasterize(path, os.path.join(directory, scan_name))
+            entries.append(dict(entries[-1], file=scan_name, scanned=True))
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": seed, "count": count, "scanned": scanned, "files": entries}, f, indent=1)
+    return entries
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+    entries = generate(sys.argv[1], count, seed)
+    print(f"Wrote {len(entries)} files ({sum(e['scanned'] for e in entries)} scanned) to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: pages/second for text + word extraction over text-layer PDFs.
+
+  before      page.extract_text() + page.extract_words() (what extract_data used to do)
+  two-pass    TwoPassBackend, words requested for every page (worst case)
+  single-pass SinglePassBackend (text and words from one clustering pass)
+
+Usage: python bench_extraction.py [num_docs] [pages_per_doc]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import pdfplumber
+from extraction_backends import SinglePassBackend, TwoPassBackend, WORD_ATTRS
+from sample_pdf import write_text_pdf
+
+VOCAB = ("policy premium coverage insured named effective date period liability "
+         "deductible dwelling property auto vehicle location limit endorsement "
+         "schedule form agent producer number total amount due").split()
+
+
+def make_corpus(directory, num_docs, pages_per_doc, seed=11):
+    rng = random.Random(seed)
+    paths = []
+    for d in range(num_docs):
+        pages = []
+        for _ in range(pages_per_doc):
+            lines = []
+            for row in range(45):
+                words = " ".join(rng.choice(VOCAB) for _ in range(rng.randint(4, 10)))
+                lines.append((72 if row % 3 else 320, 60 + row * 15, words.capitalize()))
+            pages.append(lines)
+        path = os.path.join(directory, f"doc{d:03d}.pdf")
+        write_text_pdf(path, pages, font_size=9)
+        paths.append(path)
+    return paths
+
+
+def run(paths, extract_page, clustering_only=False):
+    """
+    Pages per second. With clustering_only, pdfminer's character parsing
+    (shared by every strategy) is done before the clock runs.
+    """
+    pages = 0
+    elapsed = 0.0
+    for path in paths:
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages:
+                if clustering_only:
+                    page.chars
+                start = time.perf_counter()
+                extract_page(page)
+                elapsed += time.perf_counter() - start
+                pages += 1
+    return pages / elapsed
+
+
+def before(page):
+    page.extract_text()
+    page.extract_words(extra_attrs=WORD_ATTRS)
+
+
+def two_pass(page, backend=TwoPassBackend()):
+    backend.extract(page)
+    backend.extract_words(page)
+
+
+def single_pass(page, backend=SinglePassBackend()):
+    backend.extract(page)
+
+
+def main():
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pages_per_doc = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    tmpdir = tempfile.mkdtemp()
+    try:
+        paths = make_corpus(tmpdir, num_docs, pages_per_doc)
+        run(paths[:2], before)  # warm imports/caches
+        print(f"{num_docs} docs x {pages_per_doc} pages")
+        for label, clustering_only in (("end to end", False), ("clustering only", True)):
+            results = [("before", run(paths, before, clustering_only)),
+                       ("two-pass", run(paths, two_pass, clustering_only)),
+                       ("single-pass", run(paths, single_pass, clustering_only))]
+            base = results[0][1]
+            print(f"[{label}]")
+            for name, rate in results:
+                print(f"{name:>12}: {rate:8.1f} pages/s  ({rate / base:.2f}x)")
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
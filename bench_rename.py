@@ -0,0 +1,120 @@
+"""
+Benchmark: renaming many files into a directory full of collisions.
+
+  before  the old rename_file loop: os.path.exists for name, name_1, ...
+          until one is free, then os.rename
+  bulk    BulkRenamer: one listing of the directory, atomic claims, and a
+          journal line per rename
+  procs   the same renames split across `procs` worker processes, each
+          with its own BulkRenamer, all renaming into the one directory
+          at once (as renamer_cli --jobs does)
+
+Each scenario gets a fresh directory holding `targets` names that already
+have `existing` copies each (Doc.pdf, Doc_1.pdf, ...), plus `files` source
+files that are all renamed to one of those names. The bulk run is undone
+afterwards to time the journal's undo as well.
+
+Usage: python bench_rename.py [files] [targets] [existing] [procs]
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from bulk_renamer import BulkRenamer, RenameJournal, undo_journal
+
+
+def before(filepath, new_name):
+    directory = os.path.dirname(filepath)
+    new_path = os.path.join(directory, new_name)
+    if os.path.exists(new_path):
+        base, extension = os.path.splitext(new_name)
+        counter = 1
+        while os.path.exists(new_path):
+            new_path = os.path.join(directory, f"{base}_{counter}{extension}")
+            counter += 1
+    os.rename(filepath, new_path)
+    return new_path
+
+
+def make_tree(directory, files, targets, existing):
+    """Returns [(source path, target name)]."""
+    names = [f"Insured_{t:03}_Geico_DEC_EFF_01-25-2026.pdf" for t in range(targets)]
+    for name in names:
+        base, extension = os.path.splitext(name)
+        for k in range(existing):
+            open(os.path.join(directory, name if k == 0 else f"{base}_{k}{extension}"), "w").close()
+    renames = []
+    for i in range(files):
+        path = os.path.join(directory, f"scan_{i:05}.pdf")
+        open(path, "w").close()
+        renames.append((path, names[i % targets]))
+    return renames
+
+
+def _rename_chunk(chunk, start):
+    start.wait()
+    renamer = BulkRenamer()
+    return [(path, new_path) for path, new_path in renamer.rename_many(chunk) if isinstance(new_path, str)]
+
+
+def in_processes(renames, procs):
+    """Renames in `procs` processes started together; returns every new path."""
+    start = multiprocessing.Manager().Event()
+    with multiprocessing.Pool(procs) as pool:
+        pending = [pool.apply_async(_rename_chunk, (renames[i::procs], start)) for i in range(procs)]
+        begin = time.perf_counter()
+        start.set()
+        renamed = [pair for result in pending for pair in result.get()]
+        return renamed, time.perf_counter() - begin
+
+
+def timed(label, fn, count):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>7}: {elapsed * 1000:8.1f} ms  ({elapsed / count * 1e6:6.1f} us/file)")
+    return elapsed
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    targets = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    existing = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    procs = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+    print(f"{files} files into {targets} names with {existing} existing copies each")
+    root = tempfile.mkdtemp()
+    try:
+        old_dir = os.path.join(root, "before")
+        os.makedirs(old_dir)
+        renames = make_tree(old_dir, files, targets, existing)
+        t_before = timed("before", lambda: [before(path, name) for path, name in renames], files)
+
+        new_dir = os.path.join(root, "bulk")
+        os.makedirs(new_dir)
+        renames = make_tree(new_dir, files, targets, existing)
+        journal_path = os.path.join(root, "renames.jsonl")
+        with RenameJournal(journal_path) as journal:
+            renamer = BulkRenamer(journal)
+            t_bulk = timed("bulk", lambda: renamer.rename_many(renames), files)
+
+        assert sorted(os.listdir(old_dir)) == sorted(os.listdir(new_dir)), "different names chosen"
+        timed("undo", lambda: undo_journal(journal_path), files)
+        assert all(os.path.exists(path) for path, _ in renames), "undo left files behind"
+        print(f"speedup: {t_before / t_bulk:.1f}x")
+
+        shared_dir = os.path.join(root, "procs")
+        os.makedirs(shared_dir)
+        renames = make_tree(shared_dir, files, targets, existing)
+        renamed, elapsed = in_processes(renames, procs)
+        print(f"{'procs':>7}: {elapsed * 1000:8.1f} ms  ({elapsed / files * 1e6:6.1f} us/file, {procs} processes)")
+        assert len(renamed) == files and len({new for _, new in renamed}) == files, "processes shared a name"
+        assert len(os.listdir(shared_dir)) == len(os.listdir(new_dir)), "files lost"
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
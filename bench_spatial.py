@@ -0,0 +1,92 @@
+"""
+Benchmark: anchor neighbourhood lookup cost versus page word count.
+
+Compares the old full-scan neighbour search (with words.index() per word)
+against the PageWordIndex range queries used by _find_text_spatially.
+
+Usage: python bench_spatial.py
+"""
+import random
+import time
+
+from renamer_logic import PDFProcessor
+from spatial_index import PageWordIndex
+
+WORD_COUNTS = [100, 500, 1500, 3000]
+
+
+def make_page_words(count, seed=7):
+    """Dense form-like page: rows of short words plus one 'Named Insured:' anchor."""
+    rng = random.Random(seed)
+    words = []
+    per_line = 12
+    lines = max(1, count // per_line)
+    anchor_line = lines // 2
+    for line in range(lines):
+        top = 20 + line * 12
+        for col in range(per_line):
+            x0 = 10 + col * 48
+            text = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(5))
+            if line == anchor_line and col == 0:
+                text = "Named"
+            elif line == anchor_line and col == 1:
+                text = "Insured:"
+            elif line == anchor_line and col in (2, 3):
+                text = ["John", "Wick"][col - 2]
+            words.append({"text": text, "x0": x0, "x1": x0 + 40, "top": top, "bottom": top + 10})
+    return words, anchor_line * per_line
+
+
+def legacy_right_lookup(words, i, kw, kw_len, anchor_top, anchor_bottom, anchor_right, x_tolerance):
+    """Neighbour search as it was before the index (full scan + words.index)."""
+    found = []
+    for w in words:
+        if w['text'].lower() in kw: continue
+        if i <= words.index(w) < i + kw_len: continue
+        w_mid = (w['top'] + w['bottom']) / 2
+        if w_mid >= (anchor_top - 5) and w_mid <= (anchor_bottom + 5):
+            if w['x0'] > anchor_right and (w['x0'] - anchor_right) < x_tolerance:
+                found.append(w)
+    return found
+
+
+def indexed_right_lookup(index, words, i, kw, kw_len, anchor_top, anchor_bottom, anchor_right, x_tolerance):
+    found = []
+    for j in index.in_mid_band(anchor_top - 5, anchor_bottom + 5):
+        w = words[j]
+        if w['text'].lower() in kw: continue
+        if i <= j < i + kw_len: continue
+        if w['x0'] > anchor_right and (w['x0'] - anchor_right) < x_tolerance:
+            found.append(w)
+    return found
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    processor = PDFProcessor()
+    kw = "named insured:"
+    print(f"{'words':>6} {'legacy lookup ms':>17} {'indexed lookup ms':>18} {'speedup':>8} {'full _find_text_spatially ms':>29}")
+    for count in WORD_COUNTS:
+        words, i = make_page_words(count)
+        anchor = words[i + 1]
+        args = (i, kw, 2, anchor['top'], anchor['bottom'], anchor['x1'], 300)
+        index = PageWordIndex(words)
+        repeat = max(3, 3000 // count)
+
+        legacy_ms = time_call(lambda: legacy_right_lookup(words, *args), repeat)
+        indexed_ms = time_call(lambda: indexed_right_lookup(index, words, *args), repeat)
+
+        data = {"full_text": "", "pages": [{"words": words, "width": 612, "height": 792, "text": ""}]}
+        full_ms = time_call(lambda: processor._find_text_spatially(data, [kw], 'right', x_tolerance=300), repeat)
+
+        print(f"{count:>6} {legacy_ms:>17.3f} {indexed_ms:>18.3f} {legacy_ms / indexed_ms:>7.0f}x {full_ms:>29.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: cold-start cost, each run in a fresh interpreter.
+
+  import        import renamer_logic and build a PDFProcessor
+  window        QApplication + MainWindow shown and painted once
+                (offscreen unless QT_QPA_PLATFORM is set)
+  first_result  PDFProcessor().process_document() on a one-page text PDF
+
+Times are wall clock from spawning the interpreter to the scenario being
+done, so they include Python's own startup. The heavy dependencies each
+scenario ends up loading are listed too; "import" and "window" should load
+none of them (test_startup.py checks this).
+
+Usage: python bench_startup.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from sample_pdf import write_text_pdf
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ["pdfplumber", "pdfminer", "pytesseract", "rapidfuzz", "thefuzz", "numpy", "PIL"]
+
+SCENARIOS = {
+    "import": """
+import renamer_logic
+renamer_logic.PDFProcessor()
+""",
+    "window": """
+from PyQt6.QtWidgets import QApplication
+import main_window
+app = QApplication(sys.argv)
+window = main_window.MainWindow()
+window.show()
+app.processEvents()
+""",
+    "first_result": """
+import renamer_logic
+result = renamer_logic.PDFProcessor().process_document(sys.argv[1], rename=False)
+assert result["status"] == "planned", result
+""",
+}
+
+# Reports which heavy modules got loaded, then signals the parent
+REPORT = """
+print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)), flush=True)
+"""
+
+
+def make_sample(directory):
+    path = os.path.join(directory, "startup_sample.pdf")
+    write_text_pdf(path, [[
+        "INSURANCE POLICY DECLARATION",
+        "Named Insured: John Doe",
+        "Effective Date: 01/25/2026",
+        "Company: Geico",
+    ]])
+    return path
+
+
+def run_once(scenario, sample_path):
+    """(elapsed_ms, heavy modules loaded) for one fresh interpreter."""
+    code = "import json, sys\n" + SCENARIOS[scenario] + REPORT.format(heavy=HEAVY_MODULES)
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code, sample_path], cwd=SCRIPT_DIR, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, err = proc.communicate()
+    if proc.returncode != 0 or not line:
+        raise RuntimeError(f"{scenario} failed:\n{err}")
+    return elapsed, json.loads(line)
+
+
+def measure(scenario, runs=5):
+    """(median_ms, min_ms, heavy modules loaded) over several cold starts."""
+    with tempfile.TemporaryDirectory() as tmp:
+        sample_path = make_sample(tmp)
+        results = [run_once(scenario, sample_path) for _ in range(runs)]
+    times = [t for t, _ in results]
+    return statistics.median(times), min(times), results[-1][1]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for scenario in SCENARIOS:
+        try:
+            median, best, loaded = measure(scenario, runs)
+        except RuntimeError as e:
+            print(f"{scenario:>12}: skipped ({str(e).strip().splitlines()[-1]})")
+            continue
+        print(f"{scenario:>12}: median {median:7.1f} ms  min {best:7.1f} ms  loads {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Benchmark suite: per-stage speed and memory on the synthetic corpus
+(bench_corpus.py), with a stored baseline and an offline regression check.
+
+  extract     PDFProcessor.extract_data() per text-layer document
+  analyze     analyze_content() on already-extracted documents
+  spatial     _find_text_spatially() for the insured-name anchors
+  surnames    SurnameMatcher.find_potential_names() on the full text
+  end_to_end  process_document(rename=False) per text-layer document
+  scanned     process_document(rename=False) per rasterized document
+              (skipped when Tesseract is not installed)
+
+Each stage runs in a fresh interpreter, so its peak RSS is its own, and
+reports throughput (items/s), p50/p95 latency per item (ms) and peak RSS
+(MB). A stage makes --repeats timed passes over the corpus and keeps the
+fastest, which filters out most noise from other work on the machine; the
+sub-millisecond stages go over the corpus MICRO_ROUNDS times per pass. The
+document stages also report the share of documents classified as the
+manifest expects.
+
+    python bench_suite.py                  # print the table
+    python bench_suite.py --save-baseline  # store it in bench_baseline.json
+    python bench_suite.py --check          # exit 1 on a regression
+
+--check flags a stage whose p50 or p95 latency grew, or whose throughput
+fell, by more than --threshold (default 30%), whose peak RSS grew by more
+than --rss-threshold (default 20%), or whose accuracy dropped at all.
+Timings only compare well on the machine the baseline was saved on; a
+different machine is reported before the table.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_corpus
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, "bench_baseline.json")
+STAGES = ("extract", "analyze", "spatial", "surnames", "end_to_end", "scanned")
+# Passes over the corpus per timed pass for the stages that take well under a millisecond
+MICRO_ROUNDS = 10
+MICRO_STAGES = ("analyze", "spatial", "surnames")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile (p in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def ocr_available():
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+def _documents(corpus, scanned):
+    manifest = bench_corpus.load_manifest(corpus)
+    return [(os.path.join(corpus, e["file"]), e) for e in manifest["files"] if e["scanned"] == scanned]
+
+
+def _time_items(items, fn):
+    """Calls fn on every item; returns per-item latencies in seconds and fn's results."""
+    latencies, outputs = [], []
+    for item in items:
+        start = time.perf_counter()
+        outputs.append(fn(item))
+        latencies.append(time.perf_counter() - start)
+    return latencies, outputs
+
+
+def run_stage(stage, corpus, rounds, repeats=3):
+    """
+    Runs one stage in this process; returns the fastest pass's latencies
+    (s) and wall time (s), and accuracy (or None).
+    """
+    from renamer_logic import PDFProcessor, NAME_COLON_KEYS, NAME_NO_COLON_KEYS
+
+    processor = PDFProcessor()
+    if stage == "scanned" and not ocr_available():
+        return {"skipped": "Tesseract not installed"}
+    docs = _documents(corpus, scanned=stage == "scanned")
+    if stage in MICRO_STAGES:
+        rounds *= MICRO_ROUNDS
+    paths = [path for path, _ in docs] * rounds
+    expected = [entry["expected_type"] for _, entry in docs] * rounds
+
+    if stage in ("end_to_end", "scanned"):
+        fn = lambda path: processor.process_document(path, rename=False)["doc_type"]
+        items = paths
+    elif stage == "extract":
+        fn = processor.extract_data
+        items = paths
+    else:
+        # Extraction happens before the clock runs
+        extracted = {path: processor.extract_data(path) for path, _ in docs}
+        items = [(path, extracted[path]) for path in paths]
+        if stage == "analyze":
+            fn = lambda item: processor.analyze_content(item[1], item[0])[0].name
+        elif stage == "spatial":
+            fn = lambda item: (processor._find_text_spatially(item[1], NAME_COLON_KEYS, 'right', x_tolerance=300)
+                               or processor._find_text_spatially(item[1], NAME_NO_COLON_KEYS, 'below', y_tolerance=25))
+        elif stage == "surnames":
+            fn = lambda item: processor.surname_matcher.find_potential_names(item[1]["full_text"])
+        else:
+            raise ValueError(f"unknown stage {stage!r}")
+
+    # One untimed item first, so lazy imports and warm-up are not in the numbers
+    if items:
+        fn(items[0])
+    best = None
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        latencies, outputs = _time_items(items, fn)
+        wall = time.perf_counter() - start
+        if best is None or wall < best[0]:
+            best = (wall, latencies)
+    wall, latencies = best
+    accuracy = None
+    if stage in ("analyze", "end_to_end", "scanned") and outputs:
+        accuracy = sum(out == exp for out, exp in zip(outputs, expected)) / len(outputs)
+    return {"latencies": latencies, "wall": wall, "accuracy": accuracy}
+
+
+def summarize(raw):
+    if "skipped" in raw:
+        return {"skipped": raw["skipped"]}
+    latencies = raw["latencies"]
+    if not latencies:
+        return {"skipped": "no documents"}
+    summary = {
+        "items": len(latencies),
+        "per_sec": round(len(latencies) / raw["wall"], 2) if raw["wall"] else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "peak_rss_mb": round(raw["peak_rss_mb"], 1) if raw.get("peak_rss_mb") is not None else None,
+    }
+    if raw.get("accuracy") is not None:
+        summary["accuracy"] = round(raw["accuracy"], 3)
+    return summary
+
+
+def measure(stage, corpus, rounds, repeats=3):
+    """Runs a stage in a fresh interpreter and returns its summary."""
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--run-stage", stage,
+                           "--corpus", corpus, "--rounds", str(rounds), "--repeats", str(repeats)],
+                          cwd=SCRIPT_DIR, capture_output=True, text=True)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"{stage} failed:\n{proc.stderr}")
+    # The processor may print; the result is the last line
+    return summarize(json.loads(lines[-1]))
+
+
+def machine():
+    return {"platform": platform.platform(), "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()}
+
+
+def corpus_settings(args):
+    return {"count": args.count, "seed": args.seed, "rounds": args.rounds, "repeats": args.repeats}
+
+
+def compare(results, baseline, threshold=0.30, rss_threshold=0.20):
+    """Returns a list of regression messages (empty when everything is within the thresholds)."""
+    problems = []
+    for stage, current in results.items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base or "skipped" in base or "skipped" in current:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if current[metric] > base[metric] * (1 + threshold):
+                problems.append(f"{stage}: {metric} {current[metric]} > {base[metric]} (+{threshold:.0%})")
+        if current["per_sec"] < base["per_sec"] / (1 + threshold):
+            problems.append(f"{stage}: per_sec {current['per_sec']} < {base['per_sec']} (-{threshold:.0%})")
+        if current.get("peak_rss_mb") and base.get("peak_rss_mb"):
+            if current["peak_rss_mb"] > base["peak_rss_mb"] * (1 + rss_threshold):
+                problems.append(f"{stage}: peak_rss_mb {current['peak_rss_mb']} > {base['peak_rss_mb']} "
+                                f"(+{rss_threshold:.0%})")
+        if base.get("accuracy") is not None and current.get("accuracy", 0) < base["accuracy"]:
+            problems.append(f"{stage}: accuracy {current.get('accuracy')} < {base['accuracy']}")
+    return problems
+
+
+def format_table(results, baseline=None):
+    lines = [f"{'stage':>10} {'items':>6} {'per_sec':>9} {'p50_ms':>9} {'p95_ms':>9} {'rss_mb':>7} {'acc':>5}"]
+    for stage, s in results.items():
+        if "skipped" in s:
+            lines.append(f"{stage:>10}  skipped ({s['skipped']})")
+            continue
+        acc = f"{s['accuracy']:.2f}" if s.get("accuracy") is not None else "-"
+        lines.append(f"{stage:>10} {s['items']:>6} {s['per_sec']:>9.1f} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+                     f"{s['peak_rss_mb'] if s['peak_rss_mb'] is not None else '-':>7} {acc:>5}")
+        base = (baseline or {}).get("stages", {}).get(stage)
+        if base and "skipped" not in base:
+            delta = " ".join(f"{m} {(s[m] - base[m]) / base[m]:+.0%}" for m in ("per_sec", "p50_ms", "p95_ms")
+                             if base.get(m))
+            lines.append(f"{'':>10} vs baseline: {delta}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Per-stage benchmark suite with a baseline check.")
+    parser.add_argument("--corpus", help="existing corpus directory (default: generate a temporary one)")
+    parser.add_argument("--count", type=int, default=40, help="documents to generate (default 40)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=1, help="passes over the corpus per timed pass")
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes per stage; the fastest counts")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="compare with the baseline; exit 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=0.30, help="allowed latency/throughput change")
+    parser.add_argument("--rss-threshold", type=float, default=0.20, help="allowed peak RSS growth")
+    parser.add_argument("--run-stage", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.run_stage:
+        raw = run_stage(args.run_stage, args.corpus, args.rounds, args.repeats)
+        raw["peak_rss_mb"] = peak_rss_mb()
+        print(json.dumps(raw))
+        return 0
+
+    tmp = None
+    corpus = args.corpus
+    if corpus is None:
+        tmp = corpus = tempfile.mkdtemp(prefix="bench_corpus_")
+        bench_corpus.generate(corpus, args.count, args.seed)
+    try:
+        results = {}
+        for stage in args.stages.split(","):
+            results[stage] = measure(stage, corpus, args.rounds, args.repeats)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    baseline = None
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+            return 2
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != machine():
+            print(f"Warning: baseline was saved on a different machine ({baseline.get('machine')}).")
+        if baseline.get("corpus") != corpus_settings(args):
+            print(f"Warning: baseline used a different corpus ({baseline.get('corpus')}).")
+    print(format_table(results, baseline))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "corpus": corpus_settings(args),
+                       "saved": time.strftime("%Y-%m-%d"), "stages": results}, f, indent=1)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+    if baseline is not None:
+        problems = compare(results, baseline, args.threshold, args.rss_threshold)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
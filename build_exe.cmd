@@ -8,7 +8,13 @@ echo Building EXE...
 pyinstaller --noconsole --onefile ^
     --name "PDFRenamer" ^
     --add-data "chinese_surnames_detailed.json;." ^
+    --add-data "chinese_surnames_detailed.idx;." ^
+    --add-data "known_companies.json;." ^
     --hidden-import="pdfplumber" ^
+    --hidden-import="pdfplumber.utils.text" ^
+    --hidden-import="company_matcher" ^
+    --hidden-import="rapidfuzz.fuzz" ^
+    --hidden-import="rapidfuzz.process" ^
     --hidden-import="thefuzz" ^
     --hidden-import="Levenshtein" ^
     --hidden-import="pytesseract" ^
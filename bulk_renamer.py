@@ -0,0 +1,257 @@
+"""
+Collision-safe renaming for many files at once.
+
+The old rename loop probed os.path.exists for name, name_1, name_2, ...,
+which cost one stat per attempt, and two workers renaming into the same
+folder could both decide that name_1 was free. BulkRenamer lists each target
+directory once into an in-memory index of taken names and claims a name
+atomically with move_exclusive(): the file is hard-linked to its new name,
+which fails if the name exists, and the old name is removed. Where hard links
+are not supported (FAT, some network shares) an empty placeholder is created
+with O_EXCL and the file is moved over it. The index is trusted, not
+checked against the directory before each rename (with several processes
+renaming into one folder the directory changes on almost every rename): a
+name taken behind the index's back only costs another attempt and one
+fresh listing, never a lost file. A name freed behind its back (the file
+was deleted or moved away) is caught with one stat of the wanted name
+before a suffix is added; the directory is then listed afresh.
+
+Renames can be appended to a RenameJournal (one JSON line per rename, old and
+new path), and undo_journal() moves a whole batch back. Files a run created
+rather than renamed (the documents split out of a scan batch) are journaled
+with no old path, and undo removes them.
+"""
+import json
+import os
+import threading
+import time
+
+
+def move_exclusive(src, dst):
+    """Moves src to dst within one directory; raises FileExistsError if dst exists."""
+    try:
+        os.link(src, dst)
+    except (FileExistsError, FileNotFoundError):
+        raise
+    except OSError:
+        # No hard links here: reserve dst with an exclusive create, then move over it
+        os.close(os.open(dst, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        try:
+            os.replace(src, dst)
+        except OSError:
+            os.unlink(dst)
+            raise
+        return
+    try:
+        os.unlink(src)
+    except OSError:
+        # e.g. src is open on Windows: leave things as they were
+        os.unlink(dst)
+        raise
+
+
+class _DirectoryIndex:
+    """Names taken in one directory, listed once and kept up to date by the renamer."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.names = set()
+        # Names reserved by a rename still in progress
+        self.claiming = set()
+        # normcased new_name -> next suffix worth trying
+        self.next_suffix = {}
+        self.refresh()
+
+    def refresh(self, replace=False):
+        """
+        Adds the names currently in the directory; names reserved but not yet
+        claimed stay taken. replace=True also forgets names that are gone.
+        """
+        listed = {os.path.normcase(name) for name in os.listdir(self.directory or ".")}
+        if replace:
+            self.names = listed | self.claiming
+            self.next_suffix.clear()
+        else:
+            self.names.update(listed)
+
+    def is_stale(self, name):
+        """True when the index has name as taken but no file of that name exists any more."""
+        key = os.path.normcase(name)
+        return (key in self.names and key not in self.claiming
+                and not os.path.lexists(os.path.join(self.directory, name)))
+
+
+class BulkRenamer:
+    """
+    Renames files in place, adding _1, _2, ... to a name that is taken, the
+    same names rename_file always produced. Safe to share between threads;
+    separate processes each keep their own index and still never overwrite
+    one another's files.
+    """
+
+    def __init__(self, journal=None):
+        # Optional RenameJournal that every successful rename is appended to
+        self.journal = journal
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def _index(self, directory):
+        index = self._indexes.get(directory)
+        if index is None:
+            index = self._indexes[directory] = _DirectoryIndex(directory)
+        return index
+
+    def _reserve(self, index, new_name):
+        """Picks the first name not in the index and marks it taken."""
+        key = os.path.normcase(new_name)
+        candidate = new_name
+        if index.is_stale(new_name):
+            # Deleted or moved away since it was listed (e.g. a previous batch's output)
+            index.refresh(replace=True)
+        if key in index.names:
+            base, extension = os.path.splitext(new_name)
+            counter = index.next_suffix.get(key, 1)
+            while True:
+                candidate = f"{base}_{counter}{extension}"
+                counter += 1
+                if os.path.normcase(candidate) not in index.names:
+                    break
+            index.next_suffix[key] = counter
+        index.names.add(os.path.normcase(candidate))
+        index.claiming.add(os.path.normcase(candidate))
+        return candidate
+
+    def rename(self, filepath, new_name):
+        """Renames filepath to new_name (or the first free suffixed name) in its directory; returns the new path."""
+        directory = os.path.dirname(filepath)
+        while True:
+            with self._lock:
+                index = self._index(directory)
+                candidate = self._reserve(index, new_name)
+            new_path = os.path.join(directory, candidate)
+            try:
+                move_exclusive(filepath, new_path)
+            except FileExistsError:
+                # Taken since the directory was listed (it stays marked as taken): others may be too
+                with self._lock:
+                    index.claiming.discard(os.path.normcase(candidate))
+                    index.refresh()
+                continue
+            except OSError:
+                with self._lock:
+                    index.claiming.discard(os.path.normcase(candidate))
+                    index.names.discard(os.path.normcase(candidate))
+                raise
+            with self._lock:
+                index.claiming.discard(os.path.normcase(candidate))
+                index.names.discard(os.path.normcase(os.path.basename(filepath)))
+            if self.journal is not None:
+                self.journal.record(filepath, new_path)
+            return new_path
+
+    def rename_many(self, renames):
+        """Renames (filepath, new_name) pairs; returns (filepath, new_path or the OSError) for each."""
+        results = []
+        for filepath, new_name in renames:
+            try:
+                results.append((filepath, self.rename(filepath, new_name)))
+            except OSError as e:
+                results.append((filepath, e))
+        return results
+
+
+class RenameJournal:
+    """
+    Append-only JSON lines log of renames: {"old": ..., "new": ..., "time": ...}.
+    Created files have "old": null and the file they came from as "source".
+    Each entry is one write to a file opened with O_APPEND, so several
+    processes (each with its own copy of the journal) can share one file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to worker processes: each one opens the file itself
+        state = self.__dict__.copy()
+        state["_fd"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, old_path, new_path):
+        self._write({"old": os.path.abspath(old_path), "new": os.path.abspath(new_path), "time": time.time()})
+
+    def record_created(self, new_path, source=None):
+        """Logs a file this run created; undo deletes it."""
+        self._write({"old": None, "new": os.path.abspath(new_path),
+                     "source": os.path.abspath(source) if source else None, "time": time.time()})
+
+    def _write(self, entry):
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0))
+            # Unbuffered, so a crash loses at most the rename in progress
+            os.write(self._fd, line)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(path):
+    """(old, new) pairs in the order they were written, old None for created files; a torn last line is ignored."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries.append((entry["old"], entry["new"]))
+    return entries
+
+
+def undo_journal(path):
+    """
+    Moves every file in the journal back to its old name, newest first, and
+    deletes the files it records as created.
+    Returns one dict per entry: old, new, status (restored | removed |
+    missing | occupied | error) and error. Files already restored or removed
+    count as missing, so undoing twice is harmless.
+    """
+    results = []
+    for old_path, new_path in reversed(read_journal(path)):
+        result = {"old": old_path, "new": new_path, "status": "restored", "error": None}
+        try:
+            if old_path is None:
+                os.remove(new_path)
+                result["status"] = "removed"
+            else:
+                move_exclusive(new_path, old_path)
+        except FileNotFoundError:
+            result["status"] = "missing"
+        except FileExistsError:
+            result["status"] = "occupied"
+        except OSError as e:
+            result["status"] = "error"
+            result["error"] = f"Error: {e}"
+        results.append(result)
+    return results
@@ -0,0 +1,171 @@
+import json
+import re
+
+from rapidfuzz import fuzz, process
+from thefuzz.process import default_processor
+
+from keyword_automaton import KeywordAutomaton
+
+# A company matches when its partial_ratio score (rounded) is above this
+MATCH_THRESHOLD = 85
+# Names this short can only clear the threshold with an exact hit (one edit
+# already drops a full-length window to 83), so they skip the fuzzy stage
+FUZZY_MIN_LEN = 7
+# Allowance below the worst-case anchor token score (rounding, split words)
+ANCHOR_SLACK = 5
+# Below this much text (about three pages) scanning every name directly is
+# cheaper than indexing the text (see bench_company.py)
+DIRECT_SCAN_CHARS = 8000
+# Never produced by default_processor, so padding with it matches nothing
+PAD = "\x00"
+
+TOKEN_RE = re.compile(r'[^ ]+')
+
+
+def grams(token):
+    """Character bigrams of a token (one-letter tokens are their own gram)."""
+    if len(token) < 2:
+        return {token}
+    return {token[i:i + 2] for i in range(len(token) - 1)}
+
+
+class CompanyMatcher:
+    """
+    Finds which known company a document names. Answers like thefuzz's
+    extractOne(text, companies, scorer=partial_ratio) with a score above 85
+    (test_company_matcher checks this on noisy text), without sliding every
+    name across the whole text:
+
+    1. Exact stage: one automaton pass finds every name present verbatim
+       (score 100); the earliest in the list wins, as extractOne's tie-break.
+    2. Fuzzy stage: for names long enough to match with edits, only the text
+       around tokens that resemble one of the name's anchor tokens is scored,
+       plus the very start and end of the text. Candidate tokens come from a
+       bigram index of the text's distinct tokens.
+    """
+
+    def __init__(self, json_path=None, companies=None):
+        self.companies = list(companies or [])
+        if json_path:
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    self.companies = json.load(f)
+            except Exception as e:
+                print(f"Error loading companies: {e}")
+
+        self.processed = [default_processor(c) for c in self.companies]
+        self.first_index = {}
+        for idx, name in enumerate(self.processed):
+            self.first_index.setdefault(name, idx)
+        self.exact = KeywordAutomaton(self.first_index)
+        self.max_len = max((len(p) for p in self.processed), default=0)
+
+        # Fuzzy candidates are found through anchor tokens (a name's words of
+        # three letters or more). A window scoring above the threshold differs
+        # from the name by at most `budget` inserted/deleted characters. Split
+        # between the anchors in proportion to their length, at least one
+        # anchor must appear in the text within its share. Names with the same
+        # anchor and allowance are scored together.
+        self.anchor_groups = {}
+        self.anchor_floors = {}
+        for idx, name in enumerate(self.processed):
+            if len(name) < FUZZY_MIN_LEN:
+                continue
+            budget = int(len(name) * 2 * (100 - MATCH_THRESHOLD - 0.5) / 100)
+            anchors = [tok for tok in name.split() if len(tok) >= 3] or [max(name.split(), key=len)]
+            total = sum(len(tok) for tok in anchors)
+            for anchor in set(anchors):
+                edits = budget * len(anchor) // total
+                floor = max(0, round(100 * (1 - edits / len(anchor))) - ANCHOR_SLACK)
+                group = self.anchor_groups.setdefault((anchor, floor, edits), {"names": [], "indices": [], "reach": 0})
+                group["names"].append(name)
+                group["indices"].append(idx)
+                group["reach"] = max(group["reach"], len(name))
+                self.anchor_floors[anchor] = min(self.anchor_floors.get(anchor, 100), floor)
+
+    def match(self, text):
+        """Returns (company, score) for the best known company in text, or (None, best_score)."""
+        text_p = default_processor(text)
+        if not self.companies or not text_p:
+            return None, 0
+
+        found = self.exact.find_all(text_p)
+        if found:
+            return self.companies[min(self.first_index[n] for n in found)], 100
+
+        if len(text_p) <= DIRECT_SCAN_CHARS:
+            # Short text: the direct scan is cheaper than building the index
+            return self._best(process.extractOne(text_p, self.processed, scorer=fuzz.partial_ratio))
+
+        # Token offsets and a gram -> tokens index for this text
+        offsets = {}
+        for m in TOKEN_RE.finditer(text_p):
+            offsets.setdefault(m.group(), []).append(m.start())
+        gram_tokens = {}
+        for tok in offsets:
+            for g in grams(tok):
+                gram_tokens.setdefault(g, []).append(tok)
+
+        # The real start and end of the text, where partial windows also count
+        head = text_p[:self.max_len] + PAD * self.max_len
+        tail = PAD * self.max_len + text_p[-self.max_len:]
+
+        scores = [0] * len(self.companies)
+        for part in (head, tail):
+            for _, score, idx in process.extract(part, self.processed, scorer=fuzz.partial_ratio, limit=None):
+                scores[idx] = max(scores[idx], score)
+
+        token_scores = {}
+        for (anchor, floor, edits), group in self.anchor_groups.items():
+            if anchor not in token_scores:
+                token_scores[anchor] = self._anchor_tokens(anchor, self.anchor_floors[anchor], gram_tokens)
+            reach = group["reach"]
+            # A stray space is one of the edits; the longer piece it leaves
+            # still has half the word
+            min_len = len(anchor) - edits if not edits else max(3, (len(anchor) - edits) / 2)
+            spans = [(max(0, start - reach), start + len(tok) + reach)
+                     for tok, score in token_scores[anchor] if score >= floor and len(tok) >= min_len
+                     for start in offsets[tok]]
+            if not spans:
+                continue
+            # All candidate windows in one string, cut edges padded so a
+            # partial window there cannot score
+            merged = self._merge(spans)
+            pad = PAD * reach
+            windows = pad.join(text_p[start:end] for start, end in merged)
+            if merged[0][0] > 0:
+                windows = pad + windows
+            if merged[-1][1] < len(text_p):
+                windows += pad
+            for _, score, j in process.extract(windows, group["names"], scorer=fuzz.partial_ratio, limit=None):
+                idx = group["indices"][j]
+                scores[idx] = max(scores[idx], score)
+
+        best_idx = max(range(len(scores)), key=lambda i: (scores[i], -i))
+        return self._best((self.processed[best_idx], scores[best_idx], best_idx))
+
+    @staticmethod
+    def _anchor_tokens(anchor, floor, gram_tokens):
+        """(token, partial_ratio) for distinct text tokens sharing a bigram with anchor and scoring at least floor."""
+        tokens = set()
+        for g in grams(anchor):
+            tokens.update(gram_tokens.get(g, ()))
+        return [(tok, score) for tok, score, _ in
+                process.extract(anchor, list(tokens), scorer=fuzz.partial_ratio, score_cutoff=floor, limit=None)]
+
+    def _best(self, result):
+        _, score, idx = result
+        score = int(round(score))
+        if score > MATCH_THRESHOLD:
+            return self.companies[idx], score
+        return None, score
+
+    @staticmethod
+    def _merge(spans):
+        merged = []
+        for start, end in sorted(spans):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        return merged
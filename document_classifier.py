@@ -0,0 +1,39 @@
+from keyword_automaton import KeywordAutomaton
+
+
+class KeywordRule:
+    """Assigns doc_type when any (or, with require_all, every) keyword is present."""
+
+    def __init__(self, doc_type, keywords, require_all=False):
+        self.doc_type = doc_type
+        self.keywords = [k.lower() for k in keywords]
+        self.require_all = require_all
+
+    def matches(self, found):
+        if self.require_all:
+            return all(k in found for k in self.keywords)
+        return any(k in found for k in self.keywords)
+
+
+class DocumentClassifier:
+    """
+    Picks a document type from an ordered list of KeywordRules: the first
+    rule that matches wins. All rule keywords are located together by one
+    KeywordAutomaton, so adding rules does not add passes over the text.
+    """
+
+    def __init__(self, rules, default, method=None):
+        self.rules = list(rules)
+        self.default = default
+        self.automaton = KeywordAutomaton((k for rule in self.rules for k in rule.keywords), method)
+
+    def keywords_in(self, text_lower):
+        """Rule keywords present in already-lowercased text."""
+        return self.automaton.find_all(text_lower)
+
+    def classify(self, text_lower):
+        found = self.keywords_in(text_lower)
+        for rule in self.rules:
+            if rule.matches(found):
+                return rule.doc_type
+        return self.default
@@ -0,0 +1,162 @@
+import lazy_imports
+
+# pdfplumber (and pdfminer) load when the first document is opened
+__getattr__ = _lazy = lazy_imports.deferred(globals(), pdfplumber="pdfplumber")
+
+
+class DocumentSession:
+    """
+    Holds one open pdfplumber document for the whole processing of a file and
+    caches each page's full-resolution raster, so full-page OCR and every zone
+    OCR attempt share a single open + render per page.
+    The PDF is only opened on first use; close it before renaming the file.
+    `recorder` collects this document's counters and timings (see
+    instrumentation); PDFProcessor.new_session sets it.
+    With max_pages only the first max_pages pages are wrapped by pdfplumber,
+    so a 300-page scan does not build 300 page objects to read five.
+    bounded=True keeps at most one raster: rendering a page drops the
+    previous one, and release_page() frees a page once its data is captured.
+    `truncated` is set when the memory ceiling stopped page reading early,
+    `ocr_failed` when a scanned page could not be OCR'd; either way the
+    extraction is incomplete and must not be cached.
+    """
+
+    RESOLUTION = 300
+
+    def __init__(self, filepath, recorder=None, max_pages=None, bounded=False):
+        self.filepath = filepath
+        self.recorder = recorder
+        self.max_pages = max_pages
+        self.bounded = bounded
+        self.truncated = False
+        self.ocr_failed = False
+        self.closed = False
+        self._pdf = None
+        self._rasters = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pdf(self):
+        if self.closed:
+            raise ValueError(f"Session for {self.filepath} is closed")
+        if self._pdf is None:
+            pages = list(range(1, self.max_pages + 1)) if self.max_pages is not None else None
+            self._pdf = _lazy("pdfplumber").open(self.filepath, pages=pages)
+        return self._pdf
+
+    @property
+    def page_count(self):
+        return len(self.pdf.pages)
+
+    def page(self, index):
+        pages = self.pdf.pages
+        if index >= len(pages): return None
+        return pages[index]
+
+    def raster(self, index):
+        """Full page image at RESOLUTION DPI, rendered once per page."""
+        im = self._rasters.get(index)
+        if im is None:
+            if self.bounded:
+                self.release_rasters()
+            im = self.render(index)
+            if im is None: return None
+            self._rasters[index] = im
+        return im
+
+    def render(self, index):
+        """Uncached full page image at RESOLUTION DPI; the caller owns (and closes) it."""
+        page = self.page(index)
+        if page is None: return None
+        return page.to_image(resolution=self.RESOLUTION).original
+
+    def release_page(self, index):
+        """Drops page index's raster and pdfplumber's char/object caches; both are rebuilt if asked for again."""
+        im = self._rasters.pop(index, None)
+        if im is not None:
+            im.close()
+        if self._pdf is not None and index < len(self._pdf.pages):
+            self._pdf.pages[index].close()
+
+    def release_rasters(self):
+        for im in self._rasters.values():
+            im.close()
+        self._rasters.clear()
+
+    def release(self):
+        """Frees every cached raster and page cache but keeps the file open."""
+        self.release_rasters()
+        if self._pdf is not None:
+            for page in self._pdf.pages:
+                page.close()
+
+    def crop_raster(self, index, bbox):
+        """
+        Crops the cached page raster to bbox (x0, top, x1, bottom) given in
+        PDF points, i.e. the same coordinates as pdfplumber words.
+        """
+        im = self.raster(index)
+        if im is None: return None
+        page = self.page(index)
+        scale = self.RESOLUTION / 72
+        x_origin, y_origin = page.bbox[0], page.bbox[1]
+        box = (
+            max(0, int((bbox[0] - x_origin) * scale)),
+            max(0, int((bbox[1] - y_origin) * scale)),
+            min(im.width, int(round((bbox[2] - x_origin) * scale))),
+            min(im.height, int(round((bbox[3] - y_origin) * scale))),
+        )
+        if box[2] <= box[0] or box[3] <= box[1]: return None
+        return im.crop(box)
+
+    def close(self):
+        self.release_rasters()
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        self.closed = True
+
+
+class PageData(dict):
+    """
+    Page dict whose "words" entry is only extracted when first read.
+    The regex path never looks at words, so most documents skip the second
+    pdfplumber layout pass entirely. Pickles as a plain dict (words loaded).
+    """
+
+    def __init__(self, words_loader, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._words_loader = words_loader
+
+    def _load_words(self):
+        if self._words_loader is not None and not dict.__contains__(self, "words"):
+            dict.__setitem__(self, "words", self._words_loader())
+        self._words_loader = None
+
+    @property
+    def words_loaded(self):
+        return dict.__contains__(self, "words")
+
+    def __getitem__(self, key):
+        if key == "words":
+            self._load_words()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == "words":
+            self._load_words()
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        if key == "words" and self._words_loader is not None:
+            return True
+        return super().__contains__(key)
+
+    def __reduce__(self):
+        self._load_words()
+        return (dict, (dict(self),))
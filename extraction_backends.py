@@ -0,0 +1,69 @@
+import lazy_imports
+
+__getattr__ = _lazy = lazy_imports.deferred(globals(), pdfplumber_text="pdfplumber.utils.text")
+
+# Extra per-word attributes kept from pdfplumber
+WORD_ATTRS = ["fontname", "size"]
+
+
+class ExtractionBackend:
+    """
+    Turns a pdfplumber page into (text, words).
+    words may be None, meaning the backend did not produce them and they
+    should be loaded later with extract_words() if anything asks.
+    """
+
+    name = "base"
+
+    def extract(self, page):
+        raise NotImplementedError
+
+    def extract_words(self, page):
+        return page.extract_words(extra_attrs=WORD_ATTRS)
+
+
+class TwoPassBackend(ExtractionBackend):
+    """
+    pdfplumber's extract_text(), with extract_words() deferred to a second
+    clustering pass on demand.
+    """
+
+    name = "two-pass"
+
+    def extract(self, page):
+        return page.extract_text() or "", None
+
+
+class SinglePassBackend(ExtractionBackend):
+    """
+    Clusters the page's characters into words once and derives both the
+    text (same layout rules as page.extract_text()) and the positioned word
+    list from that single pass.
+    Words are not split on font changes; fontname/size come from the word's
+    first character.
+    """
+
+    name = "single-pass"
+
+    def extract(self, page):
+        chars = page.chars
+        if not chars:
+            return "", []
+        wordmap = _lazy("pdfplumber_text").WordExtractor().extract_wordmap(chars)
+        # Same arguments page.extract_text() passes down to to_textmap()
+        textmap = wordmap.to_textmap(
+            layout_bbox=page.bbox,
+            layout_width=page.width,
+            layout_height=page.height,
+            presorted=True,
+        )
+        words = []
+        for word, word_chars in wordmap.tuples:
+            first = word_chars[0]
+            word["fontname"] = first.get("fontname")
+            word["size"] = first.get("size")
+            words.append(word)
+        return textmap.as_string, words
+
+
+DEFAULT_BACKEND = SinglePassBackend
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Keys in extract_data output that are rebuilt on demand and never stored
+_TRANSIENT_PAGE_KEYS = {"word_index", "anchors"}
+
+
+def default_cache_dir():
+    """Per-user cache directory (LOCALAPPDATA on Windows, XDG cache elsewhere)."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "PDFRenamer")
+
+
+class ExtractionCache:
+    """
+    Persistent SQLite cache of extract_data() results.
+    Keyed by a hash of the PDF bytes plus the extractor version, so renamed or
+    re-dropped files still hit and extractor changes invalidate old entries.
+    Least recently used entries are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, path=None, max_bytes=256 * 1024 * 1024):
+        self.path = path or os.path.join(default_cache_dir(), "extraction_cache.sqlite3")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Sent to worker processes: each one opens its own connection
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, data BLOB NOT NULL,"
+                " size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def key_for_file(filepath, version):
+        """SHA-256 of the file contents, tagged with the extractor version."""
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()}:{version}"
+
+    def get(self, key):
+        """Returns the cached extract_data() dict, or None on a miss."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+            self.hits += 1
+            return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (sqlite3.Error, OSError, ValueError, zlib.error) as e:
+            print(f"Cache read failed: {e}")
+            return None
+
+    def put(self, key, data):
+        """Stores an extract_data() dict and evicts old entries past the size cap."""
+        stored = {
+            "full_text": data.get("full_text", ""),
+            "pages": [
+                {k: v for k, v in page.items() if k not in _TRANSIENT_PAGE_KEYS}
+                for page in data.get("pages", [])
+            ],
+        }
+        try:
+            blob = zlib.compress(json.dumps(stored).encode("utf-8"))
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, blob, len(blob), time.time()),
+                )
+                self._evict(conn)
+                conn.commit()
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            print(f"Cache write failed: {e}")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used ASC"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
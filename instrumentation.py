@@ -0,0 +1,155 @@
+"""
+Per-document counters, timings and strategy notes for PDFProcessor.
+
+Each DocumentSession carries a recorder. With profiling on it is a
+Recorder, whose profile() ends up in the process_document() result:
+
+    {"counters":   {"pages_extracted": 3, "pages_ocr": 1, "zone_ocr_calls": 2,
+                    "spatial_searches": 4, "word_extractions": 1},
+     "timings":    {"text_extraction": 0.21, "page_ocr": 1.9, "spatial_search": 0.8,
+                    "zone_ocr": 0.7, "company_match": 0.002, ...},
+     "strategies": {"name": "spatial", "date": "term", "company": "known"}}
+
+Timings are seconds and nest: zone_ocr is also part of spatial_search, and
+word_extraction can be part of either. With profiling off the session gets
+the processor's NullRecorder, which only keeps the running stats counters;
+its timer() hands back one shared no-op context, so the hooks cost a method
+call each.
+
+RunProfile adds up the profiles of a whole run.
+"""
+import time
+from collections import Counter
+
+
+class _Timer:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.recorder.add_time(self.name, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Recorder:
+    """Records one document. Counters also go to the processor-wide stats Counter, if given."""
+
+    def __init__(self, stats=None):
+        self.stats = stats
+        self.counters = Counter()
+        self.timings = {}
+        self.strategies = {}
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+        if self.stats is not None:
+            self.stats[name] += n
+
+    def timer(self, name):
+        """Context manager adding the time spent inside it to timings[name]."""
+        return _Timer(self, name)
+
+    def add_time(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def note(self, name, value):
+        """Records which strategy produced a field, e.g. note("name", "spatial"); the last call wins."""
+        self.strategies[name] = value
+
+    def profile(self):
+        return {
+            "counters": dict(self.counters),
+            "timings": {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            "strategies": dict(self.strategies),
+        }
+
+
+class NullRecorder:
+    """Recorder stand-in when profiling is off: keeps the stats counters, drops everything else."""
+
+    def __init__(self, stats=None):
+        self.stats = stats
+
+    def count(self, name, n=1):
+        if self.stats is not None:
+            self.stats[name] += n
+
+    def timer(self, name):
+        return _NULL_TIMER
+
+    def add_time(self, name, seconds):
+        pass
+
+    def note(self, name, value):
+        pass
+
+    def profile(self):
+        return None
+
+
+class RunProfile:
+    """Sums the profiles of many process_document() results."""
+
+    def __init__(self):
+        self.documents = 0
+        self.counters = Counter()
+        self.timings = Counter()
+        self.slowest = {}
+        self.strategies = {}
+
+    def add(self, result):
+        profile = result.get("profile")
+        if not profile:
+            return
+        self.documents += 1
+        self.counters.update(profile["counters"])
+        for name, seconds in profile["timings"].items():
+            self.timings[name] += seconds
+            if seconds > self.slowest.get(name, (0.0, None))[0]:
+                self.slowest[name] = (seconds, result["path"])
+        for field, strategy in profile["strategies"].items():
+            self.strategies.setdefault(field, Counter())[strategy] += 1
+
+    def summary(self):
+        return {
+            "documents": self.documents,
+            "counters": dict(self.counters),
+            "timings": {name: {"total": round(total, 3),
+                               "mean": round(total / self.documents, 4),
+                               "max": round(self.slowest[name][0], 4),
+                               "slowest": self.slowest[name][1]}
+                        for name, total in self.timings.most_common()},
+            "strategies": {field: dict(counts) for field, counts in self.strategies.items()},
+        }
+
+    def describe(self):
+        """Multi-line text: where the time went, the counters, and which strategies won."""
+        if not self.documents:
+            return "No profiled documents."
+        lines = [f"Profile of {self.documents} document(s):"]
+        for name, t in self.summary()["timings"].items():
+            lines.append(f"  {name:<16} {t['total']:9.2f}s total {t['mean'] * 1000:9.1f} ms/doc "
+                         f"max {t['max'] * 1000:.1f} ms")
+        lines.append("  " + ", ".join(f"{name}: {n}" for name, n in sorted(self.counters.items())))
+        for field, counts in sorted(self.strategies.items()):
+            lines.append(f"  {field} from: " + ", ".join(f"{s} {n}" for s, n in counts.most_common()))
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+try:
+    # Optional: C implementation of the same automaton
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Without pyahocorasick, keyword sets up to this size are checked with plain
+# `in` scans: C-speed substring search beats a Python-level automaton walk
+# until there are a few hundred keywords (see bench_classifier.py)
+SUBSTRING_SCAN_MAX = 150
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword list. find_all() reports every
+    keyword occurring anywhere in the text (plain substring semantics, like
+    `kw in text`) in one left-to-right pass, however many keywords there are.
+    Uses pyahocorasick when installed, otherwise a pure-Python trie (or plain
+    substring scans for small keyword sets). Pass method="native", "trie" or
+    "substring" to force one.
+    """
+
+    def __init__(self, keywords, method=None):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        if method is None:
+            if ahocorasick is not None:
+                method = "native"
+            elif len(self.keywords) <= SUBSTRING_SCAN_MAX:
+                method = "substring"
+            else:
+                method = "trie"
+        self.method = method
+        self._native = None
+        if method == "native":
+            self._native = ahocorasick.Automaton()
+            for idx, kw in enumerate(self.keywords):
+                self._native.add_word(kw, idx)
+            if self.keywords:
+                self._native.make_automaton()
+        elif method == "trie":
+            self._build()
+
+    def _build(self):
+        # State 0 is the root; goto[s] maps a character to the next state
+        goto = [{}]
+        out = [()]
+        for idx, kw in enumerate(self.keywords):
+            state = 0
+            for ch in kw:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] += (idx,)
+
+        # Breadth-first failure links; outputs inherit their failure state's
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find_all(self, text):
+        """Set of keywords found in text."""
+        if not self.keywords:
+            return set()
+        if self.method == "substring":
+            return {k for k in self.keywords if k in text}
+        if self.method == "native":
+            return {self.keywords[idx] for _, idx in self._native.iter(text)}
+
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                found.update(out[state])
+                if len(found) == len(self.keywords): break
+        return {self.keywords[idx] for idx in found}
@@ -0,0 +1,35 @@
+"""
+Deferred imports for heavy dependencies (pdfplumber, pytesseract, rapidfuzz,
+numpy), so importing the app's modules and showing the window stays fast
+and each dependency is only loaded by the process that needs it.
+
+A module opts in with
+
+    __getattr__ = _lazy = lazy_imports.deferred(globals(), pdfplumber="pdfplumber")
+
+and refers to the dependency as _lazy("pdfplumber") inside functions. The
+first lookup imports it and stores it as a module global, so
+`module.pdfplumber` and mock.patch.object(module, "pdfplumber", ...) keep
+working. Names listed in `optional` become None when not installed.
+"""
+import importlib
+
+
+def deferred(module_globals, optional=(), **modules):
+    """Returns a loader usable both as the module's __getattr__ and for internal lookups."""
+
+    def load(name):
+        if name in module_globals:
+            return module_globals[name]
+        if name not in modules:
+            raise AttributeError(f"module {module_globals['__name__']!r} has no attribute {name!r}")
+        try:
+            value = importlib.import_module(modules[name])
+        except ImportError:
+            if name not in optional:
+                raise
+            value = None
+        module_globals[name] = value
+        return value
+
+    return load
@@ -1,10 +1,56 @@
 import sys
 import os
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QLabel, QTextEdit, QProgressBar)
-from PyQt6.QtCore import Qt, QMimeData
+import multiprocessing
+import threading
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QTextEdit, QProgressBar, QPushButton)
+from PyQt6.QtCore import Qt, QMimeData, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent
-from renamer_logic import PDFProcessor, DocumentType
+from renamer_logic import PDFProcessor
+from batch_engine import BatchEngine, BatchProgress
+from extraction_cache import ExtractionCache
+
+
+class BatchSignals(QObject):
+    # One result dict per file, as BatchEngine.process yields them
+    result = pyqtSignal(dict)
+    # Summary dict: done, spatial_docs, word_pages, cancelled, error
+    finished = pyqtSignal(dict)
+
+
+class BatchWorker(QRunnable):
+    """
+    Drives BatchEngine.process for one drop on a QThreadPool thread, so the
+    UI thread only receives results through signals. cancel() stops queuing
+    new files; files already in a worker process still finish.
+    """
+
+    def __init__(self, engine, files):
+        super().__init__()
+        # Kept alive by MainWindow until finished, not deleted by the pool
+        self.setAutoDelete(False)
+        self.engine = engine
+        self.files = files
+        self.cancel_event = threading.Event()
+        self.signals = BatchSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        summary = {"done": 0, "spatial_docs": 0, "word_pages": 0, "cancelled": False, "error": None}
+        try:
+            for result in self.engine.process(self.files, cancel_event=self.cancel_event):
+                summary["done"] += 1
+                stats = result.get("stats", {})
+                if stats.get("spatial_searches"):
+                    summary["spatial_docs"] += 1
+                summary["word_pages"] += stats.get("word_extractions", 0)
+                self.signals.result.emit(result)
+        except Exception as e:
+            summary["error"] = str(e)
+        summary["cancelled"] = self.cancel_event.is_set()
+        self.signals.finished.emit(summary)
 
 class DropZone(QLabel):
     def __init__(self, parent=None):
@@ -24,9 +70,13 @@ class DropZone(QLabel):
             }
         """)
         self.setAcceptDrops(True)
-        self.processor = PDFProcessor()
         self.main_window = parent
 
+    @property
+    def processor(self):
+        # The window's processor; one per process is enough
+        return self.main_window.processor
+
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             event.accept()
@@ -43,6 +93,9 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("PDF Smart Renamer")
         self.resize(600, 400)
 
+        self.processor = PDFProcessor(cache=ExtractionCache())
+        self.engine = None
+
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
@@ -55,41 +108,125 @@ class MainWindow(QMainWindow):
         self.log_area.setPlaceholderText("Log output will appear here...")
         layout.addWidget(self.log_area, stretch=1)
 
-        self.processor = PDFProcessor()
+        progress_row = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Idle")
+        progress_row.addWidget(self.progress_bar, stretch=1)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_processing)
+        progress_row.addWidget(self.cancel_button)
+        layout.addLayout(progress_row)
+
+        # Drops run one after another on a single background thread; the
+        # engine's process pool does the actual work
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.batches = []
+        self.progress = None
 
     def log(self, message):
         self.log_area.append(message)
 
     def process_files(self, files):
+        pdf_files = []
         for filepath in files:
             if not filepath.lower().endswith(".pdf"):
                 self.log(f"Skipping non-PDF file: {filepath}")
                 continue
-            
             self.log(f"Processing: {filepath}")
-            data = self.processor.extract_data(filepath)
-            
-            if not data.get("full_text"):
-                self.log(f"Warning: No text extracted from {os.path.basename(filepath)}. Is it scanned?")
-                continue
+            pdf_files.append(filepath)
+
+        if not pdf_files:
+            return
 
-            doc_type, metadata = self.processor.analyze_content(data, filepath)
-            self.log(f"  Detected Type: {doc_type.name}")
-            self.log(f"  Metadata: {metadata}")
-
-            new_name = self.processor.generate_new_name(filepath, doc_type, metadata)
-            if new_name != os.path.basename(filepath):
-                new_path = self.processor.rename_file(filepath, new_name)
-                if "Error" in str(new_path): # Basic error checking
-                    self.log(f"  Error renaming: {new_path}")
-                else:
-                    self.log(f"  Renamed to: {os.path.basename(new_path)}")
-                    self.log(f"  Full path: {new_path}")
-            else:
-                self.log("  Filename structure already appears correct (or unknown type).")
+        # Warm pool is created on the first drop and reused for later ones
+        if self.engine is None:
+            self.engine = BatchEngine(processor_options=self.processor.worker_options())
+
+        # A drop while another batch runs joins the same progress bar
+        if self.progress is None:
+            self.progress = BatchProgress()
+        self.progress.add(len(pdf_files))
+
+        worker = BatchWorker(self.engine, pdf_files)
+        worker.signals.result.connect(self.on_result)
+        worker.signals.finished.connect(lambda summary, w=worker: self.on_batch_finished(w, summary))
+        self.batches.append(worker)
+        self.thread_pool.start(worker)
+        self.cancel_button.setEnabled(True)
+        self.update_progress()
+
+    def on_result(self, result):
+        self.log_result(result)
+        self.progress.advance()
+        self.update_progress()
+
+    def on_batch_finished(self, worker, summary):
+        self.batches.remove(worker)
+        done = summary["done"]
+        if summary["error"]:
+            self.log(f"Batch stopped: {summary['error']}")
+        elif summary["cancelled"]:
+            self.log(f"Cancelled: {done} of {len(worker.files)} file(s) processed.")
+        self.log(f"Done: {done} file(s). Spatial fallback used for {summary['spatial_docs']} "
+                 f"({summary['spatial_docs'] * 100 // max(done, 1)}%), "
+                 f"word extraction on {summary['word_pages']} page(s).")
+        if not self.batches:
+            self.update_progress()
+            self.progress = None
+            self.cancel_button.setEnabled(False)
+
+    def update_progress(self):
+        progress = self.progress
+        self.progress_bar.setMaximum(max(progress.total, 1))
+        self.progress_bar.setValue(progress.done)
+        self.progress_bar.setFormat(progress.describe())
+
+    def cancel_processing(self):
+        """Stops queuing files for every running and waiting batch."""
+        for worker in self.batches:
+            worker.cancel()
+        self.cancel_button.setEnabled(False)
+        self.log("Cancelling: waiting for files already in progress...")
+
+    def log_result(self, result):
+        name = os.path.basename(result["path"])
+        status = result["status"]
+
+        if status == "no_text":
+            self.log(f"Warning: No text extracted from {name}. Is it scanned?")
+            return
+        if status == "error" and result["doc_type"] is None:
+            self.log(f"Error processing {name}: {result['error']}")
             self.log("-" * 20)
+            return
+
+        self.log(f"{name}")
+        self.log(f"  Detected Type: {result['doc_type']}")
+        self.log(f"  Metadata: {result['metadata']}")
+
+        if status == "renamed":
+            self.log(f"  Renamed to: {os.path.basename(result['new_path'])}")
+            self.log(f"  Full path: {result['new_path']}")
+        elif status == "error":
+            self.log(f"  Error renaming: {result['error']}")
+        else:
+            self.log("  Filename structure already appears correct (or unknown type).")
+        self.log("-" * 20)
+
+    def closeEvent(self, event):
+        for worker in self.batches:
+            worker.cancel()
+        self.thread_pool.waitForDone()
+        if self.engine is not None:
+            self.engine.close()
+        super().closeEvent(event)
 
 if __name__ == "__main__":
+    # Required for the worker pool inside the PyInstaller one-file build
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
@@ -0,0 +1,88 @@
+"""
+Per-process memory ceiling for PDFProcessor's bounded-memory mode.
+
+MemoryBudget(limit_mb) compares the process's current resident set size
+with the limit. The processor checks it before every page; when it is
+over, the document's page caches and rasters are released, the garbage
+collector runs and freed heap is handed back to the OS (malloc_trim, on
+glibc). If that is not enough the processor stops reading more pages of
+that document and analyzes what it has. Each worker process builds its
+own processor, so each worker enforces its own ceiling.
+
+current_rss_mb() reads /proc on Linux and GetProcessMemoryInfo on Windows
+(psutil is used if installed, elsewhere). It returns None where neither
+is available, and then the budget never trips.
+"""
+import ctypes
+import gc
+import os
+import sys
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _windows_rss():
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB, or None if it cannot be read here."""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE / 2 ** 20
+        if psutil is not None:
+            return psutil.Process().memory_info().rss / 2 ** 20
+        if sys.platform == "win32":
+            rss = _windows_rss()
+            return rss / 2 ** 20 if rss is not None else None
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def trim_heap():
+    """Asks glibc to return freed heap pages to the OS; a no-op elsewhere."""
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class MemoryBudget:
+    def __init__(self, limit_mb, rss=current_rss_mb):
+        self.limit_mb = limit_mb
+        self._rss = rss
+
+    def exceeded(self):
+        rss = self._rss()
+        return rss is not None and rss > self.limit_mb
+
+    def release(self, free=None):
+        """Calls free() (drop caches), collects garbage and trims the heap; returns True if now within the limit."""
+        if free is not None:
+            free()
+        gc.collect()
+        trim_heap()
+        return not self.exceeded()
@@ -0,0 +1,265 @@
+"""
+Prometheus metrics for long-running renamer processes (watch mode, a
+service wrapping the CLI), standard library only.
+
+    metrics = Metrics()
+    metrics.add_queue_source(pipeline.queue_depths)   # read at scrape time
+    server = MetricsServer(metrics, port=9464).start()  # GET /metrics on 127.0.0.1
+    writer = TextfileWriter(metrics, "renamer.prom").start()
+    for result in ...:
+        metrics.observe(result)
+
+Everything is derived from process_document()-shaped results, so it works
+the same for in-process runs, BatchEngine workers and the pipeline. OCR
+pages and cache hits come from the result's "profile" (see
+instrumentation), so build the processor with profile=True; the CLI does
+that whenever a metrics option is given.
+
+The textfile is rewritten atomically (temporary file + os.replace) for the
+node_exporter textfile collector.
+"""
+import collections
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "pdf_renamer"
+# Seconds; spans a cached text page to a slow multi-page OCR
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# documents_per_second covers the documents finished this many seconds back
+RATE_WINDOW = 60.0
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one per label value."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Metrics:
+    """Thread-safe collection of everything exported; render() gives the exposition text."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, clock=time.monotonic):
+        self.buckets = buckets
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.documents = collections.Counter()   # status -> count
+        self.doc_types = collections.Counter()   # doc_type -> count
+        self.pages = 0
+        self.ocr_pages = 0
+        self.ocr_documents = 0
+        self.profiled_documents = 0
+        self.cache = collections.Counter()       # hit / miss -> count
+        self.stage_seconds = {}                  # stage -> Histogram
+        self._finished = collections.deque()
+        self._queue_sources = []
+
+    def add_queue_source(self, source):
+        """source() returns {queue name: depth}; it is called on every scrape."""
+        self._queue_sources.append(source)
+
+    def observe(self, result):
+        """Counts one process_document() result."""
+        now = self._clock()
+        with self._lock:
+            self.documents[result.get("status") or "unknown"] += 1
+            if result.get("doc_type"):
+                self.doc_types[result["doc_type"]] += 1
+            for stage, seconds in (result.get("timings") or {}).items():
+                # 0 means the stage did not run (e.g. rename on a dry run)
+                if seconds:
+                    self._histogram(stage).observe(seconds)
+            profile = result.get("profile")
+            if profile:
+                counters = profile["counters"]
+                self.profiled_documents += 1
+                self.pages += counters.get("pages_extracted", 0)
+                self.ocr_pages += counters.get("pages_ocr", 0)
+                if counters.get("pages_ocr"):
+                    self.ocr_documents += 1
+                self.cache["hit"] += counters.get("cache_hits", 0)
+                self.cache["miss"] += counters.get("cache_misses", 0)
+                for stage, seconds in profile["timings"].items():
+                    self._histogram(stage).observe(seconds)
+            if result.get("status") != "skipped":
+                self._finished.append(now)
+            self._trim(now)
+
+    def _histogram(self, stage):
+        histogram = self.stage_seconds.get(stage)
+        if histogram is None:
+            histogram = self.stage_seconds[stage] = Histogram(self.buckets)
+        return histogram
+
+    def _trim(self, now):
+        while self._finished and now - self._finished[0] > RATE_WINDOW:
+            self._finished.popleft()
+
+    def documents_per_second(self):
+        with self._lock:
+            self._trim(self._clock())
+            return len(self._finished) / RATE_WINDOW
+
+    def queue_depths(self):
+        depths = {}
+        for source in self._queue_sources:
+            try:
+                depths.update(source())
+            except Exception as e:
+                print(f"Metrics queue source failed: {e}")
+        return depths
+
+    def render(self):
+        """Prometheus text exposition format."""
+        rate = self.documents_per_second()
+        queues = self.queue_depths()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{PREFIX}_{name}{suffix}{_labels(labels)} {_number(value)}")
+
+        with self._lock:
+            family("documents_total", "counter", "Documents handled, by result status.",
+                   [("", [("status", s)], n) for s, n in sorted(self.documents.items())])
+            family("documents_by_type_total", "counter", "Documents handled, by detected DocumentType.",
+                   [("", [("doc_type", t)], n) for t, n in sorted(self.doc_types.items())])
+            family("documents_per_second", "gauge", f"Documents finished per second over the last {RATE_WINDOW:g}s.",
+                   [("", [], round(rate, 4))])
+            family("pages_total", "counter", "Pages extracted.", [("", [], self.pages)])
+            family("ocr_pages_total", "counter", "Pages that fell back to full-page OCR.", [("", [], self.ocr_pages)])
+            family("ocr_fallback_ratio", "gauge", "Share of documents that needed OCR for at least one page.",
+                   [("", [], round(self.ocr_documents / self.profiled_documents, 4) if self.profiled_documents else 0.0)])
+            family("cache_requests_total", "counter", "Extraction cache lookups, by result.",
+                   [("", [("result", r)], self.cache[r]) for r in ("hit", "miss")])
+            lookups = self.cache["hit"] + self.cache["miss"]
+            family("cache_hit_ratio", "gauge", "Share of extraction cache lookups that hit.",
+                   [("", [], round(self.cache["hit"] / lookups, 4) if lookups else 0.0)])
+
+            samples = []
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    samples.append(("_bucket", [("stage", stage), ("le", _number(float(bound)))], count))
+                samples.append(("_bucket", [("stage", stage), ("le", "+Inf")], histogram.count))
+                samples.append(("_sum", [("stage", stage)], round(histogram.sum, 6)))
+                samples.append(("_count", [("stage", stage)], histogram.count))
+            family("stage_duration_seconds", "histogram", "Time per document in each stage and sub-stage.", samples)
+
+        family("queue_depth", "gauge", "Documents waiting or in flight, by queue.",
+               [("", [("queue", q)], d) for q, d in sorted(queues.items())])
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves GET /metrics from a daemon thread. port=0 picks a free port (see .port)."""
+
+    def __init__(self, metrics, port=9464, host="127.0.0.1"):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would drown the real messages
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+class TextfileWriter:
+    """Rewrites path with the current metrics every `interval` seconds, and once more on close()."""
+
+    def __init__(self, metrics, path, interval=15.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"Metrics textfile write failed: {e}")
+
+    def start(self):
+        self.write()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.write()
@@ -0,0 +1,156 @@
+import os
+import queue
+import re
+import threading
+from concurrent.futures import Future
+
+import lazy_imports
+
+# pytesseract, and tesserocr (optional in-process Tesseract binding: each
+# worker loads the language models once), are imported on first OCR
+__getattr__ = _lazy = lazy_imports.deferred(
+    globals(), optional=("tesserocr",), pytesseract="pytesseract", tesserocr="tesserocr")
+
+
+def _env_int(name, default):
+    """Positive integer from the environment, or default when unset, 0 or malformed."""
+    value = os.environ.get(name, "").strip()
+    try:
+        number = int(value or "0")
+    except ValueError:
+        number = -1
+    if number < 0:
+        print(f"Ignoring {name}={value!r}: expected a positive whole number, using {default}")
+    return number if number > 0 else default
+
+
+# Tuning knobs (also settable through configure_ocr_service)
+DEFAULT_POOL_SIZE = _env_int("PDFRENAMER_OCR_WORKERS", min(4, os.cpu_count() or 1))
+DEFAULT_QUEUE_DEPTH = _env_int("PDFRENAMER_OCR_QUEUE", DEFAULT_POOL_SIZE * 4)
+
+
+def _parse_psm(config):
+    m = re.search(r'--psm\s+(\d+)', config or "")
+    return int(m.group(1)) if m else None
+
+
+class _TesserocrEngine:
+    """Long-lived tesserocr API; models stay loaded between calls."""
+
+    def __init__(self, lang):
+        self.api = _lazy("tesserocr").PyTessBaseAPI(lang=lang)
+        self.default_psm = self.api.GetPageSegMode()
+
+    def image_to_string(self, image, config):
+        psm = _parse_psm(config)
+        self.api.SetPageSegMode(psm if psm is not None else self.default_psm)
+        self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+    def close(self):
+        self.api.End()
+
+
+class _PytesseractEngine:
+    """Fallback when tesserocr is not installed: one tesseract process per call."""
+
+    def __init__(self, lang):
+        self.lang = lang
+
+    def image_to_string(self, image, config):
+        return _lazy("pytesseract").image_to_string(image, lang=self.lang, config=config)
+
+    def close(self):
+        pass
+
+
+class OCRService:
+    """
+    Bounded pool of long-lived OCR workers fed through a queue.
+    Page and zone images from every stage go through the same pool, so the
+    total number of concurrent Tesseract jobs stays at pool_size.
+    submit() blocks once queue_depth jobs are waiting (backpressure).
+    """
+
+    def __init__(self, pool_size=None, queue_depth=None, lang="eng"):
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.queue_depth = queue_depth or DEFAULT_QUEUE_DEPTH
+        self.lang = lang
+        self.backend = "tesserocr" if _lazy("tesserocr") is not None else "pytesseract"
+        self._queue = queue.Queue(maxsize=self.queue_depth)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for n in range(self.pool_size):
+                t = threading.Thread(target=self._worker, name=f"ocr-worker-{n}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _worker(self):
+        engine = None
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            future, image, config = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if engine is None:
+                    engine = _TesserocrEngine(self.lang) if _lazy("tesserocr") is not None else _PytesseractEngine(self.lang)
+                future.set_result(engine.image_to_string(image, config))
+            except Exception as e:
+                future.set_exception(e)
+        if engine is not None:
+            engine.close()
+
+    @property
+    def pending(self):
+        """Jobs waiting in the queue (not counting ones being recognized)."""
+        return self._queue.qsize()
+
+    def submit(self, image, config=""):
+        """Queues an image and returns a Future for its text."""
+        self._start()
+        future = Future()
+        self._queue.put((future, image, config))
+        return future
+
+    def image_to_string(self, image, config=""):
+        """Blocking helper with the same shape as pytesseract.image_to_string."""
+        return self.submit(image, config).result()
+
+    def close(self):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for t in threads:
+            t.join()
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def configure_ocr_service(pool_size=None, queue_depth=None):
+    """Replaces the shared service; call before processing starts."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is not None:
+            _shared_service.close()
+        _shared_service = OCRService(pool_size, queue_depth)
+    return _shared_service
+
+
+def get_ocr_service():
+    """Process-wide OCR service shared by extraction and zone OCR."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = OCRService()
+        return _shared_service
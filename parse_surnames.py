@@ -1,6 +1,9 @@
 import json
+import os
 import re
 
+from surname_index import index_path_for, write_index
+
 def parse_surnames(input_file, output_file):
     surnames_list = []
     
@@ -68,5 +71,11 @@ def parse_surnames(input_file, output_file):
         
     print(f"Processed {len(surnames_list)} surnames. Saved to {output_file}")
 
+    # Compiled index SurnameMatcher maps instead of parsing the JSON
+    index_file = index_path_for(output_file)
+    count = write_index(output_file, index_file)
+    print(f"Indexed {count} pinyin variants. Saved to {index_file}")
+
 if __name__ == "__main__":
-    parse_surnames("e:/AI_WorkPlace/PDFRenamer/surnames_raw.txt", "e:/AI_WorkPlace/PDFRenamer/chinese_surnames_detailed.json")
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parse_surnames(os.path.join(script_dir, "surnames_raw.txt"), os.path.join(script_dir, "chinese_surnames_detailed.json"))
@@ -0,0 +1,303 @@
+"""
+Staged asyncio pipeline around PDFProcessor, for one process:
+
+    enumerate -> read -> extract -> ocr -> analyze -> rename
+                                 \\_______/
+
+Each stage has its own worker count and a bounded queue in front of it, so
+a slow stage pushes back on the ones before it instead of piling up open
+documents. Only files with short (scanned) pages go through the ocr stage.
+Its queue is the deepest, so a run of scanned files can wait there while
+text-layer files keep flowing straight from extract to analyze.
+
+With a lazy_pages processor the extract stage runs extract_and_analyze():
+pages are read (and OCR'd) only until the metadata is complete, so those
+documents skip the ocr stage and analyze only plans the name.
+
+The blocking work (pdfplumber, Tesseract, the filesystem) runs on a thread
+pool; the event loop only moves documents between queues. Tesseract runs
+outside the GIL, so OCR overlaps with extraction. pdfplumber does not, so
+more than a couple of extract workers rarely helps; use BatchEngine to
+spread CPU-bound work over processes.
+
+snapshot() reports each stage's queue depth, busy workers and throughput
+for tuning. Results are process_document()-shaped dicts, except that
+timings are per stage (read, extract, ocr, analyze, rename) plus total,
+which includes time spent queued.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from renamer_logic import MAX_PAGES, _join_text
+
+STAGES = ("read", "extract", "ocr", "analyze", "rename")
+
+# Workers per stage; ocr defaults to the processor's OCR pool size
+DEFAULT_WORKERS = {"read": 4, "extract": 2, "ocr": None, "analyze": 1, "rename": 2}
+# Documents waiting in front of each stage
+DEFAULT_QUEUE_SIZES = {"read": 8, "extract": 8, "ocr": 32, "analyze": 8, "rename": 16}
+
+
+class StageStats:
+    def __init__(self, workers):
+        self.workers = workers
+        self.active = 0
+        self.done = 0
+        self.busy = 0.0
+
+
+class _Job:
+    """One document moving through the stages."""
+
+    def __init__(self, result):
+        self.result = result
+        self.session = None
+        self.cache_key = None
+        self.cached = False
+        self.failed = False
+        self.page_count = 0
+        self.pages = []
+        self.ocr_pages = []
+        # (doc_type, metadata) when the extract stage already analyzed (lazy_pages)
+        self.analysis = None
+        self.start = time.perf_counter()
+
+    @property
+    def path(self):
+        return self.result["path"]
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+class Pipeline:
+    """
+    Runs documents through the stages above.
+
+        async for result in Pipeline(processor).run(paths): ...
+
+    or, from synchronous code, `for result in pipeline.process(paths)`.
+    """
+
+    def __init__(self, processor, rename=True, workers=None, queue_sizes=None, result_queue_size=16):
+        self.processor = processor
+        self.rename = rename
+        self.workers = dict(DEFAULT_WORKERS, **(workers or {}))
+        if self.workers["ocr"] is None:
+            self.workers["ocr"] = getattr(processor.ocr, "pool_size", 2)
+        self.queue_sizes = dict(DEFAULT_QUEUE_SIZES, **(queue_sizes or {}))
+        self.result_queue_size = result_queue_size
+        self.stats = {stage: StageStats(self.workers[stage]) for stage in STAGES}
+        self.queues = {}
+        self._start = None
+        self._in_flight = set()
+        self._enumerated = False
+        # Raised by run() once the documents already queued are out
+        self._enumerate_error = None
+
+    def snapshot(self):
+        """Per stage: queued, active/workers, done, busy seconds and documents per second."""
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        return {
+            stage: {
+                "queued": self.queues[stage].qsize() if stage in self.queues else 0,
+                "active": stats.active,
+                "workers": stats.workers,
+                "done": stats.done,
+                "busy": round(stats.busy, 3),
+                "per_sec": round(stats.done / elapsed, 2) if elapsed else 0.0,
+            }
+            for stage, stats in self.stats.items()
+        }
+
+    def queue_depths(self):
+        """Documents waiting in front of each stage (a metrics queue source)."""
+        return {stage: queue.qsize() for stage, queue in self.queues.items()}
+
+    def describe(self):
+        return "  ".join(
+            f"{stage}: {s['queued']} queued, {s['active']}/{s['workers']} busy, {s['done']} done ({s['per_sec']}/s)"
+            for stage, s in self.snapshot().items())
+
+    async def run(self, paths):
+        """Yields results in completion order; an error from iterating paths is raised after the documents before it."""
+        self._start = time.perf_counter()
+        self._enumerated = False
+        self._enumerate_error = None
+        self.queues = {stage: asyncio.Queue(self.queue_sizes[stage]) for stage in STAGES}
+        results = asyncio.Queue(self.result_queue_size)
+        executor = ThreadPoolExecutor(max_workers=sum(self.workers.values()), thread_name_prefix="pipeline")
+        handlers = {"read": self._read, "extract": self._extract, "ocr": self._ocr,
+                    "analyze": self._analyze, "rename": self._rename}
+        tasks = [asyncio.create_task(self._worker(stage, handlers[stage], executor, results))
+                 for stage in STAGES for _ in range(self.workers[stage])]
+        tasks.append(asyncio.create_task(self._enumerate(paths, results)))
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    if self._enumerate_error is not None:
+                        raise self._enumerate_error
+                    return
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Workers still inside a blocking call finish it before the pool goes
+            executor.shutdown(wait=True)
+            for job in self._in_flight:
+                job.close()
+            self._in_flight.clear()
+
+    def process(self, paths):
+        """Synchronous wrapper around run(); yields results in completion order."""
+        loop = asyncio.new_event_loop()
+        agen = self.run(paths)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+
+    async def _enumerate(self, paths, results):
+        try:
+            for path in paths:
+                result = self.processor.new_result(path)
+                if result["status"] == "skipped":
+                    await results.put(result)
+                    continue
+                self.processor.stats["documents"] += 1
+                job = _Job(result)
+                self._in_flight.add(job)
+                await self.queues["read"].put(job)
+        except Exception as e:
+            # e.g. a directory walk hitting a permission error: still end the stream
+            self._enumerate_error = e
+        self._enumerated = True
+        if not self._in_flight:
+            await results.put(None)
+
+    async def _worker(self, stage, handler, executor, results):
+        loop = asyncio.get_running_loop()
+        queue = self.queues[stage]
+        stats = self.stats[stage]
+        while True:
+            job = await queue.get()
+            stats.active += 1
+            start = time.perf_counter()
+            try:
+                next_stage = await loop.run_in_executor(executor, handler, job)
+            except Exception as e:
+                job.result["status"] = "error"
+                job.result["error"] = f"Error: {e}"
+                next_stage = None
+            finally:
+                elapsed = time.perf_counter() - start
+                stats.active -= 1
+                stats.done += 1
+                stats.busy += elapsed
+            job.result["timings"][stage] = elapsed
+            if next_stage is None:
+                job.close()
+                job.result["timings"]["total"] = time.perf_counter() - job.start
+                if job.session is not None:
+                    job.result["profile"] = job.session.recorder.profile()
+                self._in_flight.discard(job)
+                await results.put(job.result)
+                if self._enumerated and not self._in_flight:
+                    # Last document out ends the stream
+                    await results.put(None)
+            else:
+                await self.queues[next_stage].put(job)
+
+    # Stage handlers run on the thread pool and return the next stage (None = done)
+
+    def _read(self, job):
+        job.session = self.processor.new_session(job.path)
+        if self.processor.lazy_pages:
+            # extract_and_analyze looks the file up in the cache itself
+            return "extract"
+        job.cache_key, cached = self.processor._cache_lookup(job.path, job.session)
+        if cached is not None:
+            cached = self.processor._wrap_cached(cached, job.path, job.session)
+            job.pages = cached["pages"]
+            job.cached = True
+            return "analyze"
+        try:
+            job.page_count = min(len(job.session.pdf.pages), MAX_PAGES)
+        except Exception as e:
+            print(f"Error reading {job.path}: {e}")
+            job.failed = True
+            return "analyze"
+        return "extract"
+
+    def _extract(self, job):
+        if self.processor.lazy_pages:
+            data, doc_type, metadata = self._counted(
+                job, self.processor.extract_and_analyze, job.path, job.session)
+            job.pages = data["pages"]
+            job.analysis = (doc_type, metadata)
+            return "analyze"
+        try:
+            for i in range(job.page_count):
+                if not self.processor.within_budget(job.path, job.session):
+                    break
+                p_data = self.processor.extract_page(job.path, job.session, i)
+                job.pages.append(p_data)
+                if self.processor.needs_ocr(p_data):
+                    job.ocr_pages.append(i)
+        except Exception as e:
+            print(f"Error reading {job.path}: {e}")
+            job.failed = True
+        return "ocr" if job.ocr_pages else "analyze"
+
+    def _ocr(self, job):
+        for i in job.ocr_pages:
+            self.processor.ocr_page(job.session, i, job.pages[i])
+        return "analyze"
+
+    def _analyze(self, job):
+        processor = self.processor
+        result = job.result
+        data = {"full_text": _join_text(job.pages), "pages": job.pages}
+        truncated = job.session is not None and job.session.truncated
+        if (job.cache_key is not None and not job.cached and not job.failed
+                and processor.cacheable(job.session)):
+            processor.cache.put(job.cache_key, data)
+        result["pages_read"] = len(job.pages)
+        result["truncated"] = truncated
+        if not data["full_text"]:
+            result["status"] = "no_text"
+            return None
+
+        if job.analysis is not None:
+            doc_type, metadata = job.analysis
+        else:
+            doc_type, metadata = self._counted(job, processor.analyze_content, data, job.path, job.session)
+        # Closed before renaming (Windows will not rename an open file)
+        job.close()
+        return "rename" if processor.plan_name(result, doc_type, metadata, self.rename) else None
+
+    def _counted(self, job, analyze, *args):
+        """Runs analyze(*args), recording the processor stats it added in the job's result."""
+        # Exact per document while the calling stage has a single worker
+        stats = self.processor.stats
+        before = stats.copy()
+        try:
+            return analyze(*args)
+        finally:
+            job.result["stats"] = {
+                "spatial_searches": stats["spatial_searches"] - before["spatial_searches"],
+                "word_extractions": stats["word_extractions"] - before["word_extractions"],
+            }
+
+    def _rename(self, job):
+        self.processor.apply_rename(job.result)
+        return None
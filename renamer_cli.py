@@ -0,0 +1,372 @@
+"""
+Headless batch mode: renames PDFs given as files or directories and writes
+one JSON line per document to stdout as soon as it finishes, so the output
+can be piped into other tools. A summary and any other messages go to
+stderr.
+
+    python renamer_cli.py [--jobs N] [--dry-run] [--lazy-pages] [--cache PATH] PATH [PATH ...]
+    python renamer_cli.py --pipeline [--stats-every SECONDS] PATH [PATH ...]
+    python renamer_cli.py --watch [--state PATH] [--settle SECONDS] [--jobs N] DIRECTORY
+    python renamer_cli.py --undo JOURNAL
+    python renamer_cli.py --split [--split-dir DIR] PATH [PATH ...]
+
+--journal PATH appends every rename (old and new path) to a JSON lines
+journal; --undo JOURNAL moves a whole journaled batch back, printing one
+line per file (old, new, status: restored | removed | missing | occupied |
+error). Documents written by --split are journaled as created files, so
+undo removes them and leaves the batch as it was.
+
+--split treats every PDF as a merged scan batch and writes each document
+found in it as its own renamed PDF (see scan_splitter.py), printing one
+line per document (source, part, pages, reason, doc_type, metadata,
+new_name, new_path, status: written | planned | error, error). The batch
+files themselves are left alone.
+
+With --watch it keeps running (until Ctrl-C) and handles PDFs as they
+appear under DIRECTORY, see watch_folder.py. --metrics-port and
+--metrics-file export Prometheus metrics while it runs (see metrics.py). With --pipeline the files go
+through the staged in-process pipeline (pipeline.py) instead of worker
+processes, and its stage statistics are printed to stderr at the end.
+
+Each line is the process_document() result (path, status, doc_type,
+metadata, new_name, new_path, error, pages_read, stats, timings, profile)
+plus "elapsed": seconds since the run started. With --profile, "profile"
+holds the document's sub-stage timings, counters and winning strategies
+(see instrumentation.py) and a summary of the run goes to stderr.
+Exit status is 1 when any document failed, 0 otherwise.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from instrumentation import RunProfile
+from renamer_logic import PDFProcessor
+
+
+def iter_pdf_paths(paths):
+    """
+    Yields PDF paths from files and (recursively) directories, lazily, so a
+    huge tree starts producing work right away. Explicit files are passed
+    through whatever their extension (process_document reports them as
+    skipped).
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Rename insurance PDFs from their content.")
+    parser.add_argument("paths", nargs="*", help="PDF files or directories (searched recursively)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 = run in this process; default: CPU count)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="report new names without renaming")
+    parser.add_argument("--lazy-pages", action="store_true",
+                        help="stop reading pages once the metadata is complete")
+    parser.add_argument("--cache", metavar="PATH", help="extraction cache database to read and fill")
+    parser.add_argument("--bounded-memory", action="store_true",
+                        help="free each page's caches and raster as soon as its text is captured")
+    parser.add_argument("--memory-limit", type=float, metavar="MB",
+                        help="per-process RSS ceiling; past it a document's remaining pages are skipped "
+                             "(implies --bounded-memory)")
+    parser.add_argument("--profile", action="store_true",
+                        help="add per-document timings and counters to each line and print a summary at the end")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="run the staged in-process pipeline (see pipeline.py) instead of worker processes")
+    parser.add_argument("--stats-every", type=float, metavar="SECONDS",
+                        help="with --pipeline, print stage queue depths and throughput to stderr this often")
+    parser.add_argument("--journal", metavar="PATH", help="append every rename to this journal (see --undo)")
+    parser.add_argument("--undo", metavar="JOURNAL", help="move the files renamed in JOURNAL back and exit")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="keep rewriting Prometheus metrics to PATH (node_exporter textfile collector)")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, metavar="SECONDS",
+                        help="how often --metrics-file is rewritten (default 15)")
+    parser.add_argument("--split", action="store_true",
+                        help="split each PDF (a merged scan batch) into one renamed PDF per document")
+    parser.add_argument("--split-dir", metavar="DIR",
+                        help="with --split, write the documents here (default: next to each batch)")
+    parser.add_argument("--watch", action="store_true", help="keep watching DIRECTORY for new PDFs")
+    parser.add_argument("--state", metavar="PATH",
+                        help="watch mode record of handled files (default: in the user cache directory)")
+    parser.add_argument("--settle", type=float, default=0.5,
+                        help="watch mode: seconds a file must stay unchanged before it is read")
+    return parser
+
+
+def make_processor(args):
+    cache = None
+    if args.cache:
+        from extraction_cache import ExtractionCache
+        cache = ExtractionCache(args.cache)
+    # Metrics need the per-document profile for OCR pages and cache hits
+    profile = args.profile or wants_metrics(args)
+    return PDFProcessor(cache=cache, lazy_pages=args.lazy_pages, profile=profile,
+                        bounded_memory=args.bounded_memory, memory_limit_mb=args.memory_limit,
+                        journal=open_journal(args))
+
+
+def iter_results(processor, paths, jobs, rename, cancel_event, engine=None):
+    """process_document() results in completion order."""
+    if jobs <= 1:
+        for path in paths:
+            if cancel_event.is_set():
+                return
+            yield processor.process_document(path, rename=rename)
+    elif engine is not None:
+        yield from engine.process(paths, rename=rename, cancel_event=cancel_event)
+    else:
+        yield from processor.process_batch(paths, workers=jobs, rename=rename, cancel_event=cancel_event)
+
+
+def wants_metrics(args):
+    return args.metrics_port is not None or bool(args.metrics_file)
+
+
+def start_metrics(args, err):
+    """(Metrics, exporters to close) for the --metrics-* options, or (None, [])."""
+    if not wants_metrics(args):
+        return None, []
+    from metrics import Metrics, MetricsServer, TextfileWriter
+
+    metrics = Metrics()
+    exporters = []
+    if args.metrics_port is not None:
+        server = MetricsServer(metrics, port=args.metrics_port).start()
+        print(f"Metrics on http://{server.host}:{server.port}/metrics", file=err)
+        exporters.append(server)
+    if args.metrics_file:
+        exporters.append(TextfileWriter(metrics, args.metrics_file, args.metrics_interval).start())
+    return metrics, exporters
+
+
+def stop_metrics(exporters):
+    for exporter in exporters:
+        exporter.close()
+
+
+def open_journal(args):
+    """
+    RenameJournal for --journal, or None. Each worker process appends its
+    renames itself, right after making them, so a crash of this process or
+    a lost worker result never leaves a rename unjournaled.
+    """
+    if not args.journal:
+        return None
+    from bulk_renamer import RenameJournal
+    return RenameJournal(args.journal)
+
+
+def run(args, out=None, err=None):
+    """Processes everything in args.paths, streaming JSON lines to out (stdout). Returns the exit status."""
+    out = out or sys.stdout
+    err = err or sys.stderr
+    processor = make_processor(args)
+    cancel_event = threading.Event()
+    metrics, exporters = start_metrics(args, err)
+    run_profile = RunProfile()
+    counts = Counter()
+    start = last_stats = time.perf_counter()
+    pipeline = engine = None
+    if args.pipeline:
+        from pipeline import Pipeline
+        pipeline = Pipeline(processor, rename=not args.dry_run)
+        if metrics is not None:
+            metrics.add_queue_source(pipeline.queue_depths)
+        results = pipeline.process(iter_pdf_paths(args.paths))
+    else:
+        if args.jobs > 1:
+            from batch_engine import BatchEngine
+            engine = BatchEngine(workers=args.jobs, processor_options=processor.worker_options())
+            if metrics is not None:
+                metrics.add_queue_source(engine.queue_depths)
+        results = iter_results(processor, iter_pdf_paths(args.paths), args.jobs, not args.dry_run, cancel_event,
+                               engine)
+    try:
+        for result in results:
+            now = time.perf_counter()
+            result["elapsed"] = round(now - start, 4)
+            counts[result["status"]] += 1
+            run_profile.add(result)
+            if metrics is not None:
+                metrics.observe(result)
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+            if pipeline is not None and args.stats_every and now - last_stats >= args.stats_every:
+                print(pipeline.describe(), file=err)
+                last_stats = now
+    except KeyboardInterrupt:
+        # Stop queuing; files already in a worker finish before the pool closes
+        cancel_event.set()
+        results.close()
+        print("Interrupted.", file=err)
+        return 130
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head): stop, and keep the
+        # final flush of out from failing again
+        cancel_event.set()
+        results.close()
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 0
+    finally:
+        if engine is not None:
+            engine.close()
+        if processor.journal is not None:
+            processor.journal.close()
+        stop_metrics(exporters)
+
+    elapsed = time.perf_counter() - start
+    done = sum(counts.values())
+    summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())) or "no files"
+    print(f"{done} file(s) in {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} files/s). {summary}",
+          file=err)
+    if pipeline is not None:
+        print(pipeline.describe(), file=err)
+    if args.profile:
+        print(run_profile.describe(), file=err)
+    return 1 if counts["error"] else 0
+
+
+def watch(args, out=None, err=None, stop_event=None):
+    """Watch mode: streams a JSON line per handled file until stop_event is set or Ctrl-C."""
+    from batch_engine import BatchEngine
+    from extraction_cache import default_cache_dir
+    from watch_folder import FolderWatcher, WatchState
+
+    out = out or sys.stdout
+    err = err or sys.stderr
+    stop_event = stop_event or threading.Event()
+    processor = make_processor(args)
+    state = WatchState(args.state or os.path.join(default_cache_dir(), "watch_state.sqlite3"))
+    metrics, exporters = start_metrics(args, err)
+    run_profile = RunProfile()
+    start = time.perf_counter()
+
+    def emit(result):
+        result["elapsed"] = round(time.perf_counter() - start, 4)
+        run_profile.add(result)
+        if metrics is not None:
+            metrics.observe(result)
+        out.write(json.dumps(result, default=str) + "\n")
+        out.flush()
+
+    with BatchEngine(workers=args.jobs, processor_options=processor.worker_options()) as engine:
+        watcher = FolderWatcher(args.paths[0], engine, state, rename=not args.dry_run, settle=args.settle)
+        if metrics is not None:
+            metrics.add_queue_source(watcher.queue_depths)
+            metrics.add_queue_source(engine.queue_depths)
+        print(f"Watching {watcher.root} (state: {state.path}). Ctrl-C to stop.", file=err)
+        try:
+            watcher.run(stop_event, emit)
+        except KeyboardInterrupt:
+            print("Stopping: finishing files in progress...", file=err)
+        for result in watcher.drain():
+            emit(result)
+    state.close()
+    if processor.journal is not None:
+        processor.journal.close()
+    stop_metrics(exporters)
+    if args.profile:
+        print(run_profile.describe(), file=err)
+    return 0
+
+
+def undo(args, out=None, err=None):
+    """Moves back every file renamed in the --undo journal and removes the ones it created; exit status 1 if any could not be."""
+    from bulk_renamer import undo_journal
+
+    out = out or sys.stdout
+    err = err or sys.stderr
+    counts = Counter()
+    for result in undo_journal(args.undo):
+        counts[result["status"]] += 1
+        out.write(json.dumps(result) + "\n")
+    out.flush()
+    summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())) or "nothing to undo"
+    print(f"Undo {args.undo}: {summary}", file=err)
+    return 1 if counts["occupied"] or counts["error"] else 0
+
+
+def split(args, out=None, err=None):
+    """--split: one JSON line per document found in each batch; exit status 1 if any could not be written."""
+    from scan_splitter import ScanSplitter
+
+    out = out or sys.stdout
+    err = err or sys.stderr
+    # Batches can run to hundreds of pages
+    args.bounded_memory = True
+    processor = make_processor(args)
+    journal = processor.journal
+    splitter = ScanSplitter(processor, journal=journal)
+    counts = Counter()
+    start = time.perf_counter()
+    try:
+        for path in iter_pdf_paths(args.paths):
+            try:
+                for result in splitter.split(path, output_dir=args.split_dir, write=not args.dry_run):
+                    result["elapsed"] = round(time.perf_counter() - start, 4)
+                    counts[result["status"]] += 1
+                    out.write(json.dumps(result, default=str) + "\n")
+                    out.flush()
+            except Exception as e:
+                counts["error"] += 1
+                print(f"Error splitting {path}: {e}", file=err)
+    except KeyboardInterrupt:
+        print("Interrupted.", file=err)
+        return 130
+    finally:
+        if journal is not None:
+            journal.close()
+    summary = ", ".join(f"{status}: {n}" for status, n in sorted(counts.items())) or "no documents"
+    print(f"Split into {sum(counts.values())} document(s) in {time.perf_counter() - start:.1f}s. {summary}", file=err)
+    return 1 if counts["error"] else 0
+
+
+def claim_stdout():
+    """
+    Returns a line-buffered writer on the real stdout and points file
+    descriptor 1 at stderr, so messages print()ed by the processor (and by
+    worker processes, which inherit it) cannot corrupt the JSON lines.
+    """
+    sys.stdout.flush()
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1, encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return out
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.undo:
+        if args.paths:
+            parser.error("--undo takes no paths")
+        return undo(args, claim_stdout())
+    if not args.paths:
+        parser.error("the following arguments are required: paths")
+    if args.split:
+        return split(args, claim_stdout())
+    if args.watch:
+        if len(args.paths) != 1 or not os.path.isdir(args.paths[0]):
+            parser.error("--watch takes exactly one directory")
+        return watch(args, claim_stdout())
+    return run(args, claim_stdout())
+
+
+if __name__ == "__main__":
+    # Required for the worker pool inside a PyInstaller build
+    multiprocessing.freeze_support()
+    sys.exit(main())
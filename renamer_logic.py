@@ -1,13 +1,25 @@
 import re
 import os
+import time
 from datetime import datetime
-import pytesseract
-from thefuzz import process, fuzz
-from pdfplumber import open as plumber_open
-import pdfplumber
+from collections import Counter
 from enum import Enum, auto
 
+import lazy_imports
 from surname_matcher import SurnameMatcher
+from bulk_renamer import BulkRenamer
+from spatial_index import get_page_index
+from anchor_finder import get_page_anchors, keyword_tokens
+from document_session import DocumentSession, PageData
+from instrumentation import Recorder, NullRecorder
+from memory_budget import MemoryBudget
+from ocr_service import get_ocr_service
+from extraction_backends import DEFAULT_BACKEND
+from document_classifier import DocumentClassifier, KeywordRule
+
+# Heavy modules load on first use, so importing this module (and showing the
+# GUI) stays fast. pdfplumber stays reachable as renamer_logic.pdfplumber.
+__getattr__ = _lazy = lazy_imports.deferred(globals(), pdfplumber="pdfplumber", company_matcher="company_matcher")
 
 class DocumentType(Enum):
     POLICY = auto()
@@ -19,49 +31,396 @@ class DocumentType(Enum):
     CHECK = auto()
     UNKNOWN = auto()
 
+# Bump whenever extract_data output changes so cached extractions are invalidated
+EXTRACTOR_VERSION = 2
+
+# Pages read per document
+MAX_PAGES = 5
+
+METADATA_DEFAULTS = {
+    "insured_name": "UnknownInsured",
+    "company_name": "UnknownCompany",
+    "date": "0000-00-00",
+    "policy_number": None,
+    "type_detail": "Doc"
+}
+
+# Spatial anchor keywords
+NAME_COLON_KEYS = ["named insured:", "insured name:", "insured:", "applicant:", "customer:", "policyholder:", "entity:", "client:"]
+NAME_NO_COLON_KEYS = ["named insured", "insured name", "policyholder"]
+DATE_KEYS = ["effective date", "policy period", "period:", "date of issue", "invoice date"]
+# Every token of every anchor keyword, scored against a page's words in one batch
+ANCHOR_TOKENS = sorted({t for kw in NAME_COLON_KEYS + NAME_NO_COLON_KEYS + DATE_KEYS
+                        for t in keyword_tokens(kw)})
+
+# Document type rules, first match wins. The overrides beat the policy
+# keywords; certificate/invoice/check only apply when no policy keyword is present.
+CLASSIFIER_RULES = [
+    KeywordRule(DocumentType.CANCELLATION_REQUEST, ["cancellation request", "policy release", "acord 35"]),
+    KeywordRule(DocumentType.CME_TERM, ["cme insurance brokerage inc", "agreement acknowledgement"], require_all=True),
+    KeywordRule(DocumentType.DRIVER_LICENSE, ["driver license", "driver's license", "identification card"]),
+    # Policy/Declaration (User Request: Check this FIRST)
+    KeywordRule(DocumentType.POLICY, ["declaration", "deductible", "peril"]),
+    KeywordRule(DocumentType.CERTIFICATE, ["certificate of insurance", "acord"]),
+    # Invoice (Check this LAST)
+    KeywordRule(DocumentType.INVOICE, ["invoice", "bill", "due"]),
+    KeywordRule(DocumentType.CHECK, ["pay to the order of", "check no."]),
+]
+
+# Fields generate_new_name needs per type; lazy mode stops reading pages once all are found
+REQUIRED_FIELDS = {
+    DocumentType.POLICY: ("insured_name", "company_name", "date"),
+    DocumentType.INVOICE: ("insured_name", "company_name", "date"),
+    DocumentType.CERTIFICATE: ("insured_name", "date"),
+    DocumentType.CANCELLATION_REQUEST: ("insured_name", "date"),
+    DocumentType.CME_TERM: ("insured_name", "date"),
+    DocumentType.DRIVER_LICENSE: ("insured_name", "date"),
+    DocumentType.CHECK: ("insured_name", "date"),
+}
+
+# Regex bank: every pattern analyze_content uses, compiled once at import
+_DATE_NUM = r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}'
+_MONTH_DATE = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}'
+
+# All term-logic candidates in one scan; the group name says which form matched
+TERM_DATE_RE = re.compile(rf'\b(?P<numeric>{_DATE_NUM})\b|\b(?P<text>{_MONTH_DATE})\b', re.IGNORECASE)
+DATE_LIKE_RE = re.compile(_DATE_NUM)
+INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+PARENS_RE = re.compile(r'\(.*?\)', re.DOTALL)
+
+# Tried in order; the first pattern that matches anywhere wins, so these stay
+# separate scans rather than one alternation (which would prefer the earliest
+# position in the text over the priority order)
+INSURED_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    # Explicit "Named Insured" is strongest signal
+    # Handle: "Item 1. Named Insured", "Named Insured(s)", "Named Insured:"
+    r'(?:Item\s*\d+\.?)?\s*Named\s*Insured(?:\(s\)|s)?\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Insured\s*Name(?:s)?\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Insured\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Account\s*Name\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Applicant\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Customer\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'(?:First\s*)?Named\s*Insured\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Policyholder\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    r'Entity\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
+    # Driver License Specific
+    r'\bLN\s*[:\.]?\s*([A-Za-z\s]+)', # LN Lastname
+    r'\b1\.\s*([A-Za-z\s,]+)', # 1. Name (Standard ID format)
+    r'\bName\s*[:\.]?\s*([A-Za-z\s,]+)',
+)]
+# Trailing noise stripped from a regex-captured name, applied in order
+NAME_CLEANUP_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Page\s+\d+', r'Policy\s+No.*', r'Applicant.*', r'Producer.*',
+)]
+WHITESPACE_RE = re.compile(r'\s+')
+
+DATE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    # High Priority: Explicit Labels mentioned by user
+    r'(?:Effective|Issue|Policy)\s*(?:Date)?[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',  # Effective Date: 01/30/2025
+    r'(?:Period|From)[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',                        # Period: 01/30/2025 or From: 01/30/2025
+    # Secondary
+    rf'Date of Issue:?\s*({_DATE_NUM})',
+    rf'Policy Period:?\s*({_DATE_NUM})',
+    rf'(?:Effective|Issue|Policy)?\s*Date:?\s*({_DATE_NUM})',
+    _MONTH_DATE,
+    rf'({_DATE_NUM})', # Fallback
+    # DL Specific
+    rf'(?:Exp|Expires|Exp Date)\s*[:\.]?\s*({_DATE_NUM})',
+    rf'(?:Iss|Issued|Iss Date)\s*[:\.]?\s*({_DATE_NUM})',
+)]
+COMPANY_FALLBACK_RE = re.compile(r'(?:Underwritten by|Company|Insurer|Producer):\s*([A-Za-z\s,.]+)', re.IGNORECASE)
+
+
+def _match_date(text):
+    """First DATE_PATTERNS hit in text (the captured date if the pattern has one), or None."""
+    for pat in DATE_PATTERNS:
+        dm = pat.search(text)
+        if dm:
+            if pat.groups and dm.group(1):
+                return dm.group(1)
+            return dm.group(0)
+    return None
+
+def _join_text(pages):
+    """full_text of a document: every page's text, each preceded by a newline."""
+    return "".join("\n" + p["text"] for p in pages)
+
 class PDFProcessor:
-    def __init__(self):
+    def __init__(self, cache=None, ocr=None, lazy_pages=False, backend=None, profile=False,
+                 bounded_memory=False, memory_limit_mb=None, journal=None):
         script_dir = os.path.dirname(os.path.abspath(__file__))
         json_path = os.path.join(script_dir, "chinese_surnames_detailed.json")
         self.surname_matcher = SurnameMatcher(json_path)
+        self._company_matcher = None
+        # Optional ExtractionCache; a hit skips pdfplumber and OCR entirely
+        self.cache = cache
+        # OCRService; defaults to the process-wide pool on first use
+        self._ocr = ocr
+        # Stop extracting pages once the metadata is complete (see extract_and_analyze)
+        self.lazy_pages = lazy_pages
+        # Text/word extraction strategy (see extraction_backends)
+        self.backend = backend or DEFAULT_BACKEND()
+        # All document type keywords are found in one pass over the text
+        self.classifier = DocumentClassifier(CLASSIFIER_RULES, DocumentType.UNKNOWN)
+        # Running counters for this processor (documents, spatial_searches, word_extractions, ...)
+        self.stats = Counter()
+        # Per-document timings and strategy notes in each result's "profile" (see instrumentation)
+        self.profile = profile
+        self._null_recorder = NullRecorder(self.stats)
+        # Optional RenameJournal; every rename is appended by the process that does it
+        self.journal = journal
+        # Indexes target directories once and claims new names atomically
+        self.renamer = BulkRenamer(journal)
+        # Free each page's caches and raster once its data is captured (memory_limit_mb implies it)
+        self.bounded_memory = bounded_memory or memory_limit_mb is not None
+        # RSS ceiling checked before every page (see memory_budget)
+        self.memory_limit_mb = memory_limit_mb
+        self.memory_budget = MemoryBudget(memory_limit_mb) if memory_limit_mb is not None else None
+
+    @property
+    def company_matcher(self):
+        """Known carriers, indexed on first use and reused for every document this processor sees."""
+        if self._company_matcher is None:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            self._company_matcher = _lazy("company_matcher").CompanyMatcher(os.path.join(script_dir, "known_companies.json"))
+        return self._company_matcher
+
+    @property
+    def ocr(self):
+        if self._ocr is None:
+            self._ocr = get_ocr_service()
+        return self._ocr
+
+    @property
+    def extractor_version(self):
+        """Cache version tag: the extractor code version plus the backend in use."""
+        return f"{EXTRACTOR_VERSION}-{self.backend.name}"
+
+    def worker_options(self):
+        """Constructor arguments needed to build an equivalent processor in a worker."""
+        return {"cache": self.cache, "lazy_pages": self.lazy_pages, "backend": self.backend, "profile": self.profile,
+                "bounded_memory": self.bounded_memory, "memory_limit_mb": self.memory_limit_mb, "journal": self.journal}
+
+    def new_session(self, filepath, max_pages=MAX_PAGES):
+        """DocumentSession for one document, carrying its recorder; max_pages=None wraps every page."""
+        return DocumentSession(filepath, Recorder(self.stats) if self.profile else self._null_recorder,
+                               max_pages=max_pages, bounded=self.bounded_memory)
+
+    def _recorder(self, session):
+        recorder = getattr(session, "recorder", None)
+        return recorder if recorder is not None else self._null_recorder
+
+    def _cache_lookup(self, filepath, session=None):
+        """Returns (cache_key, cached_data); both None when caching is off or fails."""
+        if self.cache is None:
+            return None, None
+        try:
+            cache_key = self.cache.key_for_file(filepath, self.extractor_version)
+            cached = self.cache.get(cache_key)
+            self._recorder(session).count("cache_hits" if cached is not None else "cache_misses")
+            return cache_key, cached
+        except OSError as e:
+            print(f"Cache lookup failed for {filepath}: {e}")
+            return None, None
+
+    def within_budget(self, filepath, session):
+        """
+        False when the memory ceiling is reached even after freeing the
+        session's caches; the caller then stops reading pages. The session
+        is marked truncated so the partial extraction is never cached.
+        """
+        budget = self.memory_budget
+        if budget is None or not budget.exceeded():
+            return True
+        recorder = self._recorder(session)
+        recorder.count("memory_releases")
+        if budget.release(session.release):
+            return True
+        recorder.count("memory_stops")
+        session.truncated = True
+        print(f"Memory limit of {budget.limit_mb} MB reached; reading no more pages of {filepath}")
+        return False
+
+    def iter_pages(self, filepath, session, max_pages=MAX_PAGES):
+        """Yields page dicts {words, width, height, text} one at a time, OCR'ing short pages."""
+        num_pages = min(len(session.pdf.pages), max_pages)
+        for i in range(num_pages):
+            if not self.within_budget(filepath, session):
+                return
+            p_data = self.extract_page(filepath, session, i)
+            if self.needs_ocr(p_data):
+                self.ocr_page(session, i, p_data)
+            yield p_data
+
+    def extract_page(self, filepath, session, i):
+        """Text layer (and words, if the backend makes them) of page i, without OCR."""
+        page = session.pdf.pages[i]
+        recorder = self._recorder(session)
+        recorder.count("pages_extracted")
+        with recorder.timer("text_extraction"):
+            text, words = self.backend.extract(page)
+        p_data = PageData(
+            # Only used when the backend did not produce words; runs if the
+            # spatial fallbacks ask for them
+            lambda i=i: self._load_words(filepath, session, i),
+            width=page.width,
+            height=page.height,
+            text=text,
+        )
+        if words is not None:
+            p_data["words"] = words
+        if session.bounded:
+            # Text and words are captured; words reload from a fresh parse if asked for
+            page.close()
+        return p_data
+
+    @staticmethod
+    def needs_ocr(p_data):
+        # OCR Fallback (scanned check reuses the text from the layout pass)
+        return len(p_data["text"]) < 50
+
+    def ocr_page(self, session, i, p_data):
+        """
+        Replaces a scanned page's text with Tesseract's. Returns False (and
+        marks the session ocr_failed) when OCR raised; the page keeps its
+        text layer.
+        """
+        try:
+            # Convert to image for OCR
+            # The session keeps the raster so zone OCR can crop from it later.
+            recorder = self._recorder(session)
+            recorder.count("pages_ocr")
+            with recorder.timer("page_ocr"):
+                im = session.raster(i)
+                p_data["text"] = self.ocr.image_to_string(im)
+            return True
+        except Exception as ocr_e:
+            print(f"OCR Failed for page {i}: {ocr_e}")
+            session.ocr_failed = True
+            return False
+        finally:
+            if session.bounded:
+                # Zone OCR re-renders the page if it needs it
+                session.release_page(i)
+
+    def _load_words(self, filepath, session, page_index):
+        """Word/geometry pass for one page; reopens the file if the session is gone."""
+        recorder = self._recorder(session)
+        recorder.count("word_extractions")
+        with recorder.timer("word_extraction"):
+            if session is not None and not session.closed:
+                return self.backend.extract_words(session.page(page_index))
+            with DocumentSession(filepath) as tmp:
+                page = tmp.page(page_index)
+                return self.backend.extract_words(page) if page is not None else []
+
+    @staticmethod
+    def cacheable(session):
+        """
+        True when the session's extraction is complete: every page read and
+        every scanned page OCR'd. A transient failure must not be cached for good.
+        """
+        return not session.truncated and not session.ocr_failed
+
+    def _wrap_cached(self, cached, filepath, session):
+        """Cached pages may lack words (never needed at the time); load them on demand."""
+        cached["pages"] = [
+            page if "words" in page else PageData(
+                lambda i=i: self._load_words(filepath, session, i), page)
+            for i, page in enumerate(cached["pages"])
+        ]
+        return cached
+
+    def extract_data(self, filepath, session=None):
+        """
+        Extracts text and spatial data from the first few pages of the PDF.
+        Pass a DocumentSession to keep the file open (and its page rasters)
+        for the analysis step that follows.
+        """
+        cache_key, cached = self._cache_lookup(filepath, session)
+        if cached is not None:
+            return self._wrap_cached(cached, filepath, session)
 
-    def extract_data(self, filepath):
-        """Extracts text and spatial data from the first few pages of the PDF."""
         data = {
             "full_text": "", 
             "pages": [] # List of {words, width, height, text}
         }
+        own_session = None
+        if session is None:
+            session = own_session = self.new_session(filepath)
         try:
-            with pdfplumber.open(filepath) as pdf:
-                # Scan up to first 5 pages
-                num_pages = min(len(pdf.pages), 5)
-                for i in range(num_pages):
-                    page = pdf.pages[i]
-                    text = page.extract_text() or ""
-                    
-                    # OCR Fallback
-                    if len(text) < 50:
-                        try:
-                            # Convert to image for OCR
-                            # We try pdfplumber's image extraction if available or skip.
-                            im = page.to_image(resolution=300).original
-                            text = pytesseract.image_to_string(im)
-                        except Exception as ocr_e:
-                            print(f"OCR Failed for page {i}: {ocr_e}")
-
-                    p_data = {
-                        "width": page.width,
-                        "height": page.height,
-                        "text": text,
-                        "words": page.extract_words(extra_attrs=["fontname", "size"])
-                    }
-                    data["pages"].append(p_data)
-                    data["full_text"] += "\n" + text
+            for p_data in self.iter_pages(filepath, session):
+                data["pages"].append(p_data)
+            data["full_text"] = _join_text(data["pages"])
+
+            if cache_key is not None and self.cacheable(session):
+                self.cache.put(cache_key, data)
                     
         except Exception as e:
             print(f"Error reading {filepath}: {e}")
+            data["full_text"] = _join_text(data["pages"])
+        finally:
+            if own_session is not None:
+                own_session.close()
         return data
 
+    def _is_complete(self, doc_type, metadata):
+        """True once every field the file name needs for this type has been found."""
+        required = REQUIRED_FIELDS.get(doc_type)
+        if not required:
+            return False
+        for field in required:
+            if metadata.get(field) == METADATA_DEFAULTS[field]:
+                return False
+        if "date" in required and metadata["date"] == datetime.now().strftime("%m-%d-%Y"):
+            # Possibly the "no date found, use today" fallback; keep reading
+            return False
+        return True
+
+    def extract_and_analyze(self, filepath, session):
+        """
+        Lazy mode: pulls pages one at a time and stops as soon as the detected
+        DocumentType has all its required fields.
+        Interim passes skip zone OCR; it only runs if every page was read.
+        A read error mid-document analyzes the pages read so far, as the
+        eager path does. Returns (data, doc_type, metadata).
+        """
+        cache_key, cached = self._cache_lookup(filepath, session)
+        if cached is not None:
+            cached = self._wrap_cached(cached, filepath, session)
+            doc_type, metadata = self.analyze_content(cached, filepath, session)
+            return cached, doc_type, metadata
+
+        data = {"full_text": "", "pages": []}
+        texts = []
+        pages = self.iter_pages(filepath, session)
+        read_error = False
+        while True:
+            # Only the page reads are guarded: an analysis bug is not a damaged file
+            try:
+                p_data = next(pages, None)
+            except Exception as e:
+                print(f"Error reading {filepath}: {e}")
+                read_error = True
+                break
+            if p_data is None:
+                break
+            data["pages"].append(p_data)
+            texts.append("\n" + p_data["text"])
+            data["full_text"] = "".join(texts)
+            if not data["full_text"].strip():
+                continue
+            doc_type, metadata = self._analyze_content(data, None, session)
+            if self._is_complete(doc_type, metadata):
+                return data, doc_type, metadata
+
+        # Every page was read: same result as the eager path, so it is safe to
+        # cache, unless a read error, the memory ceiling or an OCR failure left it incomplete
+        if cache_key is not None and not read_error and self.cacheable(session):
+            self.cache.put(cache_key, data)
+        doc_type, metadata = self.analyze_content(data, filepath, session)
+        return data, doc_type, metadata
+
 
         
     def _fuzzy_match(self, target, candidates, threshold=80):
@@ -69,184 +428,168 @@ class PDFProcessor:
         # Not used directly in loop to avoid perf hit, but useful for verifying anchors
         pass # implemented inline for speed
 
-    def _perform_zone_ocr(self, filepath, page_index, anchor_rect):
+    def _perform_zone_ocr(self, filepath, page_index, anchor_rect, session=None):
         """
         Performs OCR on a specific region relative to an anchor.
         anchor_rect: (x0, top, x1, bottom)
+        The crop comes from the session's cached page raster, so repeated
+        anchors on the same page never re-open or re-render the PDF.
         """
+        recorder = self._recorder(session)
+        recorder.count("zone_ocr_calls")
+        with recorder.timer("zone_ocr"):
+            return self._zone_ocr(filepath, page_index, anchor_rect, session)
+
+    def _zone_ocr(self, filepath, page_index, anchor_rect, session):
+        own_session = None
+        if session is None:
+            session = own_session = DocumentSession(filepath)
         try:
-           with pdfplumber.open(filepath) as pdf:
-               if page_index >= len(pdf.pages): return None
-               page = pdf.pages[page_index]
-               
-               # Define crop region: Right of anchor, same height approx
-               # x0 = anchor.right, top = anchor.top - 5, x1 = page.width, bottom = anchor.bottom + 5
-               # But pdfplumber bbox is (x0, top, x1, bottom)
-               
-               # Let's define a generous area to the right
-               crop_box = (
-                   anchor_rect[2], # x0 (start at anchor right)
-                   max(0, anchor_rect[1] - 5), # top
-                   min(page.width, anchor_rect[2] + 400), # x1 (width of value ~400px)
-                   min(page.height, anchor_rect[3] + 5) # bottom
-               )
-               
-               # Crop
-               cropped = page.crop(crop_box)
-               
-               # Image conversion
-               im = cropped.to_image(resolution=300).original
-               
-               # OCR
-               text = pytesseract.image_to_string(im, config='--psm 7').strip() # PSM 7 = Single text line
-               return text
+           page = session.page(page_index)
+           if page is None: return None
+           
+           # Define crop region: Right of anchor, same height approx
+           # x0 = anchor.right, top = anchor.top - 5, x1 = page.width, bottom = anchor.bottom + 5
+           # But pdfplumber bbox is (x0, top, x1, bottom)
+           
+           # Let's define a generous area to the right
+           crop_box = (
+               anchor_rect[2], # x0 (start at anchor right)
+               max(0, anchor_rect[1] - 5), # top
+               min(page.width, anchor_rect[2] + 400), # x1 (width of value ~400px)
+               min(page.height, anchor_rect[3] + 5) # bottom
+           )
+           
+           # Crop from the cached 300 DPI page image
+           im = session.crop_raster(page_index, crop_box)
+           if im is None: return None
+           
+           # OCR
+           text = self.ocr.image_to_string(im, config='--psm 7').strip() # PSM 7 = Single text line
+           return text
         except Exception as e:
             print(f"Zone OCR Failed: {e}")
             return None
+        finally:
+            if own_session is not None:
+                own_session.close()
             
-    def _find_text_spatially(self, data, keywords, search_direction='right', x_tolerance=50, y_tolerance=10, filepath=None):
+    def _find_text_spatially(self, data, keywords, search_direction='right', x_tolerance=50, y_tolerance=10, filepath=None, session=None):
         """
         Finds text spatially relative to a keyword.
         search_direction: 'right' (same line) or 'below' (next line)
         """
         pages = data.get("pages", [])
         if not pages: return None
-        
+        recorder = self._recorder(session)
+        recorder.count("spatial_searches")
+        with recorder.timer("spatial_search"):
+            return self._search_pages(pages, keywords, search_direction, x_tolerance, y_tolerance, filepath, session)
+
+    def _search_pages(self, pages, keywords, search_direction, x_tolerance, y_tolerance, filepath, session):
         # Stop words that indicate we hit another label
         STOP_WORDS = ["date", "policy", "number", "agent", "address", "phone", "fax", "email", "website", "www", "http", "page", "of", "produced", "by", "code"]
 
         # Iterate through EACH page independently
-        for page_data in pages:
+        for page_idx, page_data in enumerate(pages):
             words = page_data.get("words", [])
             if not words: continue
+            index = get_page_index(page_data)
 
             # ... anchor logic ...
             target_values = []
             
+            # Fuzzy hits of every anchor token on this page, scored in one batch and
+            # cached on the page for every keyword set and pass that follows
+            anchors = get_page_anchors(page_data, ANCHOR_TOKENS)
+
             for kw in keywords:
                 # Prepare kw tokens for matching
                 kw_tokens = kw.lower().split()
                 
-                for i, word in enumerate(words):
-                    # Optimized Fuzzy Match: 
-                    # 1. First Check first token strictly (speed) -> 'named' vs 'namcd'
-                    # Actually, for OCR errors, strict first token validation is bad.
-                    # But comparing every word to every keyword is slow. 
-                    # Let's do a quick length check?
+                # Each token fuzzy matched at threshold 80 ("Namcd" still matches "Named")
+                for i in anchors.phrase_starts(kw):
+                    matched_indices = list(range(i, i + len(kw_tokens)))
+                    # Found anchor
+                    last_word = words[matched_indices[-1]]
+                    anchor_right = last_word['x1']
+                    anchor_bottom = last_word['bottom']
+                    anchor_top = words[matched_indices[0]]['top']
+                    anchor_left = words[matched_indices[0]]['x0']
                     
-                    w_text = word['text'].lower().strip(":").strip()
-                    if not w_text: continue
-                    
-                    # Fuzzy match first token of keyword
-                    # Threshold 80 allows "Namcd" (83 vs Named)
-                    if fuzz.ratio(w_text, kw_tokens[0].strip(":")) < 80:
-                        continue
-                        
-                    # Potential Start Found. Check phrase.
-                    match = True
-                    matched_indices = [i]
+                    found_candidates = []
+                    found_indices = set()
                     
-                    for k in range(1, len(kw_tokens)):
-                        if i + k >= len(words):
-                            match = False
-                            break
-                        
-                        val_word = words[i+k]['text'].lower().strip(":").strip()
-                        val_kw = kw_tokens[k].strip(":")
+                    if search_direction == 'right':
+                         same_line_candidates = []
+                         # Relaxed Y-Overlap: word midpoint within the anchor's line band
+                         for j in index.in_mid_band(anchor_top - 5, anchor_bottom + 5):
+                            w = words[j]
+                            if w['text'].lower() in kw: continue # Skip self
+                            if i <= j < i + len(kw_tokens): continue # Skip self strictly
+
+                            if w['x0'] > anchor_right and (w['x0'] - anchor_right) < x_tolerance:
+                                same_line_candidates.append(w)
+                                found_indices.add(j)
+                         
+                         found_candidates.extend(same_line_candidates)
+                         
+                         # Check for wrap-around (multi-line value)
+                         if same_line_candidates:
+                             same_line_candidates.sort(key=lambda x: x['x0'])
+                             val_left = same_line_candidates[0]['x0']
+                             mask_bottom = max(w['bottom'] for w in same_line_candidates)
+                             
+                             # Look for words strictly below, aligned left
+                             # Y-Check: Next line (approx 10-20px gap)
+                             for j in index.in_top_band(mask_bottom - 2, mask_bottom + 20):
+                                 if j in found_indices: continue
+                                 w = words[j]
+                                 # X-Check: Aligned approx left or indented
+                                 # Allow starting slightly left or anywhere to right (continuation)
+                                 if w['x0'] > (val_left - 20):
+                                     found_candidates.append(w)
+                                        
+                    elif search_direction == 'below':
+                         # Stricter Alignment for "Below":
+                         # Value should not be significantly to the left of Key.
+                         # Value top should be below key bottom.
+                         for j in index.in_top_band(anchor_bottom - 2, anchor_bottom + y_tolerance):
+                            w = words[j]
+                            if w['text'].lower() in kw: continue
+                            if i <= j < i + len(kw_tokens): continue
+                            
+                            # Allow small float (-10) for slight misalignment, but not -50
+                            if w['x0'] >= (anchor_left - 10) and w['x0'] <= (anchor_right + 100):
+                                 found_candidates.append(w)
+
+                    if found_candidates:
+                        found_candidates.sort(key=lambda x: (x['top'], x['x0']))
                         
-                        # Fuzzy match each subsequent token
-                        if fuzz.ratio(val_word, val_kw) < 80:
-                            match = False
-                            break
+                        # Filter junk
+                        clean_words = []
+                        for w in found_candidates:
+                            text_clean = w['text'].strip()
+                            if text_clean.lower().strip(":") in STOP_WORDS:
+                                 break 
+                            clean_words.append(text_clean)
                         
-                        matched_indices.append(i+k)
-                    
-                    if match:
-                        # Found anchor
-                        last_word = words[matched_indices[-1]]
-                        anchor_right = last_word['x1']
-                        anchor_bottom = last_word['bottom']
-                        anchor_top = words[matched_indices[0]]['top']
-                        anchor_left = words[matched_indices[0]]['x0']
+                        val_text = " ".join(clean_words)
+                        if len(val_text) > 2:
+                            return val_text
                         
-                        found_candidates = []
+                    # Fallback: Zone OCR if filepath is provided and no candidates found but anchor exists
+                    if filepath and not found_candidates and search_direction == 'right':
+                        # Only do this for 'right' lookups for now as they are most common for "Anchor: Value"
+                        # Construct anchor rect
+                        anchor_rect = (anchor_left, anchor_top, anchor_right, anchor_bottom)
                         
-                        if search_direction == 'right':
-                             same_line_candidates = []
-                             for w in words:
-                                if w['text'].lower() in kw: continue # Skip self
-                                if i <= words.index(w) < i + len(kw_tokens): continue # Skip self strictly
-                                
-                                # Relaxed Y-Overlap
-                                w_mid = (w['top'] + w['bottom']) / 2
-                                if w_mid >= (anchor_top - 5) and w_mid <= (anchor_bottom + 5):
-                                    if w['x0'] > anchor_right and (w['x0'] - anchor_right) < x_tolerance:
-                                        same_line_candidates.append(w)
-                             
-                             found_candidates.extend(same_line_candidates)
-                             
-                             # Check for wrap-around (multi-line value)
-                             if same_line_candidates:
-                                 same_line_candidates.sort(key=lambda x: x['x0'])
-                                 val_left = same_line_candidates[0]['x0']
-                                 mask_bottom = max(w['bottom'] for w in same_line_candidates)
-                                 
-                                 # Look for words strictly below, aligned left
-                                 for w in words:
-                                     if w in found_candidates: continue
-                                     
-                                     # Y-Check: Next line (approx 10-20px gap)
-                                     if w['top'] > (mask_bottom - 2) and w['top'] < (mask_bottom + 20):
-                                         # X-Check: Aligned approx left or indented
-                                         # Allow starting slightly left or anywhere to right (continuation)
-                                         if w['x0'] > (val_left - 20):
-                                             found_candidates.append(w)
-                                            
-                        elif search_direction == 'below':
-                             for w in words:
-                                if w['text'].lower() in kw: continue
-                                if i <= words.index(w) < i + len(kw_tokens): continue
-                                
-                                # Stricter Alignment for "Below":
-                                # Value should not be significantly to the left of Key.
-                                # Value top should be below key bottom.
-                                if w['top'] > (anchor_bottom - 2) and (w['top'] - anchor_bottom) < y_tolerance:
-                                    # Allow small float (-10) for slight misalignment, but not -50
-                                    if w['x0'] >= (anchor_left - 10) and w['x0'] <= (anchor_right + 100):
-                                         found_candidates.append(w)
-
-                        if found_candidates:
-                            found_candidates.sort(key=lambda x: (x['top'], x['x0']))
-                            
-                            # Filter junk
-                            clean_words = []
-                            for w in found_candidates:
-                                text_clean = w['text'].strip()
-                                if text_clean.lower().strip(":") in STOP_WORDS:
-                                     break 
-                                clean_words.append(text_clean)
-                            
-                            val_text = " ".join(clean_words)
-                            if len(val_text) > 2:
-                                return val_text
-                            
-                        # Fallback: Zone OCR if filepath is provided and no candidates found but anchor exists
-                        if filepath and not found_candidates and search_direction == 'right':
-                            # Only do this for 'right' lookups for now as they are most common for "Anchor: Value"
-                            # Construct anchor rect
-                            anchor_rect = (anchor_left, anchor_top, anchor_right, anchor_bottom)
-                            # Which page?
-                            # We are iterating through pages, need index. 
-                            # Hack: data['pages'] list index implies page number if sequential.
-                            # Let's assume sequential.
-                            page_idx = data['pages'].index(page_data)
-                            
-                            ocr_text = self._perform_zone_ocr(filepath, page_idx, anchor_rect)
-                            if ocr_text and len(ocr_text) > 2:
-                                # Basic stopword check on OCR result
-                                if ocr_text.lower().split()[0] not in STOP_WORDS:
-                                    print(f"Zone OCR recovered: {ocr_text}")
-                                    return ocr_text
+                        ocr_text = self._perform_zone_ocr(filepath, page_idx, anchor_rect, session=session)
+                        if ocr_text and len(ocr_text) > 2:
+                            # Basic stopword check on OCR result
+                            if ocr_text.lower().split()[0] not in STOP_WORDS:
+                                print(f"Zone OCR recovered: {ocr_text}")
+                                return ocr_text
 
         return None
 
@@ -254,7 +597,7 @@ class PDFProcessor:
         """Helper to parse MM/DD/YYYY or similar into (M, D, Y) tuple."""
         # Normalize
         d = date_str.replace('-', '/').replace('.', '/').replace(',', '').replace(' ', '/')
-        parts = re.split(r'/', d)
+        parts = d.split('/')
         
         # Filter empty strings from split
         parts = [p for p in parts if p]
@@ -295,20 +638,10 @@ class PDFProcessor:
         where Month and Day are same, but Year is different.
         Returns the earlier date string if found.
         """
-        # Find ALL dates
-        # Using a broad pattern to catch everything
-        patterns = [
-            r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b',
-            r'\b((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4})\b'
-        ]
-        
-        candidates = []
-        for pat in patterns:
-            matches = re.findall(pat, text, re.IGNORECASE)
-            candidates.extend(matches)
-            
+        # Find ALL dates (numeric and text-month) in one scan
         parsed_dates = []
-        for c in candidates:
+        for m in TERM_DATE_RE.finditer(text):
+            c = m.group(m.lastgroup)
             p = self._parse_date_string(c)
             if p:
                 parsed_dates.append({"raw": c, "parsed": p})
@@ -382,7 +715,7 @@ class PDFProcessor:
                 return False
                 
         # Check for date-like characters
-        if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', name):
+        if DATE_LIKE_RE.search(name):
             return False
             
         return True
@@ -394,63 +727,35 @@ class PDFProcessor:
             name = name.split('(')[0]
             
         # Invalid chars: < > : " / \ | ? *
-        cleaned = re.sub(r'[<>:"/\\|?*]', '', name)
+        cleaned = INVALID_FILENAME_CHARS_RE.sub('', name)
         cleaned = cleaned.strip(" .,-_")
         return cleaned
 
 
 
-    def analyze_content(self, data, filepath=None):
+    def analyze_content(self, data, filepath=None, session=None):
         """Analyzes text to determine document type and extract metadata."""
+        if filepath and session is None:
+            # Opened lazily: only zone OCR actually touches the file
+            with self.new_session(filepath) as session:
+                return self._analyze_content(data, filepath, session)
+        return self._analyze_content(data, filepath, session)
+
+    def _analyze_content(self, data, filepath, session):
         text = data.get("full_text", "")
         text_lower = text.lower()
+        recorder = self._recorder(session)
         
-        metadata = {
-            "insured_name": "UnknownInsured",
-            "company_name": "UnknownCompany",
-            "date": "0000-00-00",
-            "policy_number": None,
-            "type_detail": "Doc"
-        }
-        
-        doc_type = DocumentType.UNKNOWN
+        metadata = dict(METADATA_DEFAULTS)
         
-        # 1. Determine Document Type
-        # Priority 1: Policy/Declaration (User Request: Check this FIRST)
-        policy_keywords = ["declaration", "deductible", "peril"]
-        policy_found = False
-        for kw in policy_keywords:
-            if kw in text_lower:
-                doc_type = DocumentType.POLICY
-                policy_found = True
-                break
-        
-        if "cancellation request" in text_lower or "policy release" in text_lower or "acord 35" in text_lower:
-             doc_type = DocumentType.CANCELLATION_REQUEST
-
-        elif "cme insurance brokerage inc" in text_lower and "agreement acknowledgement" in text_lower:
-             doc_type = DocumentType.CME_TERM
-
-        elif "driver license" in text_lower or "driver's license" in text_lower or "identification card" in text_lower:
-             doc_type = DocumentType.DRIVER_LICENSE
-        
-        elif not policy_found:
-            # Priority 2: Certificate
-            if "certificate of insurance" in text_lower or "acord" in text_lower:
-                doc_type = DocumentType.CERTIFICATE
-            # Priority 3: Invoice (Check this LAST)
-            elif "invoice" in text_lower or "bill" in text_lower or "due" in text_lower:
-                doc_type = DocumentType.INVOICE
-            
-            # Priority 4: Check
-            elif "pay to the order of" in text_lower or "check no." in text_lower:
-                 doc_type = DocumentType.CHECK
+        # 1. Determine Document Type (see CLASSIFIER_RULES for the priority order)
+        doc_type = self.classifier.classify(text_lower)
 
         # 2. Extract Metadata - HYBRID APPROACH (Regex Priority for Reliability)
         
         # Pre-process: Remove parenthesized content (User requirement: Brackets are not names)
         # e.g. "Wang (Owner)" -> "Wang "
-        cleaned_text = re.sub(r'\(.*?\)', ' ', text, flags=re.DOTALL)
+        cleaned_text = PARENS_RE.sub(' ', text)
 
         # --- Name Extraction for Checks (Special Rule) ---
         if doc_type == DocumentType.CHECK:
@@ -473,33 +778,14 @@ class PDFProcessor:
                  if self._is_valid_name(clean_l):
                      metadata["insured_name"] = clean_l.replace(' ', '_')
                      name_found = True # This prevents downstream logic from overwriting if we trust this
+                     recorder.note("name", "check_line")
                      break
 
         # --- Insured Name ---
         # Regex First (it handles "Name: Value" patterns well usually)
-        insured_patterns = [
-            # Explicit "Named Insured" is strongest signal
-            # Handle: "Item 1. Named Insured", "Named Insured(s)", "Named Insured:"
-            # Note: (?:...) is non-capturing group. parens in text need escaping if we mean literal parens.
-            # We want to match "Named Insured" or "Named Insured(s)" or "Named Insureds"
-            r'(?:Item\s*\d+\.?)?\s*Named\s*Insured(?:\(s\)|s)?\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Insured\s*Name(?:s)?\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Insured\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Account\s*Name\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Applicant\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Customer\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'(?:First\s*)?Named\s*Insured\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)', 
-            r'Policyholder\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            r'Entity\s*[:\.]?\s*([A-Za-z0-9\s,&.-]+)',
-            # Driver License Specific
-            r'\bLN\s*[:\.]?\s*([A-Za-z\s]+)', # LN Lastname
-            r'\b1\.\s*([A-Za-z\s,]+)', # 1. Name (Standard ID format)
-            r'\bName\s*[:\.]?\s*([A-Za-z\s,]+)' 
-        ]
-        
         name_found = False
-        for pat in insured_patterns:
-             m = re.search(pat, cleaned_text, re.IGNORECASE)
+        for pat in INSURED_PATTERNS:
+             m = pat.search(cleaned_text)
              if m:
                  # Capture group 1
                  raw_name = m.group(1)
@@ -509,12 +795,10 @@ class PDFProcessor:
                  clean = raw_name.split('\n')[0].strip()
                  
                  # Basic cleaner
-                 clean = re.sub(r'Page\s+\d+', '', clean, flags=re.IGNORECASE)
-                 clean = re.sub(r'Policy\s+No.*', '', clean, flags=re.IGNORECASE)
-                 clean = re.sub(r'Applicant.*', '', clean, flags=re.IGNORECASE)
-                 clean = re.sub(r'Producer.*', '', clean, flags=re.IGNORECASE)
+                 for noise in NAME_CLEANUP_PATTERNS:
+                     clean = noise.sub('', clean)
                  # Collapse multiple spaces
-                 clean = re.sub(r'\s+', ' ', clean)
+                 clean = WHITESPACE_RE.sub(' ', clean)
                  # Remove trailing punctuation often captured
                  clean = clean.strip(".,-:")
                  # Remove internal commas for cleaner filename
@@ -523,50 +807,57 @@ class PDFProcessor:
                  if self._is_valid_name(clean):
                      metadata["insured_name"] = self._sanitize_name(clean).replace(' ', '_')
                      name_found = True
+                     recorder.note("name", "regex")
                      break
         
         # If Regex failed, or result looks suspicious (short), try Spatial
         if not name_found:
              # Strategy: Keys with colons usually imply Right. Keys without usually imply Below.
-             colon_keys = ["named insured:", "insured name:", "insured:", "applicant:", "customer:", "policyholder:", "entity:", "client:"]
-             no_colon_keys = ["named insured", "insured name", "policyholder"]
+             colon_keys = NAME_COLON_KEYS
+             no_colon_keys = NAME_NO_COLON_KEYS
              
              spat_name = None
              
              # 1. Try Colon Keys -> Right (Standard Form)
-             spat_name = self._find_text_spatially(data, colon_keys, 'right', x_tolerance=300, filepath=filepath)
+             spat_name = self._find_text_spatially(data, colon_keys, 'right', x_tolerance=300, filepath=filepath, session=session)
              
              # 2. Try No Colon Keys -> Below (Header Style)
              if not spat_name:
-                 spat_name = self._find_text_spatially(data, no_colon_keys, 'below', y_tolerance=25, filepath=filepath)
+                 spat_name = self._find_text_spatially(data, no_colon_keys, 'below', y_tolerance=25, filepath=filepath, session=session)
              
              # 3. Fallbacks (Colon -> Below, NoColon -> Right)
              if not spat_name:
-                 spat_name = self._find_text_spatially(data, colon_keys, 'below', y_tolerance=25, filepath=filepath)
+                 spat_name = self._find_text_spatially(data, colon_keys, 'below', y_tolerance=25, filepath=filepath, session=session)
              if not spat_name:
-                 spat_name = self._find_text_spatially(data, no_colon_keys, 'right', x_tolerance=300, filepath=filepath)
+                 spat_name = self._find_text_spatially(data, no_colon_keys, 'right', x_tolerance=300, filepath=filepath, session=session)
                  
              if spat_name:
                 # Clean parens from spatial result too
                 # e.g. "(Owner) Wang" -> " Wang"
-                spat_name_clean = re.sub(r'\(.*?\)', ' ', spat_name, flags=re.DOTALL)
+                spat_name_clean = PARENS_RE.sub(' ', spat_name)
                 cleaned_spat = spat_name_clean.split('\n')[0].strip()
                 # print(f"DEBUG: Cleaned Spatial Name: '{cleaned_spat}'")
                 if self._is_valid_name(cleaned_spat):
                     metadata["insured_name"] = self._sanitize_name(cleaned_spat).replace(' ', '_')
                     name_found = True
+                    recorder.note("name", "spatial")
 
         # 4. Final Fallback: Surname Matching using CLEANED TEXT
         if not name_found and self.surname_matcher:
             # Use 'cleaned_text' which has no parens content
-            candidates = self.surname_matcher.find_potential_names(cleaned_text)
+            with recorder.timer("surname_match"):
+                candidates = self.surname_matcher.find_potential_names(cleaned_text)
             
             for candidate in candidates:
                 if self._is_valid_name(candidate):
                     metadata["insured_name"] = self._sanitize_name(candidate).replace(' ', '_')
                     name_found = True
+                    recorder.note("name", "surname")
                     break # Take first high-quality candidate
 
+        if metadata["insured_name"] == METADATA_DEFAULTS["insured_name"]:
+            recorder.note("name", "none")
+
 
 
 
@@ -577,88 +868,53 @@ class PDFProcessor:
         # 1. Term Match Logic (Highest Priority) - User Request
         # "Start date has a corresponding End date with same Month/Day but diff Year"
         term_date = self._find_date_by_term_logic(text)
+        date_strategy = "term"
         if term_date:
             found_date = term_date
             
         if not found_date:
             # 2. Regex with specific Keywords
-            date_patterns = [
-                # High Priority: Explicit Labels mentioned by user
-                r'(?:Effective|Issue|Policy)\s*(?:Date)?[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',  # Effective Date: 01/30/2025
-                r'(?:Period|From)[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{4})',                        # Period: 01/30/2025 or From: 01/30/2025
-                
-                # Secondary
-                r'Date of Issue:?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'Policy Period:?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'(?:Effective|Issue|Policy)?\s*Date:?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}',
-                r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})', # Fallback
-                # DL Specific
-                r'(?:Exp|Expires|Exp Date)\s*[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-                r'(?:Iss|Issued|Iss Date)\s*[:\.]?\s*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'
-            ]
-            
-            # Try Regex
-            for pat in date_patterns:
-                dm = re.search(pat, text, re.IGNORECASE)
-                if dm:
-                    val = dm.group(0)
-                    if len(dm.groups()) > 0 and dm.group(1): val = dm.group(1)
-                    found_date = val
-                    break
+            found_date = _match_date(text)
+            date_strategy = "regex"
             
             # 3. Spatial
             if not found_date:
-                date_keys = ["effective date", "policy period", "period:", "date of issue", "invoice date"]
-                spat_date = self._find_text_spatially(data, date_keys, 'right', x_tolerance=200)
+                spat_date = self._find_text_spatially(data, DATE_KEYS, 'right', x_tolerance=200, session=session)
+                date_strategy = "spatial"
                 if spat_date:
-                     for pat in date_patterns: # Re-use date patterns for spatial text
-                        dm = re.search(pat, spat_date, re.IGNORECASE)
-                        if dm:
-                            val = dm.group(0)
-                            if len(dm.groups()) > 0 and dm.group(1): val = dm.group(1)
-                            found_date = val
-                            break
+                     found_date = _match_date(spat_date) # Re-use date patterns for spatial text
                         
         if found_date:
              found_date = found_date.replace('/', '-').replace(',', '').replace('.', '')
              metadata["date"] = found_date.replace(' ', '-')
+             recorder.note("date", date_strategy)
         elif doc_type == DocumentType.CHECK or doc_type == DocumentType.CME_TERM:
              # User Request: If Check or CME Term and no date found, use today's date
              metadata["date"] = datetime.now().strftime("%m-%d-%Y")
+             recorder.note("date", "today")
+        else:
+             recorder.note("date", "none")
 
         # --- Company ---
         # Known list is best
-        known_companies = [
-            "Geico", "State Farm", "Allstate", "Liberty Mutual", "Progressive", "Chubb", 
-            "Travelers", "MIC", "Integon", "Guard", "Hyundai", "Nationwide", "Farmers", 
-            "USAA", "The Hartford", "Berkshire Hathaway", "MetLife", "CNA", "Amica", 
-            "Erie", "Auto-Owners", "Zurich", "AIG", "Markel", "Hiscox", "Hartford",
-            "Philadelphia", "Starr", "Lloyds", "Scottsdale"
-        ]
-        
-        company_found = False
-        company_found = False
-        
         # Fuzzy Matching for known companies
         # Threshold 85 seems reasonable for "The Hartford" vs "The Hartford Ins"
-        best_match, score = process.extractOne(text_lower, [c.lower() for c in known_companies], scorer=fuzz.partial_ratio)
-        
-        if score > 85:
-            # Find the original case
-            for c in known_companies:
-                if c.lower() == best_match:
-                    metadata["company_name"] = c
-                    company_found = True
-                    break
+        with recorder.timer("company_match"):
+            company, score = self.company_matcher.match(text_lower)
+        company_found = company is not None
+        if company_found:
+            metadata["company_name"] = company
+            recorder.note("company", "known")
         
         if not company_found:
+             recorder.note("company", "none")
              # Fallback Regex
-             m = re.search(r'(?:Underwritten by|Company|Insurer|Producer):\s*([A-Za-z\s,.]+)', text, re.IGNORECASE)
+             m = COMPANY_FALLBACK_RE.search(text)
              if m:
                  cand = m.group(1).split(',')[0].strip().rstrip('.')
                  if len(cand) > 3:
                     metadata["company_name"] = cand.replace(' ', '_')
+                    recorder.note("company", "fallback")
          
 
 
@@ -706,20 +962,120 @@ class PDFProcessor:
         return new_name
 
     def rename_file(self, filepath, new_name):
-        """Renames the file."""
-        directory = os.path.dirname(filepath)
-        new_path = os.path.join(directory, new_name)
-        
-        # Avoid overwriting
-        if os.path.exists(new_path):
-            base, extension = os.path.splitext(new_name)
-            counter = 1
-            while os.path.exists(new_path):
-                new_path = os.path.join(directory, f"{base}_{counter}{extension}")
-                counter += 1
-                
+        """Renames the file, adding _1, _2, ... instead of overwriting (see bulk_renamer)."""
         try:
-            os.rename(filepath, new_path)
-            return new_path
+            return self.renamer.rename(filepath, new_name)
         except OSError as e:
             return f"Error: {e}"
+
+    @staticmethod
+    def new_result(filepath):
+        """Empty process_document() result; status is already "skipped" for non-PDFs."""
+        return {
+            "path": filepath,
+            "status": None if filepath.lower().endswith(".pdf") else "skipped",
+            "doc_type": None,
+            "metadata": None,
+            "new_name": None,
+            "new_path": None,
+            "error": None,
+            "pages_read": 0,
+            "truncated": False,
+            "stats": {},
+            "timings": {},
+            "profile": None,
+        }
+
+    def plan_name(self, result, doc_type, metadata, rename):
+        """Fills in type, metadata and new name; returns True if the file still has to be renamed."""
+        filepath = result["path"]
+        result["doc_type"] = doc_type.name
+        result["metadata"] = metadata
+        new_name = self.generate_new_name(filepath, doc_type, metadata)
+        result["new_name"] = new_name
+        if new_name == os.path.basename(filepath):
+            result["status"] = "unchanged"
+        elif not rename:
+            result["status"] = "planned"
+        else:
+            return True
+        return False
+
+    def apply_rename(self, result):
+        new_path = self.rename_file(result["path"], result["new_name"])
+        if "Error" in str(new_path):
+            result["status"] = "error"
+            result["error"] = new_path
+        else:
+            result["status"] = "renamed"
+            result["new_path"] = new_path
+
+    def process_document(self, filepath, rename=True):
+        """
+        Runs extract -> analyze -> name -> rename for a single file.
+        Returns a plain dict so results can cross process boundaries.
+        status: skipped | no_text | renamed | unchanged | planned | error
+        timings: seconds spent in extract, analyze (0 with lazy_pages, where
+        it is part of extract), rename and total
+        profile: with profile=True, this document's counters, sub-stage
+        timings and winning strategies (see instrumentation); else None
+        truncated: True when the memory ceiling stopped reading pages early
+        (so "no_text" may just mean nothing was read)
+        """
+        result = self.new_result(filepath)
+        if result["status"] == "skipped":
+            return result
+
+        self.stats["documents"] += 1
+        before = self.stats.copy()
+        timings = result["timings"] = {"extract": 0.0, "analyze": 0.0, "rename": 0.0, "total": 0.0}
+        start = time.perf_counter()
+        session = self.new_session(filepath)
+
+        try:
+            # One open handle and one raster per page for extraction and zone OCR.
+            # Closed before renaming (Windows will not rename an open file).
+            with session:
+                if self.lazy_pages:
+                    data, doc_type, metadata = self.extract_and_analyze(filepath, session)
+                    timings["extract"] = time.perf_counter() - start
+                else:
+                    data = self.extract_data(filepath, session)
+                    timings["extract"] = time.perf_counter() - start
+                    if data.get("full_text"):
+                        doc_type, metadata = self.analyze_content(data, filepath, session)
+                        timings["analyze"] = time.perf_counter() - start - timings["extract"]
+                result["pages_read"] = len(data.get("pages", []))
+                if not data.get("full_text"):
+                    result["status"] = "no_text"
+                    return result
+
+            if self.plan_name(result, doc_type, metadata, rename):
+                rename_start = time.perf_counter()
+                self.apply_rename(result)
+                timings["rename"] = time.perf_counter() - rename_start
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"Error: {e}"
+        finally:
+            result["stats"] = {
+                "spatial_searches": self.stats["spatial_searches"] - before["spatial_searches"],
+                "word_extractions": self.stats["word_extractions"] - before["word_extractions"],
+            }
+            timings["total"] = time.perf_counter() - start
+            result["profile"] = session.recorder.profile()
+            result["truncated"] = session.truncated
+            if self.memory_budget is not None and self.memory_budget.exceeded():
+                # Workers live for the whole batch; hand this document's memory back
+                self.memory_budget.release()
+        return result
+
+    def process_batch(self, paths, workers=None, rename=True, cancel_event=None):
+        """
+        Processes many files on a pool of worker processes.
+        Yields process_document() results in completion order.
+        """
+        from batch_engine import BatchEngine
+
+        with BatchEngine(workers=workers, processor_options=self.worker_options()) as engine:
+            yield from engine.process(paths, rename=rename, cancel_event=cancel_event)
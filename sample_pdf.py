@@ -0,0 +1,122 @@
+"""
+Tiny text-layer PDF writer used by tests and benchmarks.
+
+Writes standard PDF 1.4 files with Helvetica text so pdfplumber can read
+them back without any extra dependency.
+"""
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(filepath, pages, width=612, height=792, font_size=11):
+    """
+    Writes a PDF where each page is a list of lines.
+    A line is either a plain string (stacked from the top-left) or an
+    (x, top, text) tuple using pdfplumber-style coordinates (top from page top).
+    """
+    objects = []  # Raw object bodies, object number = index + 1
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)  # Filled in once the page tree exists
+    pages_id = add(None)
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    page_ids = []
+    for lines in pages:
+        ops = ["BT", f"/F1 {font_size} Tf"]
+        cursor = 72
+        for line in lines:
+            if isinstance(line, tuple):
+                x, top, text = line
+            else:
+                x, top, text = 72, cursor, line
+                cursor += font_size * 1.6
+            # PDF origin is bottom-left; baseline sits one font size below 'top'
+            y = height - top - font_size
+            ops.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm ({_escape(text)}) Tj")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("cp1252", errors="replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {width} {height}] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        ))
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+
+    xref_pos = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_pos)
+
+    with open(filepath, "wb") as f:
+        f.write(out)
+    return filepath
+
+
+def write_scanned_pdf(filepath, num_pages, dpi=200, width=612, height=792, seed=1):
+    """
+    Writes an image-only PDF, like a scanner's: every page shows one
+    full-page grayscale image (shared by all pages, so even a few hundred
+    pages stay small on disk) and has no text layer.
+    """
+    import random
+    import zlib
+
+    px_w, px_h = width * dpi // 72, height * dpi // 72
+    rng = random.Random(seed)
+    # Light speckle on white, so the image does not compress to nothing
+    row = bytes(255 - rng.randrange(0, 40) if rng.random() < 0.05 else 255 for _ in range(px_w))
+    pixels = zlib.compress(row * px_h)
+
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(None)
+    pages_id = add(None)
+    image_id = add(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                   b"/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % (px_w, px_h, len(pixels))
+                   + pixels + b"\nendstream")
+    content = f"q {width} 0 0 {height} 0 0 cm /Im1 Do Q".encode()
+    content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    page_ids = [add(
+        f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {width} {height}] "
+        f"/Resources << /XObject << /Im1 {image_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+    ) for _ in range(num_pages)]
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode()
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref_pos = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_pos)
+    with open(filepath, "wb") as f:
+        f.write(out)
+    return filepath
@@ -0,0 +1,273 @@
+"""
+Splits a merged scan batch (one PDF holding many documents, as the front
+office's scanner produces) into one renamed PDF per document, in a single
+streaming pass:
+
+    splitter = ScanSplitter()
+    for part in splitter.split("batch.pdf", output_dir="out"):
+        print(part["pages"], part["reason"], part["new_path"])
+
+Pages are read one at a time from a bounded DocumentSession. Scanned pages
+go to the OCR pool while the following pages are extracted; at most
+`window` page images are in flight, and results are consumed in page
+order. BoundaryDetector decides, page by page, whether a page starts a new
+document:
+
+    page_marker   "Page 1 of N" (a "Page 2 of N" page, or any page still
+                  inside a declared N, is never a boundary)
+    type_change   a document title in the page's first lines (HEADING_RULES,
+                  e.g. "Invoice", "Certificate of Insurance") names another
+                  type than the current document's. The classifier's own
+                  keywords ("due", "bill", "acord") are too loose for a
+                  single page: a policy page mentioning the premium due is
+                  still the policy
+    new_insured   a "Named Insured:" (etc.) line naming someone else
+
+Each document is written out (pypdfium2 import_pages, no re-rendering) as
+soon as the next one starts. It is then named from its first MAX_PAGES
+pages, as process_document would name a single file, and moved into
+place by a BulkRenamer. With a RenameJournal each output is journaled as a
+created file, so undo_journal() removes it. Only those first pages' text
+is kept per document, so memory does not grow with the length of the
+batch. The source file is left untouched.
+"""
+import collections
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import lazy_imports
+from bulk_renamer import BulkRenamer
+from document_classifier import DocumentClassifier, KeywordRule
+from renamer_logic import MAX_PAGES, METADATA_DEFAULTS, DocumentType, PDFProcessor, _join_text
+
+__getattr__ = _lazy = lazy_imports.deferred(globals(), pypdfium2="pypdfium2")
+
+PAGE_OF_RE = re.compile(r'\bpage\s*(\d{1,4})\s*(?:of|/)\s*(\d{1,4})\b', re.IGNORECASE)
+# First line after an insured-name label, e.g. "Named Insured: John Doe"
+INSURED_ANCHOR_RE = re.compile(
+    r'(?:named\s*insured(?:\(s\))?|insured\s*name|policyholder|applicant)\s*[:.]\s*([^\n]+)', re.IGNORECASE)
+
+# Titles that start a document, looked for in its first HEADING_LINES lines only
+HEADING_RULES = [
+    KeywordRule(DocumentType.CANCELLATION_REQUEST, ["cancellation request", "policy release"]),
+    KeywordRule(DocumentType.CME_TERM, ["agreement acknowledgement"]),
+    KeywordRule(DocumentType.DRIVER_LICENSE, ["driver license", "driver's license", "identification card"]),
+    KeywordRule(DocumentType.POLICY, ["declaration"]),
+    KeywordRule(DocumentType.CERTIFICATE, ["certificate of insurance", "certificate of liability insurance"]),
+    KeywordRule(DocumentType.INVOICE, ["invoice", "billing statement", "premium notice"]),
+    KeywordRule(DocumentType.CHECK, ["pay to the order of"]),
+]
+HEADING_LINES = 3
+
+
+def _insured_key(text):
+    """Normalized name after the first insured-name anchor on the page, or None."""
+    m = INSURED_ANCHOR_RE.search(text)
+    if not m:
+        return None
+    words = re.sub(r'[^a-z ]', ' ', m.group(1).lower()).split()
+    return " ".join(words[:3]) or None
+
+
+class BoundaryDetector:
+    """Feed it every page's text in order; start_reason() says whether that page starts a document."""
+
+    def __init__(self, classifier, unknown=DocumentType.UNKNOWN):
+        self.classifier = classifier
+        self.headings = DocumentClassifier(HEADING_RULES, None)
+        self.unknown = unknown
+        self._reset()
+
+    def heading_type(self, text):
+        """DocumentType named by a title in the page's first lines, or None."""
+        top = [line for line in text.lower().splitlines() if line.strip()][:HEADING_LINES]
+        return self.headings.classify("\n".join(top))
+
+    def _reset(self):
+        self.pages = 0
+        self.expected = None
+        self.doc_type = None
+        self.insured = None
+
+    def start_reason(self, text):
+        """"first" | "page_marker" | "type_change" | "new_insured", or None when the page continues the document."""
+        marker = PAGE_OF_RE.search(text)
+        page_number = int(marker.group(1)) if marker else None
+        heading_type = self.heading_type(text)
+        page_type = self.classifier.classify(text.lower())
+        if page_type == self.unknown:
+            page_type = None
+        insured = _insured_key(text)
+
+        if self.pages == 0:
+            reason = "first"
+        elif page_number == 1:
+            reason = "page_marker"
+        elif page_number is not None or (self.expected and self.pages < self.expected):
+            reason = None
+        elif heading_type and self.doc_type and heading_type != self.doc_type:
+            reason = "type_change"
+        elif insured and self.insured and insured != self.insured:
+            reason = "new_insured"
+        else:
+            reason = None
+
+        if reason:
+            self._reset()
+        self.pages += 1
+        if page_number == 1:
+            self.expected = int(marker.group(2))
+        # A title says what the document is better than keywords anywhere on its first pages
+        self.doc_type = self.doc_type or heading_type or page_type
+        self.insured = self.insured or insured
+        return reason
+
+
+class _Part:
+    """One detected document: its page indices and the pages it is named from."""
+
+    def __init__(self, number, first_page, reason):
+        self.number = number
+        self.reason = reason
+        self.indices = [first_page]
+        self.pages = []
+
+
+class ScanSplitter:
+    def __init__(self, processor=None, window=None, journal=None):
+        # Bounded, so extracted pages drop their pdfplumber caches right away
+        self.processor = processor or PDFProcessor(bounded_memory=True)
+        # Scanned pages OCR'd ahead of the one being consumed
+        self.window = window or getattr(self.processor.ocr, "pool_size", 1)
+        # Optional RenameJournal; outputs are recorded as created, not as renames of the temporary file
+        self.journal = journal
+        self.renamer = BulkRenamer()
+
+    def _ocr(self, index, image):
+        try:
+            return self.processor.ocr.image_to_string(image)
+        except Exception as e:
+            print(f"OCR Failed for page {index}: {e}")
+            return None
+        finally:
+            image.close()
+
+    def iter_pages(self, filepath, session):
+        """Yields (index, page dict) in page order; at most `window` pages (and so page images) are pending."""
+        processor = self.processor
+        recorder = processor._recorder(session)
+        budget = processor.memory_budget
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.window, thread_name_prefix="split-ocr") as pool:
+            for i in range(session.page_count):
+                # Hand out finished pages; a full window waits for the oldest
+                while pending and (len(pending) >= self.window or pending[0][2] is None or pending[0][2].done()):
+                    yield self._finish(*pending.popleft())
+                if budget is not None and budget.exceeded():
+                    # Never stops early: a skipped page would be missing from the output
+                    budget.release(session.release)
+                p_data = processor.extract_page(filepath, session, i)
+                future = None
+                if processor.needs_ocr(p_data):
+                    recorder.count("pages_ocr")
+                    future = pool.submit(self._ocr, i, session.render(i))
+                pending.append((i, p_data, future))
+            while pending:
+                yield self._finish(*pending.popleft())
+
+    @staticmethod
+    def _finish(index, p_data, future):
+        if future is not None:
+            text = future.result()
+            if text is not None:
+                p_data["text"] = text
+        return index, p_data
+
+    def iter_parts(self, filepath, session):
+        """Yields each detected document (_Part) once its last page has been read."""
+        detector = BoundaryDetector(self.processor.classifier)
+        part = None
+        for index, p_data in self.iter_pages(filepath, session):
+            reason = detector.start_reason(p_data["text"])
+            if reason:
+                if part is not None:
+                    yield part
+                part = _Part(part.number + 1 if part else 1, index, reason)
+            else:
+                part.indices.append(index)
+            if len(part.pages) < MAX_PAGES:
+                part.pages.append(p_data)
+        if part is not None:
+            yield part
+
+    def split(self, filepath, output_dir=None, write=True):
+        """
+        Yields one dict per detected document as soon as it is done:
+        source, part, pages ([first, last], 1-based), reason, doc_type,
+        metadata, new_name, new_path, status (written | planned | error),
+        error. write=False only plans the names.
+        """
+        processor = self.processor
+        output_dir = output_dir or os.path.dirname(os.path.abspath(filepath))
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        source = None
+        with processor.new_session(filepath, max_pages=None) as session:
+            try:
+                for part in self.iter_parts(filepath, session):
+                    result = self._describe(filepath, stem, part, session)
+                    if write and result["status"] is None:
+                        if source is None:
+                            os.makedirs(output_dir, exist_ok=True)
+                            source = _lazy("pypdfium2").PdfDocument(filepath)
+                        self._write(source, part, output_dir, result)
+                        if self.journal is not None and result["status"] == "written":
+                            self.journal.record_created(result["new_path"], source=filepath)
+                    elif result["status"] is None:
+                        result["status"] = "planned"
+                    yield result
+            finally:
+                if source is not None:
+                    source.close()
+
+    def _describe(self, filepath, stem, part, session):
+        data = {"full_text": _join_text(part.pages), "pages": part.pages}
+        result = {
+            "source": filepath, "part": part.number,
+            "pages": [part.indices[0] + 1, part.indices[-1] + 1], "reason": part.reason,
+            "doc_type": None, "metadata": None, "new_name": None, "new_path": None,
+            "status": None, "error": None,
+        }
+        try:
+            if data["full_text"].strip():
+                # No filepath: zone OCR would index pages of the whole batch, not of this part
+                doc_type, metadata = self.processor.analyze_content(data, None, session)
+            else:
+                doc_type, metadata = DocumentType.UNKNOWN, dict(METADATA_DEFAULTS)
+            result["doc_type"] = doc_type.name
+            result["metadata"] = metadata
+            result["new_name"] = self.processor.generate_new_name(f"{stem}_part{part.number:03d}.pdf", doc_type, metadata)
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"Error: {e}"
+        return result
+
+    def _write(self, source, part, output_dir, result):
+        pdfium = _lazy("pypdfium2")
+        fd, tmp_path = tempfile.mkstemp(prefix=".split-", suffix=".pdf", dir=output_dir)
+        os.close(fd)
+        try:
+            doc = pdfium.PdfDocument.new()
+            try:
+                doc.import_pages(source, pages=part.indices)
+                doc.save(tmp_path)
+            finally:
+                doc.close()
+            result["new_path"] = self.renamer.rename(tmp_path, result["new_name"])
+            result["status"] = "written"
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            result["status"] = "error"
+            result["error"] = f"Error: {e}"
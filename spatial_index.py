@@ -0,0 +1,40 @@
+from bisect import bisect_left, bisect_right
+
+
+class PageWordIndex:
+    """
+    Sorted views over a page's word list so the "same line" and "next line"
+    lookups in _find_text_spatially become bisect range queries instead of
+    full scans. Queries return word indices in original reading order.
+    """
+
+    def __init__(self, words):
+        self.words = words
+
+        mids = [(w['top'] + w['bottom']) / 2 for w in words]
+        self._mid_order = sorted(range(len(words)), key=mids.__getitem__)
+        self._mid_keys = [mids[i] for i in self._mid_order]
+
+        self._top_order = sorted(range(len(words)), key=lambda i: words[i]['top'])
+        self._top_keys = [words[i]['top'] for i in self._top_order]
+
+    def in_mid_band(self, low, high):
+        """Indices of words whose vertical midpoint is within [low, high]."""
+        start = bisect_left(self._mid_keys, low)
+        end = bisect_right(self._mid_keys, high)
+        return sorted(self._mid_order[start:end])
+
+    def in_top_band(self, low, high):
+        """Indices of words whose top is strictly between low and high."""
+        start = bisect_right(self._top_keys, low)
+        end = bisect_left(self._top_keys, high)
+        return sorted(self._top_order[start:end])
+
+
+def get_page_index(page_data):
+    """Returns the page's word index, building it on first use."""
+    index = page_data.get("word_index")
+    if index is None or index.words is not page_data.get("words"):
+        index = PageWordIndex(page_data.get("words", []))
+        page_data["word_index"] = index
+    return index
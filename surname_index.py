@@ -0,0 +1,131 @@
+"""
+Compiled surname index: the lowercased pinyin variants from
+chinese_surnames_detailed.json as a flat, sorted string table that
+SurnameMatcher memory-maps instead of parsing the JSON. The file is opened
+read-only, so worker processes share the same pages.
+
+Layout (little-endian):
+
+    magic      8 bytes  b"PDFRSNX\\0"
+    version    u32
+    count      u32      number of strings
+    source     32 bytes sha256 of the JSON the index was built from, line
+                        endings normalized to LF (a CRLF checkout matches)
+    offsets    (count + 1) x u32, into the string table
+    strings    UTF-8, sorted bytewise, no separators
+
+parse_surnames.py writes it next to the JSON; open_index() refuses an index
+whose source hash no longer matches the JSON, and the matcher falls back to
+the JSON.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"PDFRSNX\0"
+VERSION = 1
+HEADER = struct.Struct("<8sII32s")
+OFFSET = struct.Struct("<I")
+
+
+def index_path_for(json_path):
+    return os.path.splitext(json_path)[0] + ".idx"
+
+
+def file_hash(path):
+    """sha256 of the file with CRLF line endings read as LF."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read().replace(b"\r\n", b"\n")).digest()
+
+
+def write_index(json_path, index_path=None):
+    """Builds the index for json_path; returns the number of strings written."""
+    index_path = index_path or index_path_for(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    strings = sorted({p.lower().encode('utf-8') for entry in entries for p in entry.get('pinyin', [])})
+
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(strings), file_hash(json_path)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(strings))
+    # Readers never see a half-written index
+    os.replace(tmp_path, index_path)
+    return len(strings)
+
+
+class SurnameIndex:
+    """A read-only, memory-mapped sorted string table; supports `in`, len() and iteration."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mm) < HEADER.size:
+                raise ValueError("truncated surname index")
+            magic, version, self._count, self.source_hash = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a version {VERSION} surname index")
+            self._offsets = HEADER.size
+            self._strings = self._offsets + (self._count + 1) * OFFSET.size
+            if len(self._mm) < self._strings or len(self._mm) != self._strings + self._offset(self._count):
+                raise ValueError("truncated surname index")
+        except ValueError:
+            self._mm.close()
+            raise
+
+    def _offset(self, i):
+        return OFFSET.unpack_from(self._mm, self._offsets + i * OFFSET.size)[0]
+
+    def _get(self, i):
+        start = self._strings + self._offset(i)
+        end = self._strings + self._offset(i + 1)
+        return self._mm[start:end]
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        key = word.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self._count and self._get(lo) == key
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._get(i).decode('utf-8')
+
+    def close(self):
+        self._mm.close()
+
+
+def open_index(json_path, index_path=None):
+    """
+    The SurnameIndex for json_path, or None when there is no usable index
+    (missing, corrupt, wrong version, or built from a different JSON).
+    """
+    index_path = index_path or index_path_for(json_path)
+    if not os.path.exists(index_path):
+        return None
+    try:
+        index = SurnameIndex(index_path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring surname index: {e}")
+        return None
+    # A frozen build may ship the index alone
+    if os.path.exists(json_path) and file_hash(json_path) != index.source_hash:
+        index.close()
+        return None
+    return index
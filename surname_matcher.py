@@ -1,15 +1,40 @@
 import json
 import os
 
+import surname_index
+
+# Capitalized words that are never part of a name
+STOPWORDS = frozenset({
+    "the", "is", "for", "by", "of", "and", "to", "in", "on", "at",
+    "customer", "insured", "name", "policy", "number", "agent", "date",
+    "page", "total", "amount", "due", "paid", "payment", "from", "bill",
+    "effective", "coverage", "insurance", "premium", "declaration", "certificate",
+    "endorsement", "period", "issue", "issued", "producer", "agency", "company",
+
+    "description", "item", "location", "check", "cancelled"
+})
+
+
+def clean_token(token):
+    t = token.strip("()\"',-:")
+    if not t: return None
+    if t.endswith('.') and len(t) == 2 and t[0].isalpha(): return t # Initial
+    return t.strip(".")
+
+
+def is_alpha_or_initial(w):
+    if w.endswith('.'): return w[:-1].isalpha()
+    return w.isalpha()
+
+
 class SurnameMatcher:
-    def __init__(self, json_path):
-        self.surnames = []
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                self.surnames = json.load(f)
-        except Exception as e:
-            print(f"Error loading surnames: {e}")
-            
+    def __init__(self, json_path, index_path=None):
+        self.json_path = json_path
+        self._surnames = None
+        # The compiled index (see parse_surnames.py) when it is current,
+        # otherwise the JSON is parsed
+        self.index = surname_index.open_index(json_path, index_path)
+
         # Hardcoded set of valid pinyin syllables (without tones)
         # This list covers standard Mandarin pinyin.
         self.pinyin_syllables = {
@@ -38,120 +63,108 @@ class SurnameMatcher:
             "za", "zai", "zan", "zang", "zao", "ze", "zei", "zen", "zeng", "zha", "zhai", "zhan", "zhang", "zhao", "zhe", "zhei", "zhen", "zheng", "zhi", "zhong", "zhou", "zhu", "zhua", "zhuai", "zhuan", "zhuang", "zhui", "zhun", "zhuo", "zi", "zong", "zou", "zu", "zuan", "zui", "zun", "zuo"
         }
 
+        if self.index is not None:
+            self.surname_pinyins = self.index
+        else:
+            # Flatten Pinyin/Surname list once; every lookup below is a set hit
+            self.surname_pinyins = set()
+            for entry in self.surnames:
+                for p in entry.get('pinyin', []):
+                    self.surname_pinyins.add(p.lower())
+
+    @property
+    def surnames(self):
+        """The full surname entries from the JSON, parsed on first use."""
+        if self._surnames is None:
+            self._surnames = []
+            try:
+                with open(self.json_path, 'r', encoding='utf-8') as f:
+                    self._surnames = json.load(f)
+            except Exception as e:
+                print(f"Error loading surnames: {e}")
+        return self._surnames
+
     def _is_pinyin(self, word):
         """Checks if a word is a likely Pinyin syllable."""
         return word.lower() in self.pinyin_syllables
 
+    def _tokenize(self, text):
+        """
+        Cleans and classifies every whitespace token once. Each entry is
+        (word, capitalized, stopword, surname, pinyin, initial), or None for
+        tokens that can't be part of a name.
+        """
+        # Documents repeat most of their words, so each distinct token is
+        # classified once
+        seen = {}
+        tokens = []
+        for raw in text.split():
+            if raw not in seen:
+                seen[raw] = self._classify_token(raw)
+            tokens.append(seen[raw])
+        return tokens
+
+    def _classify_token(self, raw):
+        w = clean_token(raw)
+        if not w or not is_alpha_or_initial(w):
+            return None
+        w_lower = w.lower().strip('.')
+        return (
+            w,
+            w[0].isupper(),
+            w_lower in STOPWORDS,
+            w_lower in self.surname_pinyins,
+            w_lower in self.pinyin_syllables,
+            # A single letter here is always alphabetic
+            w.endswith('.') or len(w) == 1,
+        )
+
     def find_potential_names(self, text):
         candidates = []
-        text_tokens = text.split()
-        
-        # Flatten Pinyin/Surname list
-        surname_pinyins = set()
-        for entry in self.surnames:
-            for p in entry.get('pinyin', []):
-                surname_pinyins.add(p.lower())
-                
-        stopwords = {
-            "the", "is", "for", "by", "of", "and", "to", "in", "on", "at", 
-            "customer", "insured", "name", "policy", "number", "agent", "date",
-            "page", "total", "amount", "due", "paid", "payment", "from", "bill",
-            "effective", "coverage", "insurance", "premium", "declaration", "certificate",
-            "endorsement", "period", "issue", "issued", "producer", "agency", "company",
-
-            "description", "item", "location", "check", "cancelled"
-        }
+        tokens = self._tokenize(text)
+
+        for i in range(len(tokens) - 1):
+            t1 = tokens[i]
+            t2 = tokens[i+1]
+            if t1 is None or t2 is None: continue
+            t3 = tokens[i+2] if i + 2 < len(tokens) else None
+
+            w1, upper1, stop1, surname1, pinyin1, initial1 = t1
+            w2, upper2, stop2, surname2, pinyin2, initial2 = t2
 
-        def clean_token(token):
-            t = token.strip("()\"',-:")
-            if not t: return None
-            if t.endswith('.') and len(t) == 2 and t[0].isalpha(): return t # Initial
-            return t.strip(".")
-
-        def is_alpha_or_initial(w):
-            if w.endswith('.'): return w[:-1].isalpha()
-            return w.isalpha()
-
-        for i in range(len(text_tokens)):
-            if i + 1 >= len(text_tokens): break
-            
-            t1 = text_tokens[i]
-            t2 = text_tokens[i+1]
-            t3 = text_tokens[i+2] if i + 2 < len(text_tokens) else None
-            
-            w1 = clean_token(t1)
-            w2 = clean_token(t2)
-            w3 = clean_token(t3) if t3 else None
-            
-            if not w1 or not w2: continue
-            if not is_alpha_or_initial(w1) or not is_alpha_or_initial(w2): continue
-            
             # --- Check 3-Word Pattern (Strict) ---
-            if w3 and is_alpha_or_initial(w3):
-                 if w1[0].isupper() and w2[0].isupper() and w3[0].isupper():
-                     w1_lower = w1.lower().strip('.')
-                     w2_lower = w2.lower().strip('.')
-                     w3_lower = w3.lower().strip('.')
-                     
-                     if (w1_lower not in stopwords and w2_lower not in stopwords and w3_lower not in stopwords):
-                         
-                         is_surname_1 = w1_lower in surname_pinyins
-                         is_surname_3 = w3_lower in surname_pinyins
-                         
-                         # Scenario A: Standard Chinese (Surname Given Given) or (Given Given Surname)
-                         # Strict: Non-surname parts MUST be pinyin
-                         candidate_accepted = False
-                         
-                         if is_surname_1:
-                             # Start is Surname. Check Rest.
-                             # e.g. Wang Xiao Ming
-                             # Xiao and Ming must be pinyin
-                             if self._is_pinyin(w2_lower) and self._is_pinyin(w3_lower):
-                                 candidate_accepted = True
-                             # e.g. Wang A. Ming (Initial Middle)
-                             elif w2.endswith('.') or w2_lower.isalpha() and len(w2)==1: # Initial
-                                  candidate_accepted = True
-                         
-                         elif is_surname_3:
-                             # End is Surname. Check Start.
-                             # e.g. Xiao Ming Wang
-                             if self._is_pinyin(w1_lower) and self._is_pinyin(w2_lower):
-                                 candidate_accepted = True
-                             # e.g. John A. Wang
-                             elif w2.endswith('.') or len(w2)==1:
-                                 candidate_accepted = True
-                                 
-                         if candidate_accepted:
-                             candidates.append(f"{w1} {w2} {w3}")
+            if t3 is not None:
+                w3, upper3, stop3, surname3, pinyin3, _ = t3
+                if upper1 and upper2 and upper3 and not (stop1 or stop2 or stop3):
+                    # Scenario A: Standard Chinese (Surname Given Given) or (Given Given Surname)
+                    # Strict: Non-surname parts MUST be pinyin
+                    candidate_accepted = False
+
+                    if surname1:
+                        # e.g. Wang Xiao Ming, or Wang A. Ming (Initial Middle)
+                        candidate_accepted = (pinyin2 and pinyin3) or initial2
+                    elif surname3:
+                        # e.g. Xiao Ming Wang, or John A. Wang
+                        candidate_accepted = (pinyin1 and pinyin2) or initial2
+
+                    if candidate_accepted:
+                        candidates.append(f"{w1} {w2} {w3}")
 
             # --- Check 2-Word Pattern ---
-            if w1[0].isupper() and w2[0].isupper():
-                 w1_lower = w1.lower().strip('.')
-                 w2_lower = w2.lower().strip('.')
-                 
-                 if w1_lower not in stopwords and w2_lower not in stopwords:
-                     is_surname_1 = w1_lower in surname_pinyins
-                     is_surname_2 = w2_lower in surname_pinyins
-                     
-                     candidate_accepted = False
-                     
-                     if is_surname_1:
-                         # e.g. Wang Wei (Wei must be pinyin)
-                         if self._is_pinyin(w2_lower):
-                             candidate_accepted = True
-                         elif w2.endswith('.') or (w2_lower.isalpha() and len(w2)==1): # Initial
-                             candidate_accepted = True
-                             
-                     elif is_surname_2:
-                         # e.g. Wei Wang (Wei must be pinyin)
-                         if self._is_pinyin(w1_lower):
-                             candidate_accepted = True
-                         elif w1.endswith('.') or (w1_lower.isalpha() and len(w1)==1): # Initial
-                             candidate_accepted = True
-                             
-                     if candidate_accepted:
-                         candidates.append(f"{w1} {w2}")
-
-        unique_candidates = list(set(candidates))
+            if upper1 and upper2 and not stop1 and not stop2:
+                candidate_accepted = False
+
+                if surname1:
+                    # e.g. Wang Wei (Wei must be pinyin)
+                    candidate_accepted = pinyin2 or initial2
+                elif surname2:
+                    # e.g. Wei Wang (Wei must be pinyin)
+                    candidate_accepted = pinyin1 or initial1
+
+                if candidate_accepted:
+                    candidates.append(f"{w1} {w2}")
+
+        # First occurrence order among names of equal length
+        unique_candidates = list(dict.fromkeys(candidates))
         unique_candidates.sort(key=len, reverse=True)
         return unique_candidates
@@ -0,0 +1,79 @@
+import random
+import unittest
+from unittest import mock
+
+from thefuzz import fuzz
+
+import anchor_finder
+from anchor_finder import PageAnchors, get_page_anchors
+from renamer_logic import NAME_COLON_KEYS, NAME_NO_COLON_KEYS, DATE_KEYS, ANCHOR_TOKENS
+
+KEYWORDS = NAME_COLON_KEYS + NAME_NO_COLON_KEYS + DATE_KEYS
+
+
+def legacy_phrase_starts(words, kw):
+    """The per-word fuzz.ratio loop _find_text_spatially used before batching."""
+    kw_tokens = kw.lower().split()
+    starts = []
+    for i, word in enumerate(words):
+        w_text = word['text'].lower().strip(":").strip()
+        if not w_text: continue
+        if fuzz.ratio(w_text, kw_tokens[0].strip(":")) < 80: continue
+        match = True
+        for k in range(1, len(kw_tokens)):
+            if i + k >= len(words):
+                match = False
+                break
+            if fuzz.ratio(words[i + k]['text'].lower().strip(":").strip(), kw_tokens[k].strip(":")) < 80:
+                match = False
+                break
+        if match:
+            starts.append(i)
+    return starts
+
+
+def noisy_words(seed, count=400):
+    """Label words with OCR-style typos mixed into random filler."""
+    rng = random.Random(seed)
+    vocab = [t for kw in KEYWORDS for t in kw.split()] + ["john", "doe", "policy", "12/01/2025", ":", "namcd", "lnsured:"]
+    words = []
+    for _ in range(count):
+        text = rng.choice(vocab)
+        if rng.random() < 0.3 and len(text) > 3:
+            pos = rng.randrange(len(text))
+            text = text[:pos] + rng.choice("abcdeilmnor1") + text[pos + 1:]
+        if rng.random() < 0.3:
+            text = text.capitalize()
+        words.append({"text": text})
+    return words
+
+
+class TestAnchorFinder(unittest.TestCase):
+    def _check_against_legacy(self):
+        for seed in range(5):
+            words = noisy_words(seed)
+            anchors = PageAnchors(words, ANCHOR_TOKENS)
+            for kw in KEYWORDS:
+                self.assertEqual(anchors.phrase_starts(kw), legacy_phrase_starts(words, kw), (seed, kw))
+
+    def test_matches_legacy_scoring(self):
+        self._check_against_legacy()
+
+    def test_matches_legacy_scoring_without_numpy(self):
+        with mock.patch.object(anchor_finder, "numpy", None):
+            self._check_against_legacy()
+
+    def test_unknown_keyword_scored_on_demand(self):
+        words = [{"text": "Account"}, {"text": "Holder:"}, {"text": "Jane"}]
+        anchors = PageAnchors(words, ANCHOR_TOKENS)
+        self.assertEqual(anchors.phrase_starts("account holder:"), [0])
+
+    def test_cached_per_page(self):
+        page = {"words": [{"text": "Named"}, {"text": "Insured:"}]}
+        first = get_page_anchors(page, ANCHOR_TOKENS)
+        self.assertIs(get_page_anchors(page, ANCHOR_TOKENS), first)
+        self.assertEqual(first.phrase_starts("named insured:"), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
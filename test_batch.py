@@ -0,0 +1,132 @@
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import unittest
+
+from renamer_logic import PDFProcessor
+from batch_engine import BatchEngine, error_result
+from bulk_renamer import RenameJournal, read_journal, undo_journal
+from extraction_backends import TwoPassBackend
+from sample_pdf import write_text_pdf
+
+
+class CrashingBackend(TwoPassBackend):
+    """Kills its worker process outright on a page that says CRASH, like an OOM kill."""
+
+    def extract(self, page):
+        text, words = super().extract(page)
+        if "CRASH" in text:
+            os.kill(os.getpid(), signal.SIGKILL)
+        return text, words
+
+
+class DyingJournal(RenameJournal):
+    """Journals the rename, then kills its worker before the result can reach the parent."""
+
+    def record(self, old_path, new_path):
+        super().record(old_path, new_path)
+        os.kill(os.getpid(), signal.SIGKILL)
+
+
+class TestBatchProcessing(unittest.TestCase):
+    def setUp(self):
+        self.processor = PDFProcessor()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _make_policy(self, name, insured):
+        path = os.path.join(self.tmpdir, name)
+        write_text_pdf(path, [[
+            "INSURANCE POLICY DECLARATION",
+            f"Named Insured: {insured}",
+            "Effective Date: 01/25/2026",
+            "Company: Geico",
+        ]])
+        return path
+
+    def test_process_document_renames(self):
+        path = self._make_policy("scan001.pdf", "John Doe")
+        result = self.processor.process_document(path)
+        self.assertEqual(result["status"], "renamed")
+        self.assertEqual(result["doc_type"], "POLICY")
+        self.assertEqual(result["new_name"], "John_Doe_Geico_DEC_EFF_01-25-2026.pdf")
+        self.assertTrue(os.path.exists(result["new_path"]))
+        self.assertFalse(os.path.exists(path))
+
+    def test_process_document_dry_run(self):
+        path = self._make_policy("scan002.pdf", "Jane Smith")
+        result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["status"], "planned")
+        self.assertTrue(os.path.exists(path))
+
+    def test_process_document_skips_non_pdf(self):
+        result = self.processor.process_document(os.path.join(self.tmpdir, "notes.txt"))
+        self.assertEqual(result["status"], "skipped")
+
+    def test_process_batch_streams_all_results(self):
+        paths = [self._make_policy(f"scan{i:03d}.pdf", name)
+                 for i, name in enumerate(["John Doe", "Jane Smith", "Mary Major", "Bob Stone"])]
+        results = list(self.processor.process_batch(iter(paths), workers=2, rename=False))
+        self.assertEqual(sorted(r["path"] for r in results), sorted(paths))
+        self.assertTrue(all(r["status"] == "planned" for r in results))
+        names = sorted(r["metadata"]["insured_name"] for r in results)
+        self.assertEqual(names, ["Bob_Stone", "Jane_Smith", "John_Doe", "Mary_Major"])
+
+    def test_cancel_stops_queuing(self):
+        paths = [self._make_policy(f"scan{i:03d}.pdf", "John Doe") for i in range(6)]
+        cancel = threading.Event()
+        cancel.set()
+        with BatchEngine(workers=1) as engine:
+            results = list(engine.process(paths, rename=False, cancel_event=cancel))
+        self.assertEqual(results, [])
+
+
+    @unittest.skipUnless(hasattr(signal, "SIGKILL"), "needs SIGKILL")
+    def test_engine_survives_a_dead_worker(self):
+        crash = os.path.join(self.tmpdir, "crash.pdf")
+        write_text_pdf(crash, [["CRASH this worker while reading the first page of the document"]])
+        paths = [self._make_policy(f"scan{i:03d}.pdf", "John Doe") for i in range(2)]
+        with BatchEngine(workers=1, processor_options={"backend": CrashingBackend()}) as engine:
+            results = list(engine.process([crash], rename=False))
+            self.assertEqual(results[0]["status"], "error")
+            self.assertIn("profile", results[0])
+
+            # The same engine keeps working on a fresh pool
+            results = list(engine.process(paths, rename=False))
+            self.assertEqual([r["status"] for r in results], ["planned", "planned"])
+            self.assertEqual(engine.in_flight, 0)
+
+    def test_workers_journal_their_renames(self):
+        journal_path = os.path.join(self.tmpdir, "renames.jsonl")
+        paths = [self._make_policy(f"scan{i:03d}.pdf", name)
+                 for i, name in enumerate(["John Doe", "Jane Smith", "Mary Major", "Bob Stone"])]
+        processor = PDFProcessor(journal=RenameJournal(journal_path))
+        results = list(processor.process_batch(iter(paths), workers=2))
+        self.assertEqual({r["status"] for r in results}, {"renamed"})
+        # One intact line per rename, written by the workers, not by this process
+        self.assertIsNone(processor.journal._fd)
+        self.assertEqual(sorted(read_journal(journal_path)), sorted((r["path"], r["new_path"]) for r in results))
+
+    @unittest.skipUnless(hasattr(signal, "SIGKILL"), "needs SIGKILL")
+    def test_rename_whose_result_is_lost_can_be_undone(self):
+        journal_path = os.path.join(self.tmpdir, "renames.jsonl")
+        path = self._make_policy("scan001.pdf", "John Doe")
+        with BatchEngine(workers=1, processor_options={"journal": DyingJournal(journal_path)}) as engine:
+            result, = engine.process([path])
+        self.assertEqual(result["status"], "error")
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual([r["status"] for r in undo_journal(journal_path)], ["restored"])
+        self.assertTrue(os.path.exists(path))
+
+    def test_error_result_has_the_full_result_shape(self):
+        result = error_result("a.pdf", "worker died")
+        self.assertEqual(set(result), set(PDFProcessor.new_result("a.pdf")))
+        self.assertEqual((result["status"], result["error"]), ("error", "Error: worker died"))
+
+
+if __name__ == '__main__':
+    unittest.main()
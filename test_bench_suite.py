@@ -0,0 +1,102 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import bench_corpus
+import bench_suite
+
+
+def _digests(directory):
+    digests = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith("_scan.pdf"):
+            with open(os.path.join(directory, name), "rb") as f:
+                digests[name] = hashlib.sha256(f.read()).hexdigest()
+    return digests
+
+
+class TestBenchCorpus(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_same_seed_same_corpus(self):
+        first, second = os.path.join(self.tmpdir, "a"), os.path.join(self.tmpdir, "b")
+        bench_corpus.generate(first, count=8, seed=3, scanned=0)
+        bench_corpus.generate(second, count=8, seed=3, scanned=0)
+        self.assertEqual(_digests(first), _digests(second))
+        bench_corpus.generate(second, count=8, seed=4, scanned=0)
+        self.assertNotEqual(_digests(first), _digests(second))
+
+    def test_documents_classify_as_the_manifest_says(self):
+        from renamer_logic import PDFProcessor
+
+        entries = bench_corpus.generate(self.tmpdir, count=8, seed=3, scanned=0)
+        processor = PDFProcessor()
+        for entry in entries:
+            result = processor.process_document(os.path.join(self.tmpdir, entry["file"]), rename=False)
+            self.assertEqual(result["doc_type"], entry["expected_type"], entry["file"])
+
+    def test_scanned_copies_have_no_text_layer(self):
+        import pdfplumber
+
+        entries = bench_corpus.generate(self.tmpdir, count=2, seed=3, scanned=1.0)
+        scans = [e for e in entries if e["scanned"]]
+        self.assertEqual(len(scans), 2)
+        with pdfplumber.open(os.path.join(self.tmpdir, scans[0]["file"])) as pdf:
+            self.assertEqual(len(pdf.pages), scans[0]["pages"])
+            self.assertFalse((pdf.pages[0].extract_text() or "").strip())
+            self.assertTrue(pdf.pages[0].images)
+
+
+class TestBenchSuite(unittest.TestCase):
+    BASELINE = {"stages": {
+        "extract": {"per_sec": 10.0, "p50_ms": 100.0, "p95_ms": 400.0, "peak_rss_mb": 90.0},
+        "analyze": {"per_sec": 1000.0, "p50_ms": 0.6, "p95_ms": 2.5, "peak_rss_mb": 80.0, "accuracy": 1.0},
+        "scanned": {"skipped": "Tesseract not installed"},
+    }}
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(bench_suite.percentile(values, 50), 50)
+        self.assertEqual(bench_suite.percentile(values, 95), 95)
+        self.assertEqual(bench_suite.percentile([7], 95), 7)
+
+    def test_within_thresholds_passes(self):
+        results = {
+            "extract": {"per_sec": 8.5, "p50_ms": 120.0, "p95_ms": 500.0, "peak_rss_mb": 100.0},
+            "analyze": {"per_sec": 900.0, "p50_ms": 0.7, "p95_ms": 2.4, "peak_rss_mb": 80.0, "accuracy": 1.0},
+            "scanned": {"skipped": "Tesseract not installed"},
+        }
+        self.assertEqual(bench_suite.compare(results, self.BASELINE), [])
+
+    def test_regressions_are_reported(self):
+        results = {
+            "extract": {"per_sec": 5.0, "p50_ms": 200.0, "p95_ms": 400.0, "peak_rss_mb": 120.0},
+            "analyze": {"per_sec": 1000.0, "p50_ms": 0.6, "p95_ms": 2.5, "peak_rss_mb": 80.0, "accuracy": 0.9},
+        }
+        problems = bench_suite.compare(results, self.BASELINE)
+        self.assertEqual(len(problems), 4)
+        self.assertTrue(any(p.startswith("extract: p50_ms") for p in problems))
+        self.assertTrue(any(p.startswith("extract: per_sec") for p in problems))
+        self.assertTrue(any(p.startswith("extract: peak_rss_mb") for p in problems))
+        self.assertTrue(any(p.startswith("analyze: accuracy") for p in problems))
+
+    def test_stage_runs_and_summarizes(self):
+        with tempfile.TemporaryDirectory() as corpus:
+            bench_corpus.generate(corpus, count=4, seed=3, scanned=0)
+            raw = bench_suite.run_stage("analyze", corpus, rounds=1, repeats=1)
+        raw["peak_rss_mb"] = bench_suite.peak_rss_mb()
+        summary = bench_suite.summarize(raw)
+        self.assertEqual(summary["items"], 4 * bench_suite.MICRO_ROUNDS)
+        self.assertEqual(summary["accuracy"], 1.0)
+        self.assertGreater(summary["per_sec"], 0)
+        self.assertLessEqual(summary["p50_ms"], summary["p95_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import bulk_renamer
+from bulk_renamer import BulkRenamer, RenameJournal, read_journal, undo_journal
+from renamer_logic import PDFProcessor
+
+
+class TestBulkRenamer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _touch(self, name, content=None):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write(content if content is not None else name)
+        return path
+
+    def _content(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_suffixes_match_rename_file(self):
+        self._touch("Doc.pdf")
+        self._touch("Doc_1.pdf")
+        renamer = BulkRenamer()
+        first = renamer.rename(self._touch("a.pdf"), "Doc.pdf")
+        second = renamer.rename(self._touch("b.pdf"), "Doc.pdf")
+        third = renamer.rename(self._touch("c.pdf"), "Other.pdf")
+        self.assertEqual([os.path.basename(p) for p in (first, second, third)],
+                         ["Doc_2.pdf", "Doc_3.pdf", "Other.pdf"])
+        self.assertEqual(self._content(first), "a.pdf")
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, "a.pdf")))
+
+    def test_name_taken_after_listing_is_not_overwritten(self):
+        renamer = BulkRenamer()
+        renamer.rename(self._touch("a.pdf"), "Warmup.pdf")
+        # Appear behind the index's back, as another process's renames would
+        self._touch("Doc.pdf", "someone else's")
+        self._touch("Doc_1.pdf", "someone else's")
+        with mock.patch.object(bulk_renamer.os, "listdir", wraps=os.listdir) as listdir:
+            self.assertEqual(os.path.basename(renamer.rename(self._touch("b.pdf"), "Other.pdf")), "Other.pdf")
+            self.assertEqual(listdir.call_count, 0)
+            new_path = renamer.rename(self._touch("c.pdf"), "Doc.pdf")
+            # One collision, one fresh listing, and Doc_1.pdf is skipped without another attempt
+            self.assertEqual(listdir.call_count, 1)
+        self.assertEqual(os.path.basename(new_path), "Doc_2.pdf")
+        self.assertEqual(self._content(os.path.join(self.tmpdir, "Doc.pdf")), "someone else's")
+
+    def test_concurrent_renamers_never_share_a_name(self):
+        sources = [self._touch(f"src_{i:03}.pdf") for i in range(60)]
+        # Separate instances stand in for separate worker processes
+        renamers = [BulkRenamer() for _ in range(3)]
+        results = []
+
+        def work(renamer, chunk):
+            results.extend(renamer.rename(path, "Same.pdf") for path in chunk)
+
+        threads = [threading.Thread(target=work, args=(renamer, sources[i::3])) for i, renamer in enumerate(renamers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(results)), 60)
+        self.assertEqual(sorted(self._content(p) for p in results), sorted(os.path.basename(p) for p in sources))
+        self.assertEqual(len(os.listdir(self.tmpdir)), 60)
+
+    def test_falls_back_to_exclusive_create_without_hard_links(self):
+        self._touch("Doc.pdf")
+        with mock.patch.object(bulk_renamer.os, "link", side_effect=PermissionError("no links")):
+            new_path = BulkRenamer().rename(self._touch("a.pdf"), "Doc.pdf")
+        self.assertEqual(os.path.basename(new_path), "Doc_1.pdf")
+        self.assertEqual(self._content(new_path), "a.pdf")
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ["Doc.pdf", "Doc_1.pdf"])
+
+    def test_missing_source_releases_the_name(self):
+        renamer = BulkRenamer()
+        with self.assertRaises(FileNotFoundError):
+            renamer.rename(os.path.join(self.tmpdir, "gone.pdf"), "Doc.pdf")
+        new_path = renamer.rename(self._touch("a.pdf"), "Doc.pdf")
+        self.assertEqual(os.path.basename(new_path), "Doc.pdf")
+
+    def test_name_freed_after_listing_is_reused(self):
+        processor = PDFProcessor()
+        first = processor.renamer.rename(self._touch("a.pdf"), "Doc.pdf")
+        self.assertEqual(processor.renamer.rename(self._touch("b.pdf"), "Doc.pdf"),
+                         os.path.join(self.tmpdir, "Doc_1.pdf"))
+        # Deleted (or moved away) behind the index's back, as between two batches
+        os.remove(first)
+        os.remove(os.path.join(self.tmpdir, "Doc_1.pdf"))
+        self.assertEqual(os.listdir(self.tmpdir), [])
+        new_path = processor.renamer.rename(self._touch("c.pdf"), "Doc.pdf")
+        self.assertEqual(os.path.basename(new_path), "Doc.pdf")
+        # The suffixes start over too
+        self.assertEqual(os.path.basename(processor.renamer.rename(self._touch("d.pdf"), "Doc.pdf")), "Doc_1.pdf")
+
+    def test_processor_reports_errors_as_before(self):
+        result = PDFProcessor().rename_file(os.path.join(self.tmpdir, "gone.pdf"), "Doc.pdf")
+        self.assertTrue(result.startswith("Error: "))
+
+
+class TestRenameJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.tmpdir, "journal", "renames.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _touch(self, name):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            f.write(name)
+        return path
+
+    def test_undo_restores_a_batch(self):
+        self._touch("Doc.pdf")
+        sources = [self._touch(name) for name in ("a.pdf", "b.pdf")]
+        with RenameJournal(self.journal_path) as journal:
+            BulkRenamer(journal).rename_many([(path, "Doc.pdf") for path in sources])
+        self.assertEqual([os.path.basename(new) for _, new in read_journal(self.journal_path)],
+                         ["Doc_1.pdf", "Doc_2.pdf"])
+
+        results = undo_journal(self.journal_path)
+        self.assertEqual([r["status"] for r in results], ["restored", "restored"])
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ["Doc.pdf", "a.pdf", "b.pdf", "journal"])
+        # A second undo finds nothing left to move
+        self.assertEqual([r["status"] for r in undo_journal(self.journal_path)], ["missing", "missing"])
+
+    def test_undo_never_overwrites(self):
+        source = self._touch("a.pdf")
+        with RenameJournal(self.journal_path) as journal:
+            BulkRenamer(journal).rename(source, "Doc.pdf")
+        self._touch("a.pdf")
+        self.assertEqual(undo_journal(self.journal_path)[0]["status"], "occupied")
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir, "Doc.pdf")))
+
+    def test_torn_last_line_is_ignored(self):
+        with RenameJournal(self.journal_path) as journal:
+            journal.record("/a.pdf", "/b.pdf")
+        with open(self.journal_path, "a") as f:
+            f.write('{"old": "/c.pd')
+        self.assertEqual(len(read_journal(self.journal_path)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import random
+import unittest
+from unittest import mock
+
+from thefuzz import process, fuzz
+
+import company_matcher
+from company_matcher import CompanyMatcher
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VOCAB = ("policy premium coverage insured named effective period liability dwelling "
+         "property auto vehicle location limit the of and form agent producer").split()
+
+
+def legacy_match(companies, text):
+    """The extractOne scan analyze_content used before CompanyMatcher."""
+    best, score = process.extractOne(text.lower(), [c.lower() for c in companies], scorer=fuzz.partial_ratio)
+    if score > 85:
+        for c in companies:
+            if c.lower() == best:
+                return c
+    return None
+
+
+def typo(rng, name):
+    chars = list(name)
+    for _ in range(rng.randint(0, 2)):
+        pos = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[pos] = rng.choice("abcdeilmnorst ")
+        elif op < 0.7:
+            chars.insert(pos, rng.choice("abcdeilmnorst -"))
+        elif len(chars) > 1:
+            del chars[pos]
+    return "".join(chars)
+
+
+class TestCompanyMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = CompanyMatcher(os.path.join(SCRIPT_DIR, "known_companies.json"))
+
+    def test_loads_known_companies(self):
+        self.assertIn("The Hartford", self.matcher.companies)
+        self.assertGreaterEqual(len(self.matcher.companies), 30)
+
+    def test_exact_hit_prefers_list_order(self):
+        text = "Policy issued by Hartford, a member of The Hartford group. " * 20
+        self.assertEqual(self.matcher.match(text), ("The Hartford", 100))
+
+    def test_fuzzy_hit(self):
+        text = " ".join(["premium"] * 200) + " underwritten by Liberty Mutal " + " ".join(["limit"] * 200)
+        company, score = self.matcher.match(text)
+        self.assertEqual(company, "Liberty Mutual")
+        self.assertGreater(score, 85)
+
+    def test_no_company(self):
+        self.assertEqual(self.matcher.match(" ".join(["coverage"] * 300))[0], None)
+        self.assertEqual(self.matcher.match(""), (None, 0))
+
+    def test_matches_legacy_scan(self):
+        self._check_against_legacy(random.Random(9))
+
+    def test_indexed_path_matches_legacy_scan(self):
+        # Index every text, however short, so the fuzzy stage is exercised
+        with mock.patch.object(company_matcher, "DIRECT_SCAN_CHARS", 0):
+            self._check_against_legacy(random.Random(10))
+
+    def _check_against_legacy(self, rng):
+        companies = self.matcher.companies
+        for _ in range(300):
+            words = [rng.choice(VOCAB) for _ in range(rng.choice([3, 40, 400]))]
+            for _ in range(rng.randint(0, 3)):
+                words.insert(rng.randrange(len(words) + 1), typo(rng, rng.choice(companies)))
+            text = " ".join(words)
+            if rng.random() < 0.3:
+                # Partial names at the very start of the text count too
+                text = typo(rng, rng.choice(companies))[1:] + " " + text
+            self.assertEqual(self.matcher.match(text)[0], legacy_match(companies, text), text)
+
+    def test_missing_file(self):
+        matcher = CompanyMatcher(os.path.join(SCRIPT_DIR, "no_such_file.json"))
+        self.assertEqual(matcher.match("Geico"), (None, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+import keyword_automaton
+from keyword_automaton import KeywordAutomaton
+from document_classifier import DocumentClassifier, KeywordRule
+from renamer_logic import CLASSIFIER_RULES, DocumentType
+
+
+def legacy_classify(text_lower):
+    """The substring chain analyze_content used before the classifier."""
+    doc_type = DocumentType.UNKNOWN
+    policy_found = False
+    for kw in ["declaration", "deductible", "peril"]:
+        if kw in text_lower:
+            doc_type = DocumentType.POLICY
+            policy_found = True
+            break
+    if "cancellation request" in text_lower or "policy release" in text_lower or "acord 35" in text_lower:
+        doc_type = DocumentType.CANCELLATION_REQUEST
+    elif "cme insurance brokerage inc" in text_lower and "agreement acknowledgement" in text_lower:
+        doc_type = DocumentType.CME_TERM
+    elif "driver license" in text_lower or "driver's license" in text_lower or "identification card" in text_lower:
+        doc_type = DocumentType.DRIVER_LICENSE
+    elif not policy_found:
+        if "certificate of insurance" in text_lower or "acord" in text_lower:
+            doc_type = DocumentType.CERTIFICATE
+        elif "invoice" in text_lower or "bill" in text_lower or "due" in text_lower:
+            doc_type = DocumentType.INVOICE
+        elif "pay to the order of" in text_lower or "check no." in text_lower:
+            doc_type = DocumentType.CHECK
+    return doc_type
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+    def test_overlapping_and_nested_keywords(self):
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "acord", "acord 35", "cord"], method="trie")
+        self.assertEqual(automaton.find_all("ushers"), {"he", "she", "hers"})
+        self.assertEqual(automaton.find_all("form acord 35"), {"acord", "acord 35", "cord"})
+        self.assertEqual(automaton.find_all("nothing here"), {"he"})
+
+    def test_trie_matches_substring_search(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            keywords = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 5))) for _ in range(20)]
+            text = "".join(rng.choice("abcd ") for _ in range(200))
+            expected = {k for k in keywords if k and k in text}
+            self.assertEqual(KeywordAutomaton(keywords, method="trie").find_all(text), expected)
+
+    def test_method_chosen_by_size(self):
+        if keyword_automaton.ahocorasick is not None:
+            self.skipTest("pyahocorasick installed")
+        self.assertEqual(KeywordAutomaton(["a", "b"]).method, "substring")
+        many = [f"kw{i}" for i in range(keyword_automaton.SUBSTRING_SCAN_MAX + 1)]
+        self.assertEqual(KeywordAutomaton(many).method, "trie")
+
+    def test_empty_keyword_list(self):
+        self.assertEqual(KeywordAutomaton([], method="trie").find_all("anything"), set())
+
+
+class TestDocumentClassifier(unittest.TestCase):
+    def setUp(self):
+        self.classifier = DocumentClassifier(CLASSIFIER_RULES, DocumentType.UNKNOWN)
+
+    def test_priority_rules(self):
+        cases = {
+            "policy declaration page": DocumentType.POLICY,
+            "policy declaration, cancellation request": DocumentType.CANCELLATION_REQUEST,
+            "deductible applies. invoice attached": DocumentType.POLICY,
+            "acord 25 certificate of insurance": DocumentType.CERTIFICATE,
+            "amount due on this bill": DocumentType.INVOICE,
+            "pay to the order of": DocumentType.CHECK,
+            "cme insurance brokerage inc": DocumentType.UNKNOWN,
+            "cme insurance brokerage inc agreement acknowledgement": DocumentType.CME_TERM,
+            "state identification card": DocumentType.DRIVER_LICENSE,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(self.classifier.classify(text), expected, text)
+
+    def test_matches_legacy_chain(self):
+        rng = random.Random(5)
+        phrases = [k for rule in CLASSIFIER_RULES for k in rule.keywords] + ["named insured", "premium", "policy"]
+        trie = DocumentClassifier(CLASSIFIER_RULES, DocumentType.UNKNOWN, method="trie")
+        for _ in range(500):
+            text = " ".join(rng.sample(phrases, rng.randint(0, 4)))
+            self.assertEqual(self.classifier.classify(text), legacy_classify(text), text)
+            self.assertEqual(trie.classify(text), legacy_classify(text), text)
+
+    def test_custom_rules(self):
+        classifier = DocumentClassifier([KeywordRule("binder", ["Binder of Insurance"])], "other")
+        self.assertEqual(classifier.classify("temporary binder of insurance"), "binder")
+        self.assertEqual(classifier.classify("declarations"), "other")
+
+
+if __name__ == '__main__':
+    unittest.main()
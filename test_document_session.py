@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pdfplumber
+import ocr_service
+from renamer_logic import PDFProcessor
+from document_session import DocumentSession
+from sample_pdf import write_text_pdf
+
+
+class TestDocumentSession(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "form.pdf")
+        write_text_pdf(self.path, [[(72, 100, "Named Insured:")], [(72, 100, "Page two")]])
+        self.processor = PDFProcessor()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_opens_lazily_and_once(self):
+        real_open = pdfplumber.open
+        with mock.patch.object(pdfplumber, "open", side_effect=real_open) as opener:
+            with DocumentSession(self.path) as session:
+                self.assertEqual(opener.call_count, 0)
+                session.raster(0)
+                session.raster(0)
+                session.crop_raster(1, (72, 90, 200, 120))
+            self.assertEqual(opener.call_count, 1)
+
+    def test_crop_scales_points_to_pixels(self):
+        with DocumentSession(self.path) as session:
+            im = session.crop_raster(0, (72, 72, 144, 108))
+            # 300 DPI: 72 pt -> 300 px, 36 pt -> 150 px
+            self.assertEqual(im.size, (300, 150))
+            self.assertIsNone(session.crop_raster(5, (0, 0, 10, 10)))
+
+    def test_zone_ocr_reuses_session_raster(self):
+        anchor = (72, 100, 150, 112)
+        with mock.patch.object(ocr_service.pytesseract, "image_to_string", return_value="John Doe") as ocr:
+            with DocumentSession(self.path) as session:
+                first = self.processor._perform_zone_ocr(self.path, 0, anchor, session=session)
+                second = self.processor._perform_zone_ocr(self.path, 0, anchor, session=session)
+                rendered = len(session._rasters)
+        self.assertEqual((first, second), ("John Doe", "John Doe"))
+        self.assertEqual(ocr.call_count, 2)
+        self.assertEqual(rendered, 1)
+        # Crop is 400pt wide unless clipped by the page edge
+        self.assertEqual(ocr.call_args[0][0].width, int(round((150 + 400) * 300 / 72)) - int(150 * 300 / 72))
+
+
+if __name__ == '__main__':
+    unittest.main()
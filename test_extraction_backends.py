@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import pdfplumber
+from extraction_backends import SinglePassBackend, TwoPassBackend, WORD_ATTRS
+from sample_pdf import write_text_pdf
+
+
+class TestExtractionBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "form.pdf")
+        write_text_pdf(self.path, [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+             (300, 120, "Policy Number: AB-123"), (72, 400, "Effective Date: 01/25/2026")],
+            [],
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_single_pass_matches_pdfplumber(self):
+        with pdfplumber.open(self.path) as pdf:
+            for page in pdf.pages:
+                text, words = SinglePassBackend().extract(page)
+                self.assertEqual(text, page.extract_text())
+                expected = page.extract_words(extra_attrs=WORD_ATTRS)
+                self.assertEqual([w["text"] for w in words], [w["text"] for w in expected])
+                for got, want in zip(words, expected):
+                    for key in ("x0", "x1", "top", "bottom", "fontname", "size"):
+                        self.assertEqual(got[key], want[key])
+
+    def test_two_pass_defers_words(self):
+        with pdfplumber.open(self.path) as pdf:
+            text, words = TwoPassBackend().extract(pdf.pages[0])
+            self.assertIn("Named Insured: John Doe", text)
+            self.assertIsNone(words)
+            self.assertEqual(TwoPassBackend().extract_words(pdf.pages[0])[0]["text"], "INSURANCE")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import renamer_logic
+from renamer_logic import PDFProcessor
+from extraction_cache import ExtractionCache
+from sample_pdf import write_scanned_pdf, write_text_pdf
+
+
+class FlakyOCR:
+    """Raises on the first `failures` calls, then reads every page as a policy."""
+
+    pool_size = 1
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def image_to_string(self, image, config=""):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("tesseract crashed")
+        return "INSURANCE POLICY DECLARATION\nNamed Insured: John Doe\nEffective Date: 01/25/2026"
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = ExtractionCache(os.path.join(self.tmpdir, "cache.sqlite3"))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _entry(self, text):
+        return {"full_text": text, "pages": [{"width": 100, "height": 100, "text": text, "words": []}]}
+
+    def test_round_trip(self):
+        self.cache.put("k1", self._entry("hello"))
+        self.assertEqual(self.cache.get("k1")["full_text"], "hello")
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        # Random text so each compressed entry is roughly the same size
+        blobs = {k: os.urandom(3000).hex() for k in ("a", "b", "c")}
+        self.cache.max_bytes = 9000  # Room for two ~3.6 KB entries
+        self.cache.put("a", self._entry(blobs["a"]))
+        self.cache.put("b", self._entry(blobs["b"]))
+        self.cache.get("a")  # 'b' is now least recently used
+        self.cache.put("c", self._entry(blobs["c"]))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_key_changes_with_content_and_version(self):
+        path = os.path.join(self.tmpdir, "a.pdf")
+        write_text_pdf(path, [["Named Insured: John Doe"]])
+        key = ExtractionCache.key_for_file(path, 1)
+        self.assertNotEqual(key, ExtractionCache.key_for_file(path, 2))
+        write_text_pdf(path, [["Named Insured: Jane Doe"]])
+        self.assertNotEqual(key, ExtractionCache.key_for_file(path, 1))
+
+    def test_hit_skips_pdfplumber(self):
+        path = os.path.join(self.tmpdir, "policy.pdf")
+        write_text_pdf(path, [["INSURANCE POLICY DECLARATION", "Named Insured: John Doe"]])
+        processor = PDFProcessor(cache=self.cache)
+        first = processor.extract_data(path)
+        self.assertIn("John Doe", first["full_text"])
+
+        with mock.patch.object(renamer_logic.pdfplumber, "open", side_effect=AssertionError("re-extracted")):
+            second = processor.extract_data(path)
+        self.assertEqual(second["full_text"], first["full_text"])
+        self.assertEqual(len(second["pages"][0]["words"]), len(first["pages"][0]["words"]))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_key_includes_extractor_version(self):
+        path = os.path.join(self.tmpdir, "policy.pdf")
+        # Long enough not to need OCR
+        write_text_pdf(path, [["INSURANCE POLICY DECLARATION", "Named Insured: John Doe"]])
+        processor = PDFProcessor(cache=self.cache)
+        processor.extract_data(path)
+        self.assertIsNotNone(self.cache.get(ExtractionCache.key_for_file(path, processor.extractor_version)))
+
+
+    def test_failed_ocr_is_not_cached(self):
+        from pipeline import Pipeline
+
+        path = write_scanned_pdf(os.path.join(self.tmpdir, "scan.pdf"), 1, dpi=30)
+        for mode in ("eager", "lazy", "pipeline"):
+            with self.subTest(mode=mode):
+                self.cache.clear()
+                failing = PDFProcessor(cache=self.cache, ocr=FlakyOCR(failures=1), lazy_pages=mode == "lazy")
+                if mode == "pipeline":
+                    first = list(Pipeline(failing, rename=False).process([path]))[0]
+                else:
+                    first = failing.process_document(path, rename=False)
+                self.assertEqual(first["new_name"], "Unknown_scan.pdf")
+
+                # The next run, with OCR working again, reads the page instead of the cached failure
+                again = PDFProcessor(cache=self.cache, ocr=FlakyOCR(failures=0)).process_document(path, rename=False)
+                self.assertEqual(again["metadata"]["insured_name"], "John_Doe")
+                self.assertEqual(self.cache.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
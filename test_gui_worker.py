@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import sys
+import threading
+import time
+import unittest
+
+from batch_engine import BatchProgress
+
+HAS_QT = importlib.util.find_spec("PyQt6") is not None
+
+
+class FakeEngine:
+    """Stands in for BatchEngine: one result per file, optionally held at a gate."""
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.threads = set()
+        self.started = threading.Event()
+
+    def process(self, paths, rename=True, cancel_event=None):
+        for path in paths:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            self.threads.add(threading.get_ident())
+            self.started.set()
+            if self.gate is not None:
+                self.gate.wait(5)
+            yield {"path": path, "status": "planned", "doc_type": "POLICY", "metadata": {}, "new_name": None,
+                   "new_path": None, "error": None, "stats": {"spatial_searches": 1, "word_extractions": 2}}
+
+    def close(self):
+        pass
+
+
+class TestBatchProgress(unittest.TestCase):
+    def test_rate_and_eta(self):
+        now = [100.0]
+        progress = BatchProgress(10, clock=lambda: now[0])
+        self.assertIsNone(progress.eta)
+        self.assertIn("ETA --:--", progress.describe())
+        now[0] = 104.0
+        progress.advance(2)
+        self.assertAlmostEqual(progress.rate, 0.5)
+        self.assertAlmostEqual(progress.eta, 16.0)
+        progress.add(10)
+        self.assertAlmostEqual(progress.eta, 36.0)
+        self.assertEqual(progress.describe(), "2/20 files, 0.5 files/s, ETA 0:36")
+
+
+@unittest.skipUnless(HAS_QT, "PyQt6 not installed")
+class TestBatchWorker(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        import main_window
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.window = main_window.MainWindow()
+
+    def tearDown(self):
+        self.window.close()
+
+    def _wait_idle(self):
+        deadline = time.monotonic() + 10
+        while self.window.batches and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+        self.app.processEvents()
+        self.assertEqual(self.window.batches, [])
+
+    def test_runs_off_the_ui_thread(self):
+        engine = self.window.engine = FakeEngine()
+        self.window.process_files(["a.pdf", "b.pdf", "notes.txt", "c.PDF"])
+        self._wait_idle()
+        self.assertNotIn(threading.get_ident(), engine.threads)
+        self.assertEqual(self.window.progress_bar.value(), 3)
+        self.assertTrue(self.window.progress_bar.format().startswith("3/3 files"))
+        self.assertFalse(self.window.cancel_button.isEnabled())
+        log = self.window.log_area.toPlainText()
+        self.assertIn("Skipping non-PDF file: notes.txt", log)
+        self.assertIn("Done: 3 file(s). Spatial fallback used for 3 (100%), word extraction on 6 page(s).", log)
+
+    def test_cancel_stops_queued_files(self):
+        gate = threading.Event()
+        engine = self.window.engine = FakeEngine(gate)
+        self.window.process_files([f"{i}.pdf" for i in range(20)])
+        self.window.process_files(["late.pdf"])
+        # First file is in flight when cancel is pressed
+        self.assertTrue(engine.started.wait(5))
+        self.assertTrue(self.window.cancel_button.isEnabled())
+        self.window.cancel_processing()
+        gate.set()
+        self._wait_idle()
+        log = self.window.log_area.toPlainText()
+        self.assertIn("Cancelled: 1 of 20 file(s) processed.", log)
+        self.assertIn("Cancelled: 0 of 1 file(s) processed.", log)
+        self.assertNotIn("\nlate.pdf\n  Detected Type", log)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from instrumentation import NullRecorder, Recorder, RunProfile
+from renamer_logic import PDFProcessor
+from sample_pdf import write_text_pdf
+
+
+class TestRecorders(unittest.TestCase):
+    def test_recorder_collects_and_feeds_stats(self):
+        stats = Counter()
+        recorder = Recorder(stats)
+        recorder.count("spatial_searches")
+        recorder.count("spatial_searches", 2)
+        with recorder.timer("zone_ocr"):
+            pass
+        with recorder.timer("zone_ocr"):
+            pass
+        recorder.note("name", "regex")
+        recorder.note("name", "spatial")
+        profile = recorder.profile()
+        self.assertEqual(profile["counters"], {"spatial_searches": 3})
+        self.assertEqual(list(profile["timings"]), ["zone_ocr"])
+        self.assertEqual(profile["strategies"], {"name": "spatial"})
+        self.assertEqual(stats["spatial_searches"], 3)
+
+    def test_null_recorder_keeps_only_stats(self):
+        stats = Counter()
+        recorder = NullRecorder(stats)
+        recorder.count("word_extractions")
+        recorder.note("name", "regex")
+        # One shared no-op timer, nothing allocated per call
+        self.assertIs(recorder.timer("a"), recorder.timer("b"))
+        with recorder.timer("a"):
+            pass
+        self.assertIsNone(recorder.profile())
+        self.assertEqual(stats, Counter(word_extractions=1))
+
+    def test_run_profile_sums_documents(self):
+        run = RunProfile()
+        run.add({"path": "a.pdf", "profile": {"counters": {"pages_ocr": 2}, "timings": {"page_ocr": 3.0},
+                                              "strategies": {"name": "spatial"}}})
+        run.add({"path": "b.pdf", "profile": {"counters": {"pages_ocr": 1}, "timings": {"page_ocr": 1.0},
+                                              "strategies": {"name": "regex"}}})
+        run.add({"path": "c.pdf", "profile": None})
+        summary = run.summary()
+        self.assertEqual(summary["documents"], 2)
+        self.assertEqual(summary["counters"], {"pages_ocr": 3})
+        self.assertEqual(summary["timings"]["page_ocr"], {"total": 4.0, "mean": 2.0, "max": 3.0, "slowest": "a.pdf"})
+        self.assertEqual(summary["strategies"], {"name": {"spatial": 1, "regex": 1}})
+        self.assertIn("page_ocr", run.describe())
+
+
+class TestProcessorProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.regex_pdf = write_text_pdf(os.path.join(self.tmp.name, "regex.pdf"), [[
+            "INSURANCE POLICY DECLARATION",
+            "Named Insured: John Doe",
+            "Policy Period: 01/25/2026 to 01/25/2027",
+            "Company: Geico",
+        ], ["Deductible schedule"]])
+        # Name only found by the spatial search (label above the value, another column beside it)
+        self.spatial_pdf = write_text_pdf(os.path.join(self.tmp.name, "spatial.pdf"), [[
+            (72, 72, "POLICY DECLARATIONS"), (72, 110, "NAMED INSURED"), (320, 110, "AGENT"),
+            (72, 126, "Maria Garcia"), (320, 126, "Main Street Insurance Agency"),
+            (72, 160, "Company: Travelers"), (72, 176, "Effective Date: 03/04/2026"),
+        ]])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profile_off_by_default(self):
+        processor = PDFProcessor()
+        result = processor.process_document(self.regex_pdf, rename=False)
+        self.assertIsNone(result["profile"])
+        self.assertEqual(processor.stats["pages_extracted"], 2)
+
+    def test_profile_per_document(self):
+        processor = PDFProcessor(profile=True)
+        regex = processor.process_document(self.regex_pdf, rename=False)["profile"]
+        self.assertEqual(regex["counters"]["pages_extracted"], 2)
+        self.assertNotIn("spatial_searches", regex["counters"])
+        self.assertEqual(regex["strategies"], {"name": "regex", "date": "term", "company": "known"})
+        self.assertIn("text_extraction", regex["timings"])
+        self.assertIn("company_match", regex["timings"])
+
+        result = processor.process_document(self.spatial_pdf, rename=False)
+        spatial = result["profile"]
+        self.assertEqual(result["metadata"]["insured_name"], "Maria_Garcia")
+        self.assertEqual(spatial["strategies"]["name"], "spatial")
+        self.assertGreaterEqual(spatial["counters"]["spatial_searches"], 1)
+        self.assertEqual(spatial["counters"]["spatial_searches"], result["stats"]["spatial_searches"])
+        self.assertIn("spatial_search", spatial["timings"])
+        # Running totals still cover both documents
+        self.assertEqual(processor.stats["pages_extracted"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from renamer_logic import PDFProcessor, DocumentType
+from sample_pdf import write_text_pdf
+
+FILLER = ["This page continues the policy schedule and has no identifying data at all."]
+
+
+class TestLazyPages(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.processor = PDFProcessor(lazy_pages=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, pages):
+        path = os.path.join(self.tmpdir, name)
+        write_text_pdf(path, pages)
+        return path
+
+    def test_stops_after_first_page(self):
+        path = self._write("a.pdf", [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+             "Effective Date: 01/25/2026", "Underwritten by: Geico"],
+            FILLER, FILLER, FILLER,
+        ])
+        result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["pages_read"], 1)
+        self.assertEqual(result["new_name"], "John_Doe_Geico_DEC_EFF_01-25-2026.pdf")
+
+    def test_reads_until_fields_complete(self):
+        path = self._write("b.pdf", [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe", "Underwritten by: Geico"],
+            FILLER,
+            ["Effective Date: 01/25/2026"],
+            FILLER,
+        ])
+        result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["pages_read"], 3)
+        self.assertEqual(result["metadata"]["date"], "01-25-2026")
+
+    def test_unknown_type_reads_every_page(self):
+        path = self._write("c.pdf", [FILLER, FILLER, FILLER])
+        result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["pages_read"], 3)
+        self.assertEqual(result["doc_type"], DocumentType.UNKNOWN.name)
+
+    def test_matches_eager_result_when_complete(self):
+        path = self._write("d.pdf", [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: Jane Smith",
+             "Policy Period: 03/15/2026 to 03/15/2027", "Underwritten by: Chubb"],
+            FILLER,
+        ])
+        lazy = self.processor.process_document(path, rename=False)
+        eager = PDFProcessor().process_document(path, rename=False)
+        self.assertEqual(lazy["new_name"], eager["new_name"])
+        self.assertEqual(eager["pages_read"], 2)
+
+    def test_read_error_keeps_the_pages_read(self):
+        path = self._write("e.pdf", [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe", "Effective Date: 01/25/2026"],
+            FILLER, FILLER,
+        ])
+        extract_page = PDFProcessor.extract_page
+
+        def damaged(processor, filepath, session, i):
+            if i == 1:
+                raise ValueError("damaged page")
+            return extract_page(processor, filepath, session, i)
+
+        with mock.patch.object(PDFProcessor, "extract_page", damaged):
+            lazy = self.processor.process_document(path, rename=False)
+            eager = PDFProcessor().process_document(path, rename=False)
+        self.assertEqual(lazy["pages_read"], 1)
+        self.assertEqual(lazy["doc_type"], DocumentType.POLICY.name)
+        self.assertEqual(lazy["metadata"]["insured_name"], "John_Doe")
+        self.assertEqual(lazy["new_name"], eager["new_name"])
+
+    def test_analysis_errors_are_not_read_errors(self):
+        path = self._write("f.pdf", [FILLER])
+        with mock.patch.object(PDFProcessor, "_analyze_content", side_effect=RuntimeError("bug")):
+            result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["error"], "Error: bug")
+
+
+if __name__ == '__main__':
+    unittest.main()
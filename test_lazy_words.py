@@ -0,0 +1,79 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from renamer_logic import PDFProcessor
+from extraction_cache import ExtractionCache
+from document_session import PageData
+from extraction_backends import TwoPassBackend, SinglePassBackend
+from sample_pdf import write_text_pdf
+
+
+class TestLazyWords(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # Two-pass backend defers words, which is what these tests exercise
+        self.processor = PDFProcessor(backend=TwoPassBackend())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self, name, lines):
+        path = os.path.join(self.tmpdir, name)
+        write_text_pdf(path, [lines])
+        return path
+
+    def test_regex_path_skips_word_extraction(self):
+        path = self._write("a.pdf", ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+                                     "Effective Date: 01/25/2026", "Underwritten by: Geico"])
+        result = self.processor.process_document(path, rename=False)
+        self.assertEqual(result["metadata"]["insured_name"], "John_Doe")
+        self.assertEqual(result["stats"], {"spatial_searches": 0, "word_extractions": 0})
+
+    def test_spatial_path_extracts_words(self):
+        path = self._write("b.pdf", ["Quarterly statement for the account holder listed on file",
+                                     "No labelled fields appear anywhere in this document"])
+        result = self.processor.process_document(path, rename=False)
+        self.assertGreater(result["stats"]["spatial_searches"], 0)
+        self.assertEqual(result["stats"]["word_extractions"], 1)
+
+    def test_words_memoized_and_loaded_after_close(self):
+        path = self._write("c.pdf", ["Named Insured: John Doe"])
+        data = self.processor.extract_data(path)  # session already closed here
+        page = data["pages"][0]
+        self.assertFalse(page.words_loaded)
+        self.assertIn("words", page)
+        words = page.get("words")
+        self.assertEqual(words[0]["text"], "Named")
+        self.assertIs(page["words"], words)
+        self.assertEqual(self.processor.stats["word_extractions"], 1)
+
+    def test_single_pass_backend_needs_no_second_pass(self):
+        path = self._write("e.pdf", ["Quarterly statement for the account holder listed on file"])
+        result = PDFProcessor(backend=SinglePassBackend()).process_document(path, rename=False)
+        self.assertGreater(result["stats"]["spatial_searches"], 0)
+        self.assertEqual(result["stats"]["word_extractions"], 0)
+
+    def test_pickles_as_plain_dict(self):
+        page = PageData(lambda: [{"text": "x"}], text="x")
+        restored = pickle.loads(pickle.dumps(page))
+        self.assertIs(type(restored), dict)
+        self.assertEqual(restored["words"], [{"text": "x"}])
+
+    def test_cache_entry_without_words_loads_on_demand(self):
+        cache = ExtractionCache(os.path.join(self.tmpdir, "cache.sqlite3"))
+        processor = PDFProcessor(cache=cache, backend=TwoPassBackend())
+        # Long enough not to need OCR
+        path = self._write("d.pdf", ["Named Insured: John Doe", "Effective Date: 01/25/2026 Company: Geico"])
+        processor.extract_data(path)
+        cached = processor.extract_data(path)
+        self.assertEqual(cache.hits, 1)
+        self.assertFalse(cached["pages"][0].words_loaded)
+        self.assertEqual(cached["pages"][0]["words"][1]["text"], "Insured:")
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
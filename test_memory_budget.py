@@ -0,0 +1,159 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from document_session import DocumentSession
+from memory_budget import MemoryBudget, current_rss_mb
+from renamer_logic import PDFProcessor
+from sample_pdf import write_scanned_pdf, write_text_pdf
+
+POLICY = ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+          "Effective Date: 01/25/2026", "Company: Geico"]
+
+# Peak RSS allowed for a whole 300-page document in bounded mode. Unbounded,
+# the scan below peaks around 260 MB (five retained 300 DPI rasters) and the
+# text PDF around 85 MB; bounded they stay near 130 MB and 55 MB.
+RSS_BUDGET_MB = 180
+
+# Runs in a fresh interpreter so its peak RSS is this one document's. VmHWM,
+# not ru_maxrss: the latter keeps the parent's high-water mark across exec.
+_MEASURE = textwrap.dedent("""
+    import json, re, sys
+    from renamer_logic import PDFProcessor
+
+    class FakeOCR:
+        pool_size = 1
+        def image_to_string(self, image, config=""):
+            return "\\n".join(%r)
+
+    processor = PDFProcessor(ocr=FakeOCR(), profile=True, memory_limit_mb=%d)
+    result = processor.process_document(sys.argv[1], rename=False)
+    print(json.dumps({"status": result["status"], "pages_read": result["pages_read"],
+                      "counters": result["profile"]["counters"],
+                      "peak_mb": int(re.search(r"VmHWM:\\s+(\\d+)", open("/proc/self/status").read()).group(1)) / 1024}))
+""")
+
+
+class FakeOCR:
+    pool_size = 1
+
+    def image_to_string(self, image, config=""):
+        return "\n".join(POLICY)
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_release_frees_then_rechecks(self):
+        rss = [500]
+        freed = []
+
+        def free():
+            freed.append(True)
+            rss[0] = 100
+
+        budget = MemoryBudget(200, rss=lambda: rss[0])
+        self.assertTrue(budget.exceeded())
+        self.assertTrue(budget.release(free))
+        self.assertEqual(freed, [True])
+        self.assertFalse(budget.exceeded())
+
+    def test_unknown_rss_never_trips(self):
+        self.assertFalse(MemoryBudget(1, rss=lambda: None).exceeded())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "reads /proc")
+    def test_current_rss(self):
+        self.assertGreater(current_rss_mb(), 1)
+
+
+class TestBoundedProcessing(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_session_keeps_one_raster(self):
+        pdf = write_scanned_pdf(os.path.join(self.tmp.name, "scan.pdf"), 3, dpi=50)
+        with DocumentSession(pdf, max_pages=2, bounded=True) as session:
+            self.assertEqual(session.page_count, 2)
+            first = session.raster(0)
+            session.raster(1)
+            self.assertEqual(list(session._rasters), [1])
+            self.assertIsNot(session.raster(0), first)
+            session.release_page(0)
+            self.assertEqual(session._rasters, {})
+
+    def test_ceiling_stops_reading_pages(self):
+        pdf = write_text_pdf(os.path.join(self.tmp.name, "a.pdf"), [POLICY, ["Schedule"], ["Forms"]])
+        processor = PDFProcessor(profile=True, memory_limit_mb=100)
+        rss = iter([150, 50, 150, 150])
+        processor.memory_budget = MemoryBudget(100, rss=lambda: next(rss, 50))
+        result = processor.process_document(pdf, rename=False)
+        # Page 1 read after a release brought RSS down; before page 2 the release was not enough
+        self.assertEqual(result["pages_read"], 1)
+        self.assertEqual(result["metadata"]["insured_name"], "John_Doe")
+        self.assertEqual(result["profile"]["counters"]["memory_releases"], 2)
+        self.assertEqual(result["profile"]["counters"]["memory_stops"], 1)
+
+    def test_truncated_extraction_is_not_cached(self):
+        from extraction_cache import ExtractionCache
+        from pipeline import Pipeline
+
+        pdf = write_text_pdf(os.path.join(self.tmp.name, "a.pdf"), [POLICY])
+        cache = ExtractionCache(os.path.join(self.tmp.name, "cache.sqlite3"))
+        for options in ({}, {"lazy_pages": True}, "pipeline"):
+            with self.subTest(options=options):
+                stopped = PDFProcessor(cache=cache, memory_limit_mb=1, **(options if options != "pipeline" else {}))
+                stopped.memory_budget = MemoryBudget(1, rss=lambda: 100)
+                if options == "pipeline":
+                    result = list(Pipeline(stopped, rename=False).process([pdf]))[0]
+                else:
+                    result = stopped.process_document(pdf, rename=False)
+                self.assertEqual(result["status"], "no_text")
+                self.assertTrue(result["truncated"])
+
+                # A later run without a limit still reads the file
+                again = PDFProcessor(cache=cache).process_document(pdf, rename=False)
+                self.assertEqual(again["status"], "planned")
+                self.assertFalse(again["truncated"])
+                cache.clear()
+
+    def test_bounded_results_match(self):
+        pdf = write_text_pdf(os.path.join(self.tmp.name, "a.pdf"), [POLICY, ["Schedule"]])
+        plain = PDFProcessor(ocr=FakeOCR()).process_document(pdf, rename=False)
+        bounded = PDFProcessor(ocr=FakeOCR(), bounded_memory=True).process_document(pdf, rename=False)
+        self.assertEqual(bounded["new_name"], plain["new_name"])
+        self.assertEqual(bounded["pages_read"], 2)
+
+    def _measure(self, pdf):
+        code = _MEASURE % (POLICY, RSS_BUDGET_MB)
+        here = os.path.dirname(os.path.abspath(__file__))
+        proc = subprocess.run([sys.executable, "-c", code, pdf], cwd=here,
+                              capture_output=True, text=True, timeout=600)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "peak RSS from /proc")
+    def test_large_scan_under_budget(self):
+        pdf = write_scanned_pdf(os.path.join(self.tmp.name, "batch.pdf"), 300)
+        run = self._measure(pdf)
+        self.assertEqual(run["status"], "planned")
+        self.assertEqual(run["pages_read"], 5)
+        self.assertEqual(run["counters"]["pages_ocr"], 5)
+        self.assertLess(run["peak_mb"], RSS_BUDGET_MB)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "peak RSS from /proc")
+    def test_large_text_pdf_under_budget(self):
+        lines = [f"Line {n} of the schedule of forms and endorsements, coverage part {n % 7}" for n in range(60)]
+        pdf = write_text_pdf(os.path.join(self.tmp.name, "merged.pdf"), [POLICY + lines] + [lines] * 299)
+        run = self._measure(pdf)
+        self.assertEqual(run["status"], "planned")
+        self.assertEqual(run["pages_read"], 5)
+        self.assertLess(run["peak_mb"], RSS_BUDGET_MB)
+
+
+if __name__ == "__main__":
+    unittest.main()
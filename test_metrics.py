@@ -0,0 +1,132 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+
+import renamer_cli
+from metrics import Metrics, MetricsServer, TextfileWriter, RATE_WINDOW
+from sample_pdf import write_text_pdf
+
+
+def _result(status="renamed", doc_type="POLICY", timings=None, counters=None, profile_timings=None):
+    profile = None
+    if counters is not None:
+        profile = {"counters": counters, "timings": profile_timings or {}, "strategies": {}}
+    return {"path": "a.pdf", "status": status, "doc_type": doc_type,
+            "timings": timings or {"extract": 0.2, "analyze": 0.01, "rename": 0.0, "total": 0.21},
+            "profile": profile}
+
+
+def _samples(text):
+    """{'name{labels}': value} for every sample line."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return samples
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counts_types_and_ocr(self):
+        metrics = Metrics()
+        metrics.observe(_result(counters={"pages_extracted": 3, "pages_ocr": 2, "cache_misses": 1}))
+        metrics.observe(_result(doc_type="INVOICE", counters={"pages_extracted": 1, "cache_hits": 1}))
+        metrics.observe(_result(status="no_text", doc_type=None, counters={"pages_extracted": 1, "cache_misses": 1}))
+        metrics.observe({"path": "notes.txt", "status": "skipped", "doc_type": None, "timings": {}, "profile": None})
+        s = _samples(metrics.render())
+        self.assertEqual(s['pdf_renamer_documents_total{status="renamed"}'], 2)
+        self.assertEqual(s['pdf_renamer_documents_total{status="skipped"}'], 1)
+        self.assertEqual(s['pdf_renamer_documents_by_type_total{doc_type="INVOICE"}'], 1)
+        self.assertEqual(s["pdf_renamer_pages_total"], 5)
+        self.assertEqual(s["pdf_renamer_ocr_pages_total"], 2)
+        self.assertAlmostEqual(s["pdf_renamer_ocr_fallback_ratio"], 0.3333)
+        self.assertEqual(s['pdf_renamer_cache_requests_total{result="hit"}'], 1)
+        self.assertAlmostEqual(s["pdf_renamer_cache_hit_ratio"], 0.3333)
+
+    def test_histogram_buckets_are_cumulative(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics.observe(_result(timings={"extract": 0.05, "total": 0.05}))
+        metrics.observe(_result(timings={"extract": 0.5, "rename": 0.0, "total": 0.5},
+                                counters={}, profile_timings={"zone_ocr": 2.0}))
+        s = _samples(metrics.render())
+        self.assertEqual(s['pdf_renamer_stage_duration_seconds_bucket{stage="extract",le="0.1"}'], 1)
+        self.assertEqual(s['pdf_renamer_stage_duration_seconds_bucket{stage="extract",le="1.0"}'], 2)
+        self.assertEqual(s['pdf_renamer_stage_duration_seconds_bucket{stage="extract",le="+Inf"}'], 2)
+        self.assertAlmostEqual(s['pdf_renamer_stage_duration_seconds_sum{stage="extract"}'], 0.55)
+        self.assertEqual(s['pdf_renamer_stage_duration_seconds_bucket{stage="zone_ocr",le="1.0"}'], 0)
+        self.assertEqual(s['pdf_renamer_stage_duration_seconds_count{stage="zone_ocr"}'], 1)
+        # A stage that did not run is not observed
+        self.assertNotIn('pdf_renamer_stage_duration_seconds_count{stage="rename"}', s)
+
+    def test_rate_covers_the_recent_window(self):
+        clock = FakeClock()
+        metrics = Metrics(clock=clock)
+        for _ in range(30):
+            metrics.observe(_result())
+        self.assertAlmostEqual(metrics.documents_per_second(), 30 / RATE_WINDOW)
+        clock.now += RATE_WINDOW + 1
+        metrics.observe(_result())
+        self.assertAlmostEqual(metrics.documents_per_second(), 1 / RATE_WINDOW)
+
+    def test_queue_sources_and_label_escaping(self):
+        metrics = Metrics()
+        metrics.add_queue_source(lambda: {"read": 3, 'we"ird\\': 1})
+        metrics.add_queue_source(lambda: 1 / 0)
+        text = metrics.render()
+        self.assertIn('pdf_renamer_queue_depth{queue="read"} 3', text)
+        self.assertIn('pdf_renamer_queue_depth{queue="we\\"ird\\\\"} 1', text)
+        self.assertIn("# TYPE pdf_renamer_stage_duration_seconds histogram", text)
+
+    def test_http_endpoint(self):
+        metrics = Metrics()
+        metrics.observe(_result())
+        server = MetricsServer(metrics, port=0).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=10) as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain; version=0.0.4"))
+                body = response.read().decode("utf-8")
+        finally:
+            server.close()
+        self.assertIn('pdf_renamer_documents_total{status="renamed"} 1', body)
+
+    def test_textfile_is_rewritten(self):
+        metrics = Metrics()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "collector", "renamer.prom")
+            writer = TextfileWriter(metrics, path, interval=3600).start()
+            self.assertIn("pdf_renamer_pages_total 0", open(path).read())
+            metrics.observe(_result(counters={"pages_extracted": 2}))
+            writer.close()
+            self.assertIn("pdf_renamer_pages_total 2", open(path).read())
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["renamer.prom"])
+
+    def test_cli_writes_metrics_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf = write_text_pdf(os.path.join(tmp, "a.pdf"), [[
+                "INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+                "Effective Date: 01/25/2026", "Company: Geico"]])
+            prom = os.path.join(tmp, "renamer.prom")
+            args = renamer_cli.build_parser().parse_args(["-n", "-j", "1", "--metrics-file", prom, pdf])
+            out, err = io.StringIO(), io.StringIO()
+            self.assertEqual(renamer_cli.run(args, out, err), 0)
+            line = json.loads(out.getvalue())
+            # Metrics turn the per-document profile on
+            self.assertEqual(line["profile"]["counters"]["pages_extracted"], 1)
+            s = _samples(open(prom).read())
+        self.assertEqual(s['pdf_renamer_documents_by_type_total{doc_type="POLICY"}'], 1)
+        self.assertEqual(s["pdf_renamer_pages_total"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
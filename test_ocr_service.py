@@ -0,0 +1,130 @@
+import threading
+import time
+import types
+import unittest
+from unittest import mock
+
+import ocr_service
+from ocr_service import OCRService
+
+
+class FakeTessAPI:
+    """Records which thread builds and uses each API and the page segmentation mode of every call."""
+
+    instances = []
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.thread = threading.current_thread()
+        self.callers = set()
+        self.psm = 3  # tesserocr.PSM.AUTO
+        self.image = None
+        self.ended = False
+        FakeTessAPI.instances.append(self)
+
+    def GetPageSegMode(self):
+        return 3
+
+    def SetPageSegMode(self, psm):
+        self.psm = psm
+
+    def SetImage(self, image):
+        self.callers.add(threading.current_thread())
+        self.image = image
+
+    def GetUTF8Text(self):
+        time.sleep(0.01)
+        return f"{self.image}|psm {self.psm}"
+
+    def End(self):
+        self.ended = True
+
+
+class TestOCRService(unittest.TestCase):
+    def setUp(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        patcher = mock.patch.object(ocr_service, "tesserocr", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fake_ocr(self, image, lang=None, config=""):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return f"{image}|{config}"
+
+    def test_results_and_bounded_concurrency(self):
+        service = OCRService(pool_size=2, queue_depth=3)
+        with mock.patch.object(ocr_service.pytesseract, "image_to_string", side_effect=self._fake_ocr):
+            futures = [service.submit(f"img{i}", "--psm 7") for i in range(8)]
+            results = [f.result(timeout=5) for f in futures]
+        service.close()
+        self.assertEqual(results, [f"img{i}|--psm 7" for i in range(8)])
+        self.assertLessEqual(self.peak, 2)
+        self.assertEqual(service.pending, 0)
+
+    def test_errors_surface_on_future(self):
+        service = OCRService(pool_size=1)
+        with mock.patch.object(ocr_service.pytesseract, "image_to_string", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                service.image_to_string("img")
+        service.close()
+
+    def test_tesserocr_api_per_worker(self):
+        FakeTessAPI.instances = []
+        fake = types.SimpleNamespace(PyTessBaseAPI=FakeTessAPI)
+        with mock.patch.object(ocr_service, "tesserocr", fake):
+            service = OCRService(pool_size=2, queue_depth=4)
+            self.assertEqual(service.backend, "tesserocr")
+            # Zone OCR (--psm 7) and full pages (no config) interleaved on the same workers
+            configs = ["--psm 7" if i % 2 else "" for i in range(12)]
+            futures = [service.submit(f"img{i}", config) for i, config in enumerate(configs)]
+            results = [f.result(timeout=5) for f in futures]
+            service.close()
+        self.assertEqual(results, [f"img{i}|psm {7 if i % 2 else 3}" for i in range(12)])
+        # One API per worker thread, built on first use and reused for every later call
+        self.assertEqual(len(FakeTessAPI.instances), 2)
+        self.assertEqual(len({api.thread for api in FakeTessAPI.instances}), 2)
+        for api in FakeTessAPI.instances:
+            self.assertEqual(api.callers, {api.thread})
+            self.assertEqual(api.lang, "eng")
+            self.assertTrue(api.ended)
+
+    def test_parse_psm(self):
+        self.assertEqual(ocr_service._parse_psm("--psm 7"), 7)
+        self.assertIsNone(ocr_service._parse_psm(""))
+
+    def test_env_settings(self):
+        with mock.patch.dict(ocr_service.os.environ, {"PDFRENAMER_OCR_WORKERS": "3"}):
+            self.assertEqual(ocr_service._env_int("PDFRENAMER_OCR_WORKERS", 4), 3)
+        # Unset or 0 means the default; anything malformed is reported, not fatal at import
+        for value, warns in (("", False), ("0", False), ("four", True), ("2.5", True), ("-1", True)):
+            with mock.patch.dict(ocr_service.os.environ, {"PDFRENAMER_OCR_WORKERS": value}), \
+                    mock.patch("builtins.print") as warning:
+                self.assertEqual(ocr_service._env_int("PDFRENAMER_OCR_WORKERS", 4), 4, value)
+            self.assertEqual(warning.called, warns, value)
+
+    def test_shared_service_is_reused(self):
+        previous = ocr_service._shared_service
+
+        def restore():
+            if ocr_service._shared_service not in (None, previous):
+                ocr_service._shared_service.close()
+            ocr_service._shared_service = previous
+
+        # Later tests get the shared service they would have had without this one
+        self.addCleanup(restore)
+        first = ocr_service.get_ocr_service()
+        self.assertIs(ocr_service.get_ocr_service(), first)
+        configured = ocr_service.configure_ocr_service(pool_size=3, queue_depth=5)
+        self.assertEqual((configured.pool_size, configured.queue_depth), (3, 5))
+        self.assertIs(ocr_service.get_ocr_service(), configured)
+
+
+if __name__ == '__main__':
+    unittest.main()
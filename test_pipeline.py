@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from pipeline import STAGES, Pipeline
+from renamer_logic import PDFProcessor
+from sample_pdf import write_text_pdf
+
+POLICY = ["INSURANCE POLICY DECLARATION", "Named Insured: {}", "Effective Date: 01/25/2026", "Company: Geico"]
+
+
+class SlowOCR:
+    """Stands in for OCRService: every page image takes `delay` seconds."""
+
+    pool_size = 2
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def image_to_string(self, image, config=""):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return "\n".join(POLICY).format("Scanned Person")
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _text_pdf(self, name, insured):
+        path = os.path.join(self.tmpdir, name)
+        write_text_pdf(path, [[line.format(insured) for line in POLICY]])
+        return path
+
+    def _scanned_pdf(self, name):
+        path = os.path.join(self.tmpdir, name)
+        write_text_pdf(path, [["."]])
+        return path
+
+    def test_matches_process_document(self):
+        paths = [self._text_pdf(f"doc{i}.pdf", name) for i, name in enumerate(["John Doe", "Jane Smith", "Wang Wei"])]
+        expected = {p: PDFProcessor().process_document(p, rename=False) for p in paths}
+        pipeline = Pipeline(PDFProcessor(), rename=False)
+        results = list(pipeline.process(paths + [os.path.join(self.tmpdir, "notes.txt")]))
+        self.assertEqual(len(results), 4)
+        for result in results:
+            if result["path"].endswith(".txt"):
+                self.assertEqual(result["status"], "skipped")
+                continue
+            for key in ("status", "doc_type", "metadata", "new_name", "pages_read", "stats"):
+                self.assertEqual(result[key], expected[result["path"]][key], key)
+            self.assertGreater(result["timings"]["total"], 0)
+        snapshot = pipeline.snapshot()
+        self.assertEqual(snapshot["analyze"]["done"], 3)
+        self.assertEqual(snapshot["ocr"]["done"], 0)
+
+    def test_lazy_pages_stop_early(self):
+        path = os.path.join(self.tmpdir, "long.pdf")
+        write_text_pdf(path, [[line.format("John Doe") for line in POLICY],
+                              ["Schedule of forms and endorsements"], ["Conditions"]])
+        expected = PDFProcessor(lazy_pages=True).process_document(path, rename=False)
+        pipeline = Pipeline(PDFProcessor(lazy_pages=True), rename=False)
+        result, = pipeline.process([path])
+        self.assertEqual(result["pages_read"], 1)
+        for key in ("status", "doc_type", "metadata", "new_name", "pages_read", "stats"):
+            self.assertEqual(result[key], expected[key], key)
+        self.assertEqual(pipeline.snapshot()["ocr"]["done"], 0)
+
+    def test_renames(self):
+        path = self._text_pdf("scan001.pdf", "John Doe")
+        result, = Pipeline(PDFProcessor()).process([path])
+        self.assertEqual(result["status"], "renamed")
+        self.assertEqual(os.path.basename(result["new_path"]), "John_Doe_Geico_DEC_EFF_01-25-2026.pdf")
+        self.assertFalse(os.path.exists(path))
+
+    def test_text_files_pass_scanned_ones(self):
+        ocr = SlowOCR(0.5)
+        scanned = [self._scanned_pdf(f"scan{i}.pdf") for i in range(4)]
+        text = [self._text_pdf(f"text{i}.pdf", "John Doe") for i in range(6)]
+        # Scanned files first in line
+        order = [r["path"] for r in Pipeline(PDFProcessor(ocr=ocr), rename=False).process(scanned + text)]
+        self.assertEqual(ocr.calls, 4)
+        self.assertEqual(set(order[:6]), set(text))
+
+    def test_backpressure_bounds_documents_in_flight(self):
+        ocr = SlowOCR(0.02)
+        paths = [self._scanned_pdf(f"scan{i}.pdf") for i in range(30)]
+        pipeline = Pipeline(PDFProcessor(ocr=ocr), rename=False, workers=dict.fromkeys(STAGES, 1),
+                            queue_sizes=dict.fromkeys(STAGES, 1))
+        peak = 0
+        for _ in pipeline.process(paths):
+            peak = max(peak, len(pipeline._in_flight))
+        # One per queue and worker, plus the one enumerate is waiting to queue
+        self.assertLessEqual(peak, 2 * len(STAGES) + 1)
+        self.assertEqual(pipeline.snapshot()["ocr"]["done"], 30)
+
+    def test_failing_path_iterator_ends_the_run(self):
+        paths = [self._text_pdf(f"doc{i}.pdf", "John Doe") for i in range(2)]
+
+        def walk():
+            yield from paths
+            raise PermissionError("walk denied")
+
+        pipeline = Pipeline(PDFProcessor(), rename=False)
+        results = []
+        with self.assertRaises(PermissionError):
+            for result in pipeline.process(walk()):
+                results.append(result)
+        # The documents found before the error are still processed
+        self.assertEqual(sorted(r["path"] for r in results), paths)
+        self.assertEqual(pipeline._in_flight, set())
+
+    def test_stopping_early_closes_documents(self):
+        paths = [self._text_pdf(f"doc{i}.pdf", "John Doe") for i in range(10)]
+        pipeline = Pipeline(PDFProcessor(), rename=False)
+        results = pipeline.process(paths)
+        next(results)
+        results.close()
+        self.assertEqual(pipeline._in_flight, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
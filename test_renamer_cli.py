@@ -0,0 +1,144 @@
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import renamer_cli
+from renamer_logic import PDFProcessor
+from sample_pdf import write_text_pdf
+
+
+class TestRenamerCli(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmpdir, "sub"))
+        self.paths = []
+        for name, insured in [("a.pdf", "John Doe"), ("sub/b.PDF", "Jane Smith")]:
+            path = os.path.join(self.tmpdir, name)
+            write_text_pdf(path, [[
+                "INSURANCE POLICY DECLARATION",
+                f"Named Insured: {insured}",
+                "Effective Date: 01/25/2026",
+                "Company: Geico",
+            ]])
+            self.paths.append(path)
+        with open(os.path.join(self.tmpdir, "notes.txt"), "w") as f:
+            f.write("not a pdf")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _run(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        args = renamer_cli.build_parser().parse_args(list(argv))
+        status = renamer_cli.run(args, out, err)
+        return status, [json.loads(line) for line in out.getvalue().splitlines()], err.getvalue()
+
+    def test_directories_are_walked_for_pdfs(self):
+        self.assertEqual(list(renamer_cli.iter_pdf_paths([self.tmpdir])), self.paths)
+
+    def test_dry_run_streams_one_line_per_document(self):
+        for jobs in ("1", "2"):
+            status, lines, err = self._run("--dry-run", "--jobs", jobs, self.tmpdir)
+            self.assertEqual(status, 0)
+            self.assertEqual(sorted(line["path"] for line in lines), self.paths)
+            by_path = {line["path"]: line for line in lines}
+            first = by_path[self.paths[0]]
+            self.assertEqual(first["status"], "planned")
+            self.assertEqual(first["doc_type"], "POLICY")
+            self.assertEqual(first["new_name"], "John_Doe_Geico_DEC_EFF_01-25-2026.pdf")
+            self.assertGreater(first["timings"]["total"], 0)
+            self.assertIn("elapsed", first)
+            self.assertIn("2 file(s)", err)
+            self.assertTrue(all(os.path.exists(p) for p in self.paths))
+
+    def test_renames_in_place(self):
+        broken = os.path.join(self.tmpdir, "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"%PDF-1.4 truncated")
+        status, lines, _ = self._run("--jobs", "1", self.paths[0], broken)
+        self.assertEqual(status, 0)
+        self.assertEqual([line["status"] for line in lines], ["renamed", "no_text"])
+        self.assertTrue(os.path.exists(lines[0]["new_path"]))
+
+    def test_journal_and_undo(self):
+        journal = os.path.join(self.tmpdir, "renames.jsonl")
+        status, lines, _ = self._run("--jobs", "2", "--journal", journal, *self.paths)
+        self.assertEqual(status, 0)
+        self.assertFalse(any(os.path.exists(p) for p in self.paths))
+
+        out, err = io.StringIO(), io.StringIO()
+        args = renamer_cli.build_parser().parse_args(["--undo", journal])
+        self.assertEqual(renamer_cli.undo(args, out, err), 0)
+        self.assertEqual([json.loads(line)["status"] for line in out.getvalue().splitlines()],
+                         ["restored", "restored"])
+        self.assertTrue(all(os.path.exists(p) for p in self.paths))
+
+    def test_split_writes_each_document(self):
+        batch = write_text_pdf(os.path.join(self.tmpdir, "batch.pdf"), [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe", "Effective Date: 01/25/2026",
+             "Company: Geico", "Page 1 of 2"],
+            ["Schedule of forms and endorsements for this policy period", "Page 2 of 2"],
+            ["INVOICE", "Insured Name: Jane Smith", "Invoice Date: 02/10/2026", "Company: Travelers"],
+        ])
+        out_dir = os.path.join(self.tmpdir, "split")
+        out, err = io.StringIO(), io.StringIO()
+        args = renamer_cli.build_parser().parse_args(["--split", "--split-dir", out_dir, batch])
+        self.assertEqual(renamer_cli.split(args, out, err), 0)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["pages"] for line in lines], [[1, 2], [3, 3]])
+        self.assertEqual(sorted(os.listdir(out_dir)), ["Jane_Smith_Travelers_Invoice_02-10-2026.pdf",
+                                                       "John_Doe_Geico_DEC_EFF_01-25-2026.pdf"])
+        self.assertIn("Split into 2 document(s)", err.getvalue())
+        self.assertTrue(os.path.exists(batch))
+
+    def test_split_undo_removes_the_documents(self):
+        batch = write_text_pdf(os.path.join(self.tmpdir, "batch.pdf"), [
+            ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe", "Effective Date: 01/25/2026",
+             "Company: Geico"],
+            ["INVOICE", "Insured Name: Jane Smith", "Invoice Date: 02/10/2026", "Company: Travelers"],
+        ])
+        out_dir = os.path.join(self.tmpdir, "split")
+        journal = os.path.join(self.tmpdir, "renames.jsonl")
+        out, err = io.StringIO(), io.StringIO()
+        args = renamer_cli.build_parser().parse_args(["--split", "--split-dir", out_dir, "--journal", journal, batch])
+        self.assertEqual(renamer_cli.split(args, out, err), 0)
+        self.assertEqual(len(os.listdir(out_dir)), 2)
+
+        out, err = io.StringIO(), io.StringIO()
+        args = renamer_cli.build_parser().parse_args(["--undo", journal])
+        self.assertEqual(renamer_cli.undo(args, out, err), 0)
+        self.assertEqual([json.loads(line)["status"] for line in out.getvalue().splitlines()],
+                         ["removed", "removed"])
+        # No outputs left behind, none restored into hidden temporary files
+        self.assertEqual(os.listdir(out_dir), [])
+        self.assertTrue(os.path.exists(batch))
+
+        out, err = io.StringIO(), io.StringIO()
+        self.assertEqual(renamer_cli.undo(args, out, err), 0)
+        self.assertEqual([json.loads(line)["status"] for line in out.getvalue().splitlines()],
+                         ["missing", "missing"])
+
+    def test_errors_set_exit_status(self):
+        failed = {"path": self.paths[0], "status": "error", "error": "Error: boom"}
+        with mock.patch.object(PDFProcessor, "process_document", return_value=failed):
+            status, lines, err = self._run("--jobs", "1", self.paths[0])
+        self.assertEqual(status, 1)
+        self.assertEqual(lines[0]["error"], "Error: boom")
+        self.assertIn("error: 1", err)
+
+    def test_messages_stay_off_the_json_stream(self):
+        proc = subprocess.run([sys.executable, renamer_cli.__file__, "-n", "-j", "1", self.tmpdir, os.path.join(self.tmpdir, "missing.pdf")],
+                              capture_output=True, text=True, timeout=120)
+        lines = [json.loads(line) for line in proc.stdout.splitlines()]
+        self.assertEqual(len(lines), 3)
+        self.assertIn("file(s) in", proc.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
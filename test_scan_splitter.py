@@ -0,0 +1,158 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pdfplumber
+import pypdfium2
+
+from document_classifier import DocumentClassifier
+from renamer_logic import CLASSIFIER_RULES, DocumentType, PDFProcessor
+from sample_pdf import write_scanned_pdf, write_text_pdf
+from scan_splitter import BoundaryDetector, ScanSplitter
+
+POLICY_JOHN = ["INSURANCE POLICY DECLARATION", "Named Insured: John Doe",
+               "Effective Date: 01/25/2026", "Company: Geico", "Page 1 of 2"]
+POLICY_JOHN_2 = ["Schedule of forms and endorsements for this policy period", "Page 2 of 2"]
+INVOICE_JANE = ["INVOICE", "Insured Name: Jane Smith", "Invoice Date: 02/10/2026", "Company: Travelers"]
+POLICY_MARIA = ["INSURANCE POLICY DECLARATION", "Named Insured: Maria Garcia",
+                "Effective Date: 03/04/2026", "Company: Geico"]
+CERTIFICATE = "\n".join(["CERTIFICATE OF INSURANCE", "Named Insured: Wei Chen",
+                         "Date of Issue: 04/01/2026", "Certificate holder: City of Springfield"])
+
+
+class FakeOCR:
+    """Every scanned page reads as a certificate; counts how many run at once."""
+
+    pool_size = 2
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.active = self.peak = self.calls = 0
+        self._lock = threading.Lock()
+
+    def image_to_string(self, image, config=""):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return CERTIFICATE
+
+
+def _merge(out_path, *paths):
+    merged = pypdfium2.PdfDocument.new()
+    for path in paths:
+        src = pypdfium2.PdfDocument(path)
+        merged.import_pages(src)
+        src.close()
+    merged.save(out_path)
+    merged.close()
+    return out_path
+
+
+class TestBoundaryDetector(unittest.TestCase):
+    def setUp(self):
+        self.detector = BoundaryDetector(DocumentClassifier(CLASSIFIER_RULES, DocumentType.UNKNOWN))
+
+    def reasons(self, pages):
+        return [self.detector.start_reason("\n".join(p)) for p in pages]
+
+    def test_signals(self):
+        self.assertEqual(self.reasons([POLICY_JOHN, POLICY_JOHN_2, INVOICE_JANE, ["Terms and conditions"],
+                                       POLICY_MARIA, ["INSURANCE POLICY DECLARATION", "Named Insured: Ann Lee"]]),
+                         ["first", None, "type_change", None, "type_change", "new_insured"])
+
+    def test_declared_page_count_holds_the_document_together(self):
+        # Page 2 of 3 would otherwise look like a new invoice
+        self.assertEqual(self.reasons([["Policy Declaration", "Page 1 of 3"], INVOICE_JANE, ["Endorsements"],
+                                       INVOICE_JANE]),
+                         ["first", None, None, "type_change"])
+
+    def test_loose_keywords_on_a_continuation_page_are_not_a_new_document(self):
+        # "due", "bill" and "acord" classify a whole document, not a page
+        continuation = ["Premium summary", "Total premium due at inception: $1,250",
+                        "Bill to the named insured; ACORD forms attached"]
+        self.assertEqual(self.reasons([POLICY_MARIA, continuation, ["Forms schedule", "Amount due on renewal"],
+                                       INVOICE_JANE]),
+                         ["first", None, None, "type_change"])
+
+    def test_page_one_marker(self):
+        self.assertEqual(self.reasons([["Letter", "Page 1 of 1"], ["Another letter", "page 1/2"],
+                                       ["Continued", "page 2/2"]]),
+                         ["first", "page_marker", None])
+
+
+class TestScanSplitter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        d = self.tmp.name
+        text = write_text_pdf(os.path.join(d, "text.pdf"), [POLICY_JOHN, POLICY_JOHN_2, INVOICE_JANE])
+        scans = write_scanned_pdf(os.path.join(d, "scans.pdf"), 2, dpi=50)
+        policy = write_text_pdf(os.path.join(d, "policy.pdf"), [POLICY_MARIA])
+        # John's policy (2 pages), Jane's invoice, Wei's certificate (2 scanned pages), Maria's policy
+        self.batch = _merge(os.path.join(d, "batch.pdf"), text, scans, policy)
+        self.out = os.path.join(d, "out")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_split_writes_renamed_documents(self):
+        ocr = FakeOCR()
+        splitter = ScanSplitter(PDFProcessor(ocr=ocr, bounded_memory=True))
+        parts = list(splitter.split(self.batch, output_dir=self.out))
+
+        self.assertEqual([p["pages"] for p in parts], [[1, 2], [3, 3], [4, 5], [6, 6]])
+        self.assertEqual([p["reason"] for p in parts], ["first", "type_change", "type_change", "type_change"])
+        self.assertEqual([p["doc_type"] for p in parts], ["POLICY", "INVOICE", "CERTIFICATE", "POLICY"])
+        self.assertEqual(parts[0]["metadata"]["insured_name"], "John_Doe")
+        self.assertEqual(parts[3]["metadata"]["insured_name"], "Maria_Garcia")
+        self.assertEqual(ocr.calls, 2)
+        self.assertEqual({p["status"] for p in parts}, {"written"})
+        self.assertEqual(sorted(os.listdir(self.out)), sorted(p["new_name"] for p in parts))
+        with pdfplumber.open(parts[0]["new_path"]) as pdf:
+            self.assertEqual(len(pdf.pages), 2)
+            self.assertIn("Page 2 of 2", pdf.pages[1].extract_text())
+        with pdfplumber.open(parts[2]["new_path"]) as pdf:
+            self.assertEqual(len(pdf.pages), 2)
+        # The batch itself is left alone
+        self.assertTrue(os.path.exists(self.batch))
+
+    def test_policy_continuation_stays_with_the_policy(self):
+        batch = write_text_pdf(os.path.join(self.tmp.name, "policies.pdf"), [
+            POLICY_MARIA, ["Premium summary", "Total premium due at inception: $1,250", "Bill payable annually"],
+            [line.replace("Maria Garcia", "John Doe") for line in POLICY_MARIA],
+        ])
+        parts = list(ScanSplitter(PDFProcessor(ocr=FakeOCR())).split(batch, write=False))
+        self.assertEqual([p["pages"] for p in parts], [[1, 2], [3, 3]])
+        self.assertEqual([p["reason"] for p in parts], ["first", "new_insured"])
+        self.assertEqual([p["doc_type"] for p in parts], ["POLICY", "POLICY"])
+
+    def test_plan_only_and_name_collisions(self):
+        splitter = ScanSplitter(PDFProcessor(ocr=FakeOCR()))
+        planned = list(splitter.split(self.batch, output_dir=self.out, write=False))
+        self.assertEqual({p["status"] for p in planned}, {"planned"})
+        self.assertFalse(os.path.exists(self.out))
+
+        first = list(splitter.split(self.batch, output_dir=self.out))
+        second = list(splitter.split(self.batch, output_dir=self.out))
+        self.assertEqual(len(os.listdir(self.out)), 8)
+        self.assertNotEqual(first[0]["new_path"], second[0]["new_path"])
+
+    def test_scanned_pages_overlap(self):
+        scans = write_scanned_pdf(os.path.join(self.tmp.name, "many.pdf"), 6, dpi=30)
+        ocr = FakeOCR(delay=0.2)
+        splitter = ScanSplitter(PDFProcessor(ocr=ocr, bounded_memory=True), window=3)
+        parts = list(splitter.split(scans, write=False))
+        self.assertEqual(ocr.calls, 6)
+        self.assertGreater(ocr.peak, 1)
+        self.assertLessEqual(ocr.peak, 3)
+        # Same certificate on every page: one document
+        self.assertEqual([p["pages"] for p in parts], [[1, 6]])
+
+
+if __name__ == "__main__":
+    unittest.main()
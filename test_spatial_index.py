@@ -0,0 +1,40 @@
+import unittest
+from spatial_index import PageWordIndex, get_page_index
+
+
+def _word(text, x0, top, height=12):
+    return {"text": text, "x0": x0, "x1": x0 + 30, "top": top, "bottom": top + height}
+
+
+class TestPageWordIndex(unittest.TestCase):
+    def setUp(self):
+        self.words = [
+            _word("Named", 10, 100),
+            _word("Insured:", 45, 100),
+            _word("John", 110, 101),
+            _word("Below", 10, 120),
+            _word("Far", 10, 300),
+        ]
+        self.index = PageWordIndex(self.words)
+
+    def test_mid_band_returns_reading_order(self):
+        # Line midpoints are 106/107; band is inclusive on both ends
+        self.assertEqual(self.index.in_mid_band(95, 117), [0, 1, 2])
+        self.assertEqual(self.index.in_mid_band(106, 106), [0, 1])
+
+    def test_top_band_is_exclusive(self):
+        self.assertEqual(self.index.in_top_band(110, 130), [3])
+        self.assertEqual(self.index.in_top_band(120, 300), [])
+        self.assertEqual(self.index.in_top_band(0, 1000), [0, 1, 2, 3, 4])
+
+    def test_index_is_cached_on_page(self):
+        page = {"words": self.words}
+        first = get_page_index(page)
+        self.assertIs(get_page_index(page), first)
+        # A replaced word list gets a fresh index
+        page["words"] = self.words[:2]
+        self.assertIsNot(get_page_index(page), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+import bench_startup
+
+HAS_QT = importlib.util.find_spec("PyQt6") is not None
+# Generous ceilings; the heavy-module checks below are what catch regressions
+BUDGET_MS = {"import": 3000, "window": 5000, "first_result": 10000}
+
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sample = bench_startup.make_sample(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_import_loads_no_heavy_dependency(self):
+        elapsed, loaded = bench_startup.run_once("import", self.sample)
+        self.assertEqual(loaded, [])
+        self.assertLess(elapsed, BUDGET_MS["import"])
+
+    @unittest.skipUnless(HAS_QT, "PyQt6 not installed")
+    def test_window_loads_no_heavy_dependency(self):
+        elapsed, loaded = bench_startup.run_once("window", self.sample)
+        self.assertEqual(loaded, [])
+        self.assertLess(elapsed, BUDGET_MS["window"])
+
+    def test_first_result_loads_what_it_needs(self):
+        elapsed, loaded = bench_startup.run_once("first_result", self.sample)
+        self.assertIn("pdfplumber", loaded)
+        self.assertNotIn("pytesseract", loaded)  # Text-layer PDF, no OCR
+        self.assertLess(elapsed, BUDGET_MS["first_result"])
+
+    @unittest.skipUnless(HAS_QT, "PyQt6 not installed")
+    def test_window_shares_one_processor(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        import main_window
+        app = QApplication.instance() or QApplication(sys.argv)
+        window = main_window.MainWindow()
+        self.assertIs(window.drop_zone.processor, window.processor)
+        self.assertIn(window, app.topLevelWidgets())
+        window.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import surname_index
+from surname_matcher import SurnameMatcher
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+JSON_PATH = os.path.join(SCRIPT_DIR, "chinese_surnames_detailed.json")
+
+
+class TestSurnameIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.tmp, "surnames.json")
+        shutil.copy(JSON_PATH, self.json_path)
+        surname_index.write_index(self.json_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_index_holds_every_variant(self):
+        matcher = SurnameMatcher(self.json_path)
+        self.assertIsInstance(matcher.surname_pinyins, surname_index.SurnameIndex)
+        expected = {p.lower() for entry in matcher.surnames for p in entry.get('pinyin', [])}
+        self.assertEqual(set(matcher.surname_pinyins), expected)
+        for word in expected:
+            self.assertIn(word, matcher.surname_pinyins)
+        for word in ["", "zzzz", "wangg", "policy"]:
+            self.assertNotIn(word, matcher.surname_pinyins)
+        matcher.index.close()
+
+    def test_same_names_as_json(self):
+        indexed = SurnameMatcher(self.json_path)
+        os.remove(surname_index.index_path_for(self.json_path))
+        parsed = SurnameMatcher(self.json_path)
+        self.assertIsNone(parsed.index)
+        text = "Insured: Wang Xiao Ming and John A. Wang, Fung Wei, Policy Number Li Na"
+        self.assertEqual(indexed.find_potential_names(text), parsed.find_potential_names(text))
+        indexed.index.close()
+
+    def test_stale_index_falls_back_to_json(self):
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            f.write('[{"index": 1, "char": "x", "pinyin": ["Qwerty"]}]')
+        matcher = SurnameMatcher(self.json_path)
+        self.assertIsNone(matcher.index)
+        self.assertEqual(matcher.surname_pinyins, {"qwerty"})
+
+    def test_crlf_checkout_matches_the_index(self):
+        # git's text=auto checks the JSON out with CRLF on Windows
+        with open(JSON_PATH, 'rb') as f:
+            data = f.read()
+        with open(self.json_path, 'wb') as f:
+            f.write(data.replace(b"\n", b"\r\n"))
+        matcher = SurnameMatcher(self.json_path)
+        self.assertIsInstance(matcher.index, surname_index.SurnameIndex)
+        matcher.index.close()
+
+    def test_corrupt_index_falls_back_to_json(self):
+        with open(surname_index.index_path_for(self.json_path), 'wb') as f:
+            f.write(b"garbage")
+        matcher = SurnameMatcher(self.json_path)
+        self.assertIsNone(matcher.index)
+        self.assertIn("wang", matcher.surname_pinyins)
+
+    def test_shipped_index_is_current(self):
+        index = surname_index.open_index(JSON_PATH)
+        self.assertIsNotNone(index, "run parse_surnames.py to rebuild chinese_surnames_detailed.idx")
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import random
+import unittest
+
+from surname_matcher import SurnameMatcher, STOPWORDS, clean_token, is_alpha_or_initial
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WORDS = ["Wang", "Li", "Xiao", "Ming", "Wei", "Lee", "John", "David", "A.", "B", "a.", "Policy",
+         "Insured:", "(Chen", "Jie)", "Good", "Day", "Mei", "Hua", "Zhang", "San.", "the", "Name", "12345",
+         "Effective", "Roth", "J.R.", "-", "Wu,", "\"Liu\"", "Tan", "Street"]
+
+
+def legacy_find(matcher, text):
+    """find_potential_names as it was before tokens were cleaned once (sets of names)."""
+    surname_pinyins = {p.lower() for entry in matcher.surnames for p in entry.get('pinyin', [])}
+    pinyin = matcher.pinyin_syllables
+    tokens = text.split()
+    candidates = set()
+    for i in range(len(tokens) - 1):
+        w1, w2 = clean_token(tokens[i]), clean_token(tokens[i + 1])
+        w3 = clean_token(tokens[i + 2]) if i + 2 < len(tokens) else None
+        if not w1 or not w2 or not is_alpha_or_initial(w1) or not is_alpha_or_initial(w2):
+            continue
+        l1, l2 = w1.lower().strip('.'), w2.lower().strip('.')
+        if w3 and is_alpha_or_initial(w3) and w1[0].isupper() and w2[0].isupper() and w3[0].isupper():
+            l3 = w3.lower().strip('.')
+            if not STOPWORDS & {l1, l2, l3}:
+                if l1 in surname_pinyins:
+                    ok = (l2 in pinyin and l3 in pinyin) or w2.endswith('.') or l2.isalpha() and len(w2) == 1
+                elif l3 in surname_pinyins:
+                    ok = (l1 in pinyin and l2 in pinyin) or w2.endswith('.') or len(w2) == 1
+                else:
+                    ok = False
+                if ok:
+                    candidates.add(f"{w1} {w2} {w3}")
+        if w1[0].isupper() and w2[0].isupper() and not STOPWORDS & {l1, l2}:
+            if l1 in surname_pinyins:
+                ok = l2 in pinyin or w2.endswith('.') or (l2.isalpha() and len(w2) == 1)
+            elif l2 in surname_pinyins:
+                ok = l1 in pinyin or w1.endswith('.') or (l1.isalpha() and len(w1) == 1)
+            else:
+                ok = False
+            if ok:
+                candidates.add(f"{w1} {w2}")
+    return candidates
+
+
+class TestSurnameTokens(unittest.TestCase):
+    def setUp(self):
+        self.matcher = SurnameMatcher(os.path.join(SCRIPT_DIR, "chinese_surnames_detailed.json"))
+
+    def test_lookups_built_once(self):
+        self.assertIn("wang", self.matcher.surname_pinyins)
+        self.assertIn("xiao", self.matcher.pinyin_syllables)
+
+    def test_matches_legacy_windows(self):
+        rng = random.Random(13)
+        for _ in range(2000):
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12)))
+            found = self.matcher.find_potential_names(text)
+            self.assertEqual(set(found), legacy_find(self.matcher, text), text)
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual([len(c) for c in found], sorted((len(c) for c in found), reverse=True))
+
+    def test_equal_lengths_keep_text_order(self):
+        self.assertEqual(self.matcher.find_potential_names("Wang Wei met Chen Jie"), ["Wang Wei", "Chen Jie"])
+
+    def test_missing_file(self):
+        self.assertEqual(SurnameMatcher(os.path.join(SCRIPT_DIR, "no_such_file.json")).find_potential_names("Wang Wei"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
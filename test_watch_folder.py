@@ -0,0 +1,194 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+
+import renamer_cli
+from sample_pdf import write_text_pdf
+from watch_folder import FolderWatcher, WatchState
+
+
+class FakeEngine:
+    """Completes every submission at once; renames files to <stem>_done.pdf when asked to."""
+
+    def __init__(self, failures=0):
+        self.submitted = []
+        # The first `failures` submissions come back as errors
+        self.failures = failures
+
+    def submit(self, filepath, rename=True):
+        self.submitted.append(filepath)
+        result = {"path": filepath, "status": "planned", "new_path": None}
+        if self.failures:
+            self.failures -= 1
+            result.update(status="error", error="Error: worker died")
+        elif rename:
+            new_path = filepath[:-4] + "_done.pdf"
+            os.rename(filepath, new_path)
+            result.update(status="renamed", new_path=new_path)
+        future = Future()
+        future.set_result(result)
+        return future
+
+
+class TestFolderWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.inbox = os.path.join(self.tmpdir, "inbox")
+        os.makedirs(self.inbox)
+        self.state_path = os.path.join(self.tmpdir, "state.sqlite3")
+        self.now = [0.0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _watcher(self, engine, rename=True):
+        state = WatchState(self.state_path)
+        self.addCleanup(state.close)
+        return FolderWatcher(self.inbox, engine, state, rename=rename, settle=1.0, clock=lambda: self.now[0])
+
+    def _tick(self, watcher, seconds=0.5):
+        self.now[0] += seconds
+        return watcher.poll()
+
+    def _write(self, name, data=b"%PDF-1.4 scan"):
+        path = os.path.join(self.inbox, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(data)
+        return path
+
+    def test_waits_for_file_to_settle(self):
+        engine = FakeEngine()
+        watcher = self._watcher(engine)
+        path = self._write("scan.pdf")
+        self._tick(watcher)
+        self._tick(watcher)
+        # Scanner still writing
+        self._write("scan.pdf", b" more")
+        self._tick(watcher)
+        self._tick(watcher)
+        self.assertEqual(engine.submitted, [])
+        results = self._tick(watcher, 1.0)
+        self.assertEqual(engine.submitted, [path])
+        self.assertEqual(results[0]["status"], "renamed")
+
+    def test_renamed_and_known_files_are_not_reprocessed(self):
+        engine = FakeEngine()
+        watcher = self._watcher(engine)
+        path = self._write("a.pdf")
+        for _ in range(6):
+            self._tick(watcher)
+        for _ in range(6):
+            self._tick(watcher, 30)  # Includes full rescans
+        self.assertEqual(engine.submitted, [path])
+
+        # A restart with the same state store finds nothing new
+        engine = FakeEngine()
+        watcher = self._watcher(engine)
+        for _ in range(6):
+            self._tick(watcher)
+        self.assertEqual(engine.submitted, [])
+
+    def test_changed_file_is_handled_again(self):
+        engine = FakeEngine()
+        watcher = self._watcher(engine, rename=False)
+        path = self._write("b.pdf")
+        for _ in range(4):
+            self._tick(watcher)
+        os.utime(path, (1000, 1000))
+        self._write("b.pdf", b" rescanned")
+        for _ in range(4):
+            self._tick(watcher, 30)
+        self.assertEqual(engine.submitted, [path, path])
+
+    def test_dry_run_is_not_remembered_across_runs(self):
+        engine = FakeEngine()
+        watcher = self._watcher(engine, rename=False)
+        path = self._write("a.pdf")
+        for _ in range(4):
+            self._tick(watcher)
+        for _ in range(4):
+            self._tick(watcher, 30)
+        self.assertEqual(engine.submitted, [path])
+
+        # A real run on the same state store still renames it
+        engine = FakeEngine()
+        watcher = self._watcher(engine)
+        results = []
+        for _ in range(4):
+            results += self._tick(watcher)
+        self.assertEqual(engine.submitted, [path])
+        self.assertEqual(results[0]["status"], "renamed")
+
+    def test_errors_are_retried(self):
+        engine = FakeEngine(failures=1)
+        watcher = FolderWatcher(self.inbox, engine, WatchState(self.state_path), settle=1.0, full_rescan=60.0,
+                                retry_after=60.0, clock=lambda: self.now[0])
+        self.addCleanup(watcher.state.close)
+        path = self._write("a.pdf")
+        results = []
+        for _ in range(4):
+            results += self._tick(watcher)
+        self.assertEqual([r["status"] for r in results], ["error"])
+        self.assertEqual(watcher.state.count(), 0)
+        # Not resubmitted on every tick...
+        for _ in range(4):
+            results += self._tick(watcher)
+        self.assertEqual(engine.submitted, [path])
+        # ...but once the retry delay has passed
+        for _ in range(4):
+            results += self._tick(watcher, 30)
+        self.assertEqual(engine.submitted, [path, path])
+        self.assertEqual(results[-1]["status"], "renamed")
+
+    def test_only_pdfs_and_new_subdirectories(self):
+        engine = FakeEngine()
+        watcher = self._watcher(engine, rename=False)
+        self._tick(watcher)
+        self._write("notes.txt")
+        self._write(".hidden.pdf")
+        self._write("~$lock.pdf")
+        nested = self._write(os.path.join("2026", "june", "c.PDF"))
+        for _ in range(4):
+            self._tick(watcher)
+        self.assertEqual(engine.submitted, [nested])
+
+
+class TestWatchCli(unittest.TestCase):
+    def test_watch_mode_streams_new_files(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, True)
+        inbox = os.path.join(tmpdir, "inbox")
+        os.makedirs(inbox)
+        args = renamer_cli.build_parser().parse_args(
+            ["--watch", "--jobs", "1", "--settle", "0.2", "--state", os.path.join(tmpdir, "state.sqlite3"), inbox])
+        out, err = io.StringIO(), io.StringIO()
+        stop = threading.Event()
+        thread = threading.Thread(target=renamer_cli.watch, args=(args, out, err, stop))
+        thread.start()
+        try:
+            write_text_pdf(os.path.join(inbox, "scan.pdf"), [[
+                "INSURANCE POLICY DECLARATION",
+                "Named Insured: John Doe",
+                "Effective Date: 01/25/2026",
+                "Company: Geico",
+            ]])
+            deadline = time.monotonic() + 60
+            while not out.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            stop.set()
+            thread.join(60)
+        line = json.loads(out.getvalue().splitlines()[0])
+        self.assertEqual(line["status"], "renamed")
+        self.assertEqual(os.listdir(inbox), ["John_Doe_Geico_DEC_EFF_01-25-2026.pdf"])
+
+
+if __name__ == '__main__':
+    unittest.main()
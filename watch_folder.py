@@ -0,0 +1,304 @@
+"""
+Watch mode: keeps renaming PDFs that scanners drop into a directory tree.
+
+New files are picked up by polling, which costs one stat per directory per
+tick because only directories whose mtime changed are listed again. When
+the optional watchdog package is installed, file system events also wake the
+loop right away, so it can sleep longer between checks. A file is only
+processed once its size and mtime have been stable for `settle` seconds,
+which skips files a scanner is still writing. Work goes to a warm
+BatchEngine.
+
+A small SQLite state store remembers every file finished for good (by
+path, size and mtime), including the files that rename_file produced, so
+nothing is analyzed twice, across restarts too. Only DONE_STATUSES are
+stored: a dry run's "planned" is remembered for that run only, so a real
+run later still renames the file, and an error is retried after
+`retry_after` seconds. A file that changes is handled again.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from batch_engine import error_result
+
+try:
+    # Optional: wakes the loop on file system events instead of the next tick
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# Directory mtimes can be this coarse (FAT), so a directory changed this
+# recently is listed again on the next tick as well
+MTIME_GRANULARITY = 2.0
+
+# Results that finish a file for good and go into the state store
+DONE_STATUSES = ("renamed", "unchanged", "no_text")
+
+
+def file_signature(path):
+    """(size, mtime) of path, or None if it is gone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def is_candidate(name):
+    # Hidden and Office-style lock/temp files are never documents
+    return name.lower().endswith(".pdf") and not name.startswith((".", "~$"))
+
+
+class WatchState:
+    """
+    SQLite record of handled files: path -> (size, mtime, status, new_path).
+    A path counts as done while its size and mtime match the record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL,"
+                " status TEXT NOT NULL, new_path TEXT, handled_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def is_done(self, path, signature):
+        with self._lock:
+            row = self._connect().execute("SELECT size, mtime FROM files WHERE path = ?", (path,)).fetchone()
+        return row is not None and tuple(row) == tuple(signature)
+
+    def record(self, path, signature, status, new_path=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime, status, new_path, handled_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, signature[0], signature[1], status, new_path, time.time()),
+            )
+            conn.commit()
+
+    def count(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _WakeHandler(FileSystemEventHandler):
+    def __init__(self, wake):
+        self.wake = wake
+
+    def on_any_event(self, event):
+        self.wake.set()
+
+
+class FolderWatcher:
+    """
+    Feeds settled, not yet handled PDFs under root to a BatchEngine.
+    Call poll() on a loop (run() does), or drive it by hand in tests; each
+    call returns the results that completed since the previous one.
+    """
+
+    def __init__(self, root, engine, state, rename=True, settle=0.5, interval=0.25,
+                 idle_interval=None, full_rescan=60.0, retry_after=60.0, clock=time.monotonic):
+        self.root = os.path.abspath(root)
+        self.engine = engine
+        self.state = state
+        self.rename = rename
+        # Seconds a file's size and mtime must stay unchanged before it is read
+        self.settle = settle
+        # Tick while files are settling or in flight, and when idle
+        self.interval = interval
+        self.idle_interval = idle_interval or (5.0 if Observer is not None else interval)
+        # Every so often every directory is listed again, whatever its mtime
+        self.full_rescan = full_rescan
+        # Seconds before a file whose processing failed is tried again
+        self.retry_after = retry_after
+        self._clock = clock
+
+        self._dir_mtimes = {}
+        self._last_full = None
+        # path -> (signature, stable since) for files waiting to settle
+        self._pending = {}
+        # path -> signature for files handled (or recorded in the state)
+        self._done = {}
+        # path -> (signature, retry at) for files whose processing failed
+        self._failed = {}
+        # future -> (path, signature)
+        self._in_flight = {}
+        self._wake = threading.Event()
+        self._observer = None
+
+    def _changed_dirs(self, now):
+        """Directories to list this tick: new, mtime changed, recently changed, or all on a full rescan."""
+        full = self._last_full is None or now - self._last_full >= self.full_rescan
+        if full:
+            self._last_full = now
+            return [self.root] + [d for d in self._dir_mtimes if d != self.root]
+        changed = []
+        wall = time.time()
+        for directory, mtime in list(self._dir_mtimes.items()):
+            try:
+                current = os.stat(directory).st_mtime
+            except OSError:
+                del self._dir_mtimes[directory]
+                continue
+            if current != mtime or wall - current < MTIME_GRANULARITY:
+                changed.append(directory)
+        return changed
+
+    def _list(self, directory):
+        """Lists one directory, registering subdirectories and new candidate files."""
+        try:
+            mtime = os.stat(directory).st_mtime
+            entries = list(os.scandir(directory))
+        except OSError:
+            self._dir_mtimes.pop(directory, None)
+            return []
+        self._dir_mtimes[directory] = mtime
+        found = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.path not in self._dir_mtimes:
+                        # New subtree: list it now rather than on the next tick
+                        found.extend(self._list(entry.path))
+                elif entry.is_file() and is_candidate(entry.name):
+                    found.append(entry.path)
+            except OSError:
+                continue
+        return found
+
+    def scan(self):
+        """Returns paths that are settled and not handled yet; starts tracking new ones."""
+        now = self._clock()
+        for directory in self._changed_dirs(now):
+            for path in self._list(directory):
+                if path not in self._pending:
+                    signature = file_signature(path)
+                    if not self._is_known(path, signature):
+                        self._pending[path] = (signature, now)
+
+        ready = []
+        for path, (signature, since) in list(self._pending.items()):
+            current = file_signature(path)
+            if current is None:
+                del self._pending[path]
+            elif current != signature:
+                # Still being written (or just seen): restart the clock
+                self._pending[path] = (current, now)
+            elif now - since >= self.settle:
+                del self._pending[path]
+                if not self._is_known(path, current):
+                    ready.append((path, current))
+        return ready
+
+    def _is_known(self, path, signature):
+        if signature is None:
+            return True
+        if path in self._done:
+            return self._done[path] == signature
+        if path in self._failed:
+            failed_signature, retry_at = self._failed[path]
+            if failed_signature == signature and self._clock() < retry_at:
+                return True
+            del self._failed[path]
+        if any(p == path for p, _ in self._in_flight.values()):
+            return True
+        if self.state.is_done(path, signature):
+            self._done[path] = signature
+            return True
+        return False
+
+    def poll(self):
+        """One tick: submits newly settled files and returns results completed since the last tick."""
+        for path, signature in self.scan():
+            future = self.engine.submit(path, self.rename)
+            future.add_done_callback(lambda f: self._wake.set())
+            self._in_flight[future] = (path, signature)
+
+        return self._collect([f for f in self._in_flight if f.done()])
+
+    def drain(self):
+        """Waits for files already submitted and returns their results (nothing new is queued)."""
+        return self._collect(list(self._in_flight))
+
+    def _collect(self, futures):
+        results = []
+        for future in futures:
+            path, signature = self._in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = error_result(path, e)
+            self._finish(path, signature, result)
+            results.append(result)
+        return results
+
+    def _finish(self, path, signature, result):
+        status = result["status"]
+        if status == "error":
+            self._failed[path] = (signature, self._clock() + self.retry_after)
+            return
+        self._done[path] = signature
+        if status not in DONE_STATUSES:
+            # "planned" (dry run): this run will not look at it again, a real run will
+            return
+        self.state.record(path, signature, status, result.get("new_path"))
+        new_path = result.get("new_path")
+        if new_path:
+            # The renamed file shows up as a new PDF; it is already handled
+            new_signature = file_signature(new_path)
+            if new_signature is not None:
+                self._done[new_path] = new_signature
+                self.state.record(new_path, new_signature, result["status"], new_path)
+
+    def queue_depths(self):
+        """Files waiting to settle and files submitted but not finished (a metrics queue source)."""
+        return {"settling": len(self._pending), "in_flight": len(self._in_flight)}
+
+    @property
+    def busy(self):
+        return bool(self._pending or self._in_flight)
+
+    def run(self, stop_event, on_result=None):
+        """Polls until stop_event is set, passing each result to on_result."""
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_WakeHandler(self._wake), self.root, recursive=True)
+            self._observer.start()
+        try:
+            while not stop_event.is_set():
+                for result in self.poll():
+                    if on_result is not None:
+                        on_result(result)
+                self._wake.wait(self.interval if self.busy else self.idle_interval)
+                self._wake.clear()
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+                self._observer = None
+
+    def stop(self):
+        """Wakes a run() loop so it notices its stop_event right away."""
+        self._wake.set()